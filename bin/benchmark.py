@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for hot paths of the request pipeline."""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+def _bootstrap_path() -> None:
+    project_root = Path(__file__).resolve().parent.parent
+    src_path = project_root / "src"
+    sys.path.insert(0, str(src_path))
+
+
+def _best_of(func, repeat: int, number: int) -> float:
+    """Best average time per call in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _print_table(title: str, header: tuple, rows: list) -> None:
+    print(f"\n{title}")
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(str(value).rjust(widths[i]) for i, value in enumerate(row)))
+
+
+def _size_label(size: int) -> str:
+    return f"{size // 1024} KB" if size >= 1024 else f"{size} B"
+
+
+def _legacy_ipc_read(conn, length):
+    """Neutral IPC content read as it was: recv() chunks joined at the end."""
+    chunks = []
+    while length > 0:
+        chunk = conn.recv(min(8192, length))
+        if not chunk:
+            raise ValueError("Error reading from stream")
+        chunks.append(chunk)
+        length -= len(chunk)
+    return b"".join(chunks).decode("utf-8")
+
+
+def _ipc_round_trip(sender, reader, length):
+    """Send length bytes through a socket pair from a thread and read them back."""
+    left, right = socket.socketpair()
+    try:
+        writer = threading.Thread(target=sender, args=(left,))
+        writer.start()
+        reader(right, length)
+        writer.join()
+    finally:
+        left.close()
+        right.close()
+
+
+def _ipc_record_timings(args, schema, template) -> tuple:
+    """Encode and receive times of one record, legacy path and current path."""
+    from neutral_ipc_template.neutral_ipc_template import (  # pylint: disable=import-outside-toplevel
+        NeutralIpcRecord,
+        recv_exact,
+        send_parts,
+    )
+
+    def legacy_encode(content1=schema, content2=template):
+        length1 = len(content1.encode("utf-8"))
+        length2 = len(content2.encode("utf-8"))
+        header = NeutralIpcRecord.encode_header(10, 10, length1, 20, length2)
+        return header + content1.encode("utf-8") + content2.encode("utf-8")
+
+    def framed_read(conn, length):
+        return recv_exact(conn, length, 8192).decode("utf-8")
+
+    body = schema.encode("utf-8")
+    number = max(1, args.number // 10)
+    return (
+        len(legacy_encode()),
+        _best_of(legacy_encode, args.repeat, args.number),
+        _best_of(
+            functools.partial(NeutralIpcRecord.encode_parts, 10, 10, schema, 20, template),
+            args.repeat, args.number,
+        ),
+        _best_of(
+            functools.partial(_ipc_round_trip, lambda c: c.sendall(body), _legacy_ipc_read, len(body)),
+            args.repeat, number,
+        ),
+        _best_of(
+            functools.partial(_ipc_round_trip, lambda c: send_parts(c, [body]), framed_read, len(body)),
+            args.repeat, number,
+        ),
+    )
+
+
+def bench_ipc_framing(args) -> None:
+    """Neutral IPC record: encode + send and receive, legacy path vs parts/recv_into."""
+    template = "/srv/app/component/cmp_0200_template/neutral/layout/index.ntpl"
+    rows = []
+    for size in args.sizes:
+        schema = ('{"data": "' + "ñ" * (size // 2))[:size] + '"}'
+        record_len, *timings = _ipc_record_timings(args, schema, template)
+        rows.append((_size_label(record_len), *(f"{timing * 1e6:.1f}" for timing in timings)))
+
+    _print_table(
+        "IPC framing (microseconds per record, best of runs)",
+        ("record", "encode-legacy", "encode-parts", "recv-legacy", "recv-into"),
+        rows,
+    )
+
+
+def bench_ipc_schema(args) -> None:
+    """Schema transport: JSON text vs binary (content-format 40), size and codec time."""
+    import json  # pylint: disable=import-outside-toplevel
+
+    from neutral_ipc_template import neutral_ipc_binary  # pylint: disable=import-outside-toplevel
+    from neutral_ipc_template.neutral_ipc_template import (  # pylint: disable=import-outside-toplevel
+        deep_merge,
+    )
+
+    src_path = Path(__file__).resolve().parent.parent / "src"
+    schema = json.loads((src_path / "app" / "schema.json").read_text(encoding="utf-8"))
+    for path in sorted(src_path.glob("component/cmp_*/schema.json")):
+        schema = deep_merge(schema, json.loads(path.read_text(encoding="utf-8")))
+
+    text = json.dumps(schema)
+    data = neutral_ipc_binary.dumps(schema)
+    rows = []
+    for name, encode, decode, payload in (
+        ("json", lambda: json.dumps(schema), lambda: json.loads(text), len(text.encode("utf-8"))),
+        ("binary", lambda: neutral_ipc_binary.dumps(schema),
+         lambda: neutral_ipc_binary.loads(data), len(data)),
+    ):
+        rows.append((
+            name, _size_label(payload),
+            f"{_best_of(encode, args.repeat, args.number) * 1e6:.1f}",
+            f"{_best_of(decode, args.repeat, args.number) * 1e6:.1f}",
+        ))
+
+    _print_table(
+        "IPC schema, app + component schema.json (microseconds, best of runs)",
+        ("format", "bytes", "encode", "decode"),
+        rows,
+    )
+
+
+def _rendered_pages(paths: list) -> dict:
+    """Render pages with the app (in-memory databases, no minification)."""
+    from app import create_app  # pylint: disable=import-outside-toplevel
+    from app.config import Config  # pylint: disable=import-outside-toplevel
+
+    class BenchConfig(Config):  # pylint: disable=too-few-public-methods
+        """Isolated app for benchmarks."""
+
+        TESTING = True
+        TEMPLATE_HTML_MINIFY = False
+        DB_PWA = DB_SAFE = DB_FILES = "sqlite:///:memory:"
+        MAIL_METHOD = "dummy"
+
+    client = create_app(BenchConfig).test_client()
+    return {path: client.get(path).get_data(as_text=True) for path in paths}
+
+
+def bench_html_minify(args) -> None:
+    """TEMPLATE_HTML_MINIFY: former MULTILINE regex vs the single-pass minifier."""
+    import re  # pylint: disable=import-outside-toplevel
+
+    from core.html_minify import HtmlMinifier, minify_html  # pylint: disable=import-outside-toplevel
+
+    legacy = re.compile(
+        r"^\s+<(?!pre\b|code\b|samp\b|kbd\b|var\b|textarea\b|xmp\b|script\b|style\b|template\b)([^>]+>)",
+        re.MULTILINE,
+    )
+
+    def chunked(page, size=8192):
+        minifier = HtmlMinifier()
+        out = [minifier.feed(page[i:i + size]) for i in range(0, len(page), size)]
+        out.append(minifier.close())
+        return "".join(out)
+
+    pages = _rendered_pages(args.paths)
+    largest = max(pages.values(), key=len)
+    # The rendered pages, then the largest one repeated up to about 1 MB.
+    cases = list(pages.items())
+    cases.append(("largest x16", largest * 16))
+
+    rows = []
+    for name, page in cases:
+        minified = minify_html(page)
+        number = max(1, args.number // max(1, len(page) // 65536))
+        timings = [
+            _best_of(func, args.repeat, number) * 1e6
+            for func in (
+                lambda page=page: legacy.sub(r"<\1", page),
+                lambda page=page: minify_html(page),
+                lambda page=page: chunked(page),
+            )
+        ]
+        rows.append((
+            name, _size_label(len(page)), _size_label(len(minified)),
+            *(f"{timing:.0f}" for timing in timings),
+        ))
+
+    _print_table(
+        "HTML minify (microseconds per page, best of runs)",
+        ("page", "size", "minified", "regex", "single-pass", "8 KB chunks"),
+        rows,
+    )
+
+
+def bench_compress(args) -> None:
+    """COMPRESS_LEVEL: ratio and CPU time per page for each level and encoding."""
+    from core.compression import _Encoder, brotli  # pylint: disable=import-outside-toplevel
+
+    pages = _rendered_pages(args.paths)
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    rows = []
+    for name, page in pages.items():
+        body = page.encode("utf-8")
+        for encoding in encodings:
+            for level in (1, 3, 6, 9):
+                size = len(_Encoder(encoding, level).finish(body))
+                timing = _best_of(
+                    lambda: _Encoder(encoding, level).finish(body),  # pylint: disable=cell-var-from-loop
+                    args.repeat, args.number,
+                )
+                rows.append((
+                    name, _size_label(len(body)), encoding, level,
+                    _size_label(size), f"{len(body) / size:.1f}x", f"{timing * 1e6:.0f}",
+                ))
+
+    _print_table(
+        "Response compression (microseconds of CPU per page, best of runs)",
+        ("page", "size", "encoding", "level", "compressed", "ratio", "time"),
+        rows,
+    )
+
+
+# The former code, kept verbatim to compare against SecurityHeaders.
+# pylint: disable=duplicate-code
+def _legacy_security_headers(response):  # pylint: disable=too-many-locals
+    """add_security_headers as it was: everything rebuilt from the config."""
+    from flask import current_app, g  # pylint: disable=import-outside-toplevel
+
+    config = current_app.config
+    response.headers["X-Frame-Options"] = "DENY"
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    response.headers["X-XSS-Protection"] = "1; mode=block"
+    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+    response.headers["Referrer-Policy"] = config.get("REFERRER_POLICY", "strict-origin-when-cross-origin")
+    permissions_policy = config.get("PERMISSIONS_POLICY", "")
+    if permissions_policy:
+        response.headers["Permissions-Policy"] = permissions_policy
+
+    nonce = getattr(g, "csp_nonce", None)
+
+    def get_csp_string(key):
+        return " ".join(filter(None, config.get(key, [])))
+
+    scripts = get_csp_string("CSP_ALLOWED_SCRIPT")
+    styles = get_csp_string("CSP_ALLOWED_STYLE")
+    images = get_csp_string("CSP_ALLOWED_IMG")
+    fonts = get_csp_string("CSP_ALLOWED_FONT")
+    connects = get_csp_string("CSP_ALLOWED_CONNECT")
+    frames = get_csp_string("CSP_ALLOWED_FRAME")
+
+    script_unsafe = []
+    if config.get("CSP_ALLOWED_SCRIPT_UNSAFE_INLINE"):
+        script_unsafe.append("'unsafe-inline'")
+    if config.get("CSP_ALLOWED_SCRIPT_UNSAFE_EVAL"):
+        script_unsafe.append("'unsafe-eval'")
+    style_unsafe = []
+    if config.get("CSP_ALLOWED_STYLE_UNSAFE_INLINE"):
+        style_unsafe.append("'unsafe-inline'")
+
+    use_nonce = nonce and not script_unsafe and not style_unsafe
+    nonce_str = f" 'nonce-{nonce}'" if use_nonce else ""
+    script_unsafe_str = f" {' '.join(script_unsafe)}" if script_unsafe else ""
+    style_unsafe_str = f" {' '.join(style_unsafe)}" if style_unsafe else ""
+
+    response.headers["Content-Security-Policy"] = (
+        f"default-src 'self'; "
+        f"script-src 'self'{nonce_str}{script_unsafe_str} {scripts}; "
+        f"style-src 'self'{nonce_str}{style_unsafe_str} {styles}; "
+        f"img-src 'self' data: {images}; "
+        f"font-src 'self' {fonts}; "
+        f"connect-src 'self' {connects}; "
+        f"frame-src 'self' {frames}; "
+        f"frame-ancestors 'none'; "
+        f"base-uri 'self'; "
+        f"form-action 'self';"
+    )
+    return response
+# pylint: enable=duplicate-code
+
+
+def bench_security_headers(args) -> None:
+    """Security headers per response: rebuilt from the config vs precomputed."""
+    from flask import Flask, Response, g  # pylint: disable=import-outside-toplevel
+
+    from app import SecurityHeaders  # pylint: disable=import-outside-toplevel
+    from app.config import Config  # pylint: disable=import-outside-toplevel
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    precomputed = SecurityHeaders(app.config)
+
+    rows = []
+    with app.test_request_context():
+        for label, nonce in (("with nonce", "bm9uY2Utbm9uY2Utbm9uY2U"), ("without nonce", None)):
+            g.csp_nonce = nonce
+            assert (
+                _legacy_security_headers(Response()).headers == precomputed(Response()).headers
+            )
+            base, legacy, new = (
+                _best_of(func, args.repeat, args.number * 10) * 1e6
+                for func in (
+                    Response,
+                    lambda: _legacy_security_headers(Response()),
+                    lambda: precomputed(Response()),
+                )
+            )
+            rows.append((
+                label, f"{legacy - base:.2f}", f"{new - base:.2f}", f"{(legacy - base) / (new - base):.1f}x",
+            ))
+
+    _print_table(
+        "Security headers (microseconds per response, best of runs)",
+        ("request", "rebuilt", "precomputed", "speedup"),
+        rows,
+    )
+
+
+SUITES = {
+    "compress": bench_compress,
+    "html-minify": bench_html_minify,
+    "ipc-framing": bench_ipc_framing,
+    "ipc-schema": bench_ipc_schema,
+    "security-headers": bench_security_headers,
+}
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(description="Run micro-benchmarks.")
+    parser.add_argument("suite", choices=sorted(SUITES) + ["all"], help="Benchmark to run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    parser.add_argument("--number", type=int, default=200, help="Calls per run")
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(item) for item in value.split(",")],
+        default=[1024, 65536, 262144, 1048576],
+        help="Comma-separated payload sizes in bytes",
+    )
+    parser.add_argument(
+        "--paths",
+        type=lambda value: value.split(","),
+        default=["/", "/sign/up", "/Hello-Component/"],
+        help="Comma-separated pages rendered for html-minify and compress",
+    )
+    return parser
+
+
+def main() -> int:
+    """Run the selected suites; exit status 2 on invalid options."""
+    _bootstrap_path()
+    args = _build_parser().parse_args()
+    if args.repeat < 1 or args.number < 1 or any(size < 1 for size in args.sizes):
+        print("--repeat, --number and --sizes must be positive", file=sys.stderr)
+        return 2
+
+    suites = sorted(SUITES) if args.suite == "all" else [args.suite]
+    for name in suites:
+        SUITES[name](args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
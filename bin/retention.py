@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Purge expired sessions, PINs and orphan uid rows in bounded batches."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+def _bootstrap_path() -> None:
+    project_root = Path(__file__).resolve().parent.parent
+    src_path = project_root / "src"
+    sys.path.insert(0, str(src_path))
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        description="Delete rows past their retention period (see RETENTION_* in config/.env).",
+    )
+    parser.add_argument("--db-pwa-url", default=None, help="Override DB_PWA URL")
+    parser.add_argument("--db-pwa-type", default=None, help="Override DB_PWA type")
+    parser.add_argument("--db-safe-url", default=None, help="Override DB_SAFE URL")
+    parser.add_argument("--db-safe-type", default=None, help="Override DB_SAFE type")
+    parser.add_argument("--batch-size", type=int, default=None, help="Override RETENTION_BATCH_SIZE")
+    parser.add_argument("--max-batches", type=int, default=None, help="Override RETENTION_MAX_BATCHES")
+    parser.add_argument(
+        "--policy",
+        action="append",
+        default=None,
+        help="Run only this policy (can be repeated)",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Print only errors")
+    return parser
+
+
+def _select_policies(policies, names):
+    """Policies named with --policy, all of them without it; None on an unknown name."""
+    if not names:
+        return policies
+
+    known = {policy.name for policy in policies}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        print(f"ERROR: unknown policy: {', '.join(unknown)} (available: {', '.join(sorted(known))})",
+              file=sys.stderr)
+        return None
+    return tuple(policy for policy in policies if policy.name in names)
+
+
+def _print_reports(reports, elapsed: float, quiet: bool) -> None:
+    """Print the sweep report, or only the failed policies with --quiet."""
+    from core.retention import format_report  # pylint: disable=import-error,import-outside-toplevel
+
+    if not quiet:
+        print(format_report(reports))
+        total = sum(report["deleted"] for report in reports)
+        print(f"retention completed: {total} rows removed in {elapsed:.3f}s")
+        return
+
+    for report in reports:
+        if report["error"]:
+            print(f"ERROR: {report['policy']}: {report['error']}", file=sys.stderr)
+
+
+def main() -> int:
+    """Run the retention sweep; exit status 1 if a policy failed, 2 on bad options."""
+    _bootstrap_path()
+
+    from app.config import Config  # pylint: disable=import-error,import-outside-toplevel
+    from core.retention import (  # pylint: disable=import-error,import-outside-toplevel
+        POLICIES,
+        RetentionSweeper,
+    )
+
+    args = _build_parser().parse_args()
+    policies = _select_policies(POLICIES, args.policy)
+    if policies is None:
+        return 2
+
+    sweeper = RetentionSweeper(
+        databases={
+            "pwa": (args.db_pwa_url or Config.DB_PWA, (args.db_pwa_type or Config.DB_PWA_TYPE).lower()),
+            "safe": (args.db_safe_url or Config.DB_SAFE, (args.db_safe_type or Config.DB_SAFE_TYPE).lower()),
+        },
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+        policies=policies,
+    )
+
+    started = time.perf_counter()
+    reports = sweeper.sweep()
+    _print_reports(reports, time.perf_counter() - started, args.quiet)
+
+    return 1 if any(report["error"] for report in reports) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
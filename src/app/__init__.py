@@ -1,17 +1,22 @@
 """Initialize Flask application and register blueprints."""
 
-import ipaddress
 import json
 import os
 import fnmatch
 from importlib import import_module
 
-from flask import Flask, request, abort
+from flask import Flask, abort, g, request
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.routing import PathConverter
 
-from utils.utils import merge_dict
-from utils.network import normalize_host, is_allowed_host
+from core.compression import ResponseCompressor
+from core.page_cache import PageCache, serve_cached_page
+from core.query_catalog import catalog as query_catalog
+from core.retention import RetentionJob
+from core.static_index import StaticIndex
+from core.unit_of_work import end_unit_of_work
+from utils.utils import merge_dict, request_host
+from utils.network import get_ip_matcher
 
 
 from .config import Config
@@ -35,106 +40,94 @@ class TrustedProxyHeaderGuard: # pylint: disable=too-few-public-methods
 
     def __init__(self, app, trusted_proxy_cidrs):
         self.app = app
-        self._trusted_networks = []
-
-        for value in trusted_proxy_cidrs or []:
-            item = (value or "").strip()
-            if not item:
-                continue
-            try:
-                self._trusted_networks.append(ipaddress.ip_network(item, strict=False))
-            except ValueError:
-                try:
-                    ip = ipaddress.ip_address(item)
-                    self._trusted_networks.append(
-                        ipaddress.ip_network(f"{ip}/{ip.max_prefixlen}", strict=False)
-                    )
-                except ValueError:
-                    continue
+        self._trusted = get_ip_matcher(trusted_proxy_cidrs or [])
 
     def __call__(self, environ, start_response):
-        remote_addr = (environ.get("REMOTE_ADDR") or "").strip()
-        trusted_remote = False
-
-        try:
-            remote_ip = ipaddress.ip_address(remote_addr)
-            trusted_remote = any(remote_ip in network for network in self._trusted_networks)
-        except ValueError:
-            trusted_remote = False
-
-        if not trusted_remote:
+        if not self._trusted.contains(environ.get("REMOTE_ADDR")):
             for key in self.FORWARDED_HEADER_KEYS:
                 environ.pop(key, None)
 
         return self.app(environ, start_response)
 
 
-def add_security_headers(response): # pylint: disable=too-many-locals
-    """Add security headers to the response."""
-    from flask import g, current_app  # pylint: disable=import-outside-toplevel
+class SecurityHeaders:  # pylint: disable=too-few-public-methods
+    """
+    after_request hook adding the security headers. The static headers and
+    the Content-Security-Policy are built once from the app config; only the
+    per-request nonce is inserted.
+    """
+
+    _NONCE_MARK = "\x00nonce\x00"
+
+    def __init__(self, config):
+        self.headers = [
+            ("X-Frame-Options", "DENY"),
+            ("X-Content-Type-Options", "nosniff"),
+            ("X-XSS-Protection", "1; mode=block"),
+            ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+            ("Referrer-Policy", config.get("REFERRER_POLICY", "strict-origin-when-cross-origin")),
+        ]
+        permissions_policy = config.get("PERMISSIONS_POLICY", "")
+        if permissions_policy:
+            self.headers.append(("Permissions-Policy", permissions_policy))
+
+        # CSP Unsafe options
+        # Note: When unsafe-inline or unsafe-eval is used, nonce is not compatible
+        script_unsafe = []
+        if config.get("CSP_ALLOWED_SCRIPT_UNSAFE_INLINE"):
+            script_unsafe.append("'unsafe-inline'")
+        if config.get("CSP_ALLOWED_SCRIPT_UNSAFE_EVAL"):
+            script_unsafe.append("'unsafe-eval'")
+
+        style_unsafe = []
+        if config.get("CSP_ALLOWED_STYLE_UNSAFE_INLINE"):
+            style_unsafe.append("'unsafe-inline'")
+
+        self.csp = self._csp(config, "", script_unsafe, style_unsafe)
+        # CSP split at the nonce positions, None when the nonce is not used.
+        self.csp_parts = None
+        if not script_unsafe and not style_unsafe:
+            self.csp_parts = self._csp(config, self._NONCE_MARK, [], []).split(self._NONCE_MARK)
+
+    @staticmethod
+    def _csp(config, nonce_str, script_unsafe, style_unsafe):
+        def get_csp_string(key):
+            return " ".join(filter(None, config.get(key, [])))
+
+        scripts = get_csp_string("CSP_ALLOWED_SCRIPT")
+        styles = get_csp_string("CSP_ALLOWED_STYLE")
+        images = get_csp_string("CSP_ALLOWED_IMG")
+        fonts = get_csp_string("CSP_ALLOWED_FONT")
+        connects = get_csp_string("CSP_ALLOWED_CONNECT")
+        frames = get_csp_string("CSP_ALLOWED_FRAME")
+
+        script_unsafe_str = f" {' '.join(script_unsafe)}" if script_unsafe else ""
+        style_unsafe_str = f" {' '.join(style_unsafe)}" if style_unsafe else ""
+
+        return (
+            f"default-src 'self'; "
+            f"script-src 'self'{nonce_str}{script_unsafe_str} {scripts}; "
+            f"style-src 'self'{nonce_str}{style_unsafe_str} {styles}; "
+            f"img-src 'self' data: {images}; "
+            f"font-src 'self' {fonts}; "
+            f"connect-src 'self' {connects}; "
+            f"frame-src 'self' {frames}; "
+            f"frame-ancestors 'none'; "
+            f"base-uri 'self'; "
+            f"form-action 'self';"
+        )
 
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = (
-        "max-age=31536000; includeSubDomains"
-    )
-    response.headers["Referrer-Policy"] = current_app.config.get(
-        "REFERRER_POLICY", "strict-origin-when-cross-origin"
-    )
-    permissions_policy = current_app.config.get("PERMISSIONS_POLICY", "")
-    if permissions_policy:
-        response.headers["Permissions-Policy"] = permissions_policy
-
-    # Get nonce from Flask.g
-    nonce = getattr(g, "csp_nonce", None)
-    nonce_str = f" 'nonce-{nonce}'" if nonce else ""
-
-    # Content Security Policy
-    def get_csp_string(key):
-        return " ".join(filter(None, current_app.config.get(key, [])))
-
-    scripts = get_csp_string("CSP_ALLOWED_SCRIPT")
-    styles = get_csp_string("CSP_ALLOWED_STYLE")
-    images = get_csp_string("CSP_ALLOWED_IMG")
-    fonts = get_csp_string("CSP_ALLOWED_FONT")
-    connects = get_csp_string("CSP_ALLOWED_CONNECT")
-    frames = get_csp_string("CSP_ALLOWED_FRAME")
-
-    # CSP Unsafe options
-    # Note: When unsafe-inline or unsafe-eval is used, nonce is not compatible
-    script_unsafe = []
-    if current_app.config.get("CSP_ALLOWED_SCRIPT_UNSAFE_INLINE"):
-        script_unsafe.append("'unsafe-inline'")
-    if current_app.config.get("CSP_ALLOWED_SCRIPT_UNSAFE_EVAL"):
-        script_unsafe.append("'unsafe-eval'")
-
-    style_unsafe = []
-    if current_app.config.get("CSP_ALLOWED_STYLE_UNSAFE_INLINE"):
-        style_unsafe.append("'unsafe-inline'")
-
-    # Determine if nonce should be used (not compatible with unsafe-inline)
-    use_nonce = nonce and not script_unsafe and not style_unsafe
-    nonce_str = f" 'nonce-{nonce}'" if use_nonce else ""
-
-    script_unsafe_str = f" {' '.join(script_unsafe)}" if script_unsafe else ""
-    style_unsafe_str = f" {' '.join(style_unsafe)}" if style_unsafe else ""
-
-    csp = (
-        f"default-src 'self'; "
-        f"script-src 'self'{nonce_str}{script_unsafe_str} {scripts}; "
-        f"style-src 'self'{nonce_str}{style_unsafe_str} {styles}; "
-        f"img-src 'self' data: {images}; "
-        f"font-src 'self' {fonts}; "
-        f"connect-src 'self' {connects}; "
-        f"frame-src 'self' {frames}; "
-        f"frame-ancestors 'none'; "
-        f"base-uri 'self'; "
-        f"form-action 'self';"
-    )
-    response.headers["Content-Security-Policy"] = csp
+    def __call__(self, response):
+        headers = response.headers
+        for key, value in self.headers:
+            headers[key] = value
 
-    return response
+        nonce = g.get("csp_nonce")
+        if nonce and self.csp_parts is not None:
+            headers["Content-Security-Policy"] = f" 'nonce-{nonce}'".join(self.csp_parts)
+        else:
+            headers["Content-Security-Policy"] = self.csp
+        return response
 
 
 def create_app(config_class=Config, debug=None):
@@ -153,6 +146,10 @@ def create_app(config_class=Config, debug=None):
     cache.init_app(app)
     limiter.init_app(app)
 
+    # Model files are parsed once per process; debug re-reads them when they change.
+    query_catalog.hot_reload = app.debug
+    query_catalog.preload()
+
     if app.config.get("AUTO_BOOTSTRAP_DB", False):
         bootstrap_databases(
             db_pwa_url=app.config["DB_PWA"],
@@ -183,14 +180,43 @@ def create_app(config_class=Config, debug=None):
     @app.before_request
     def reject_disallowed_host():
         """Reject requests with a Host header outside ALLOWED_HOSTS."""
-        raw_host = (request.host or request.headers.get("Host") or "").strip().lower()
-        normalized_host = normalize_host(raw_host)
-        if not normalized_host or not is_allowed_host(normalized_host, app.config.get("ALLOWED_HOSTS", [])):  # pylint: disable=line-too-long
+        _raw_host, allowed = request_host()
+        if not allowed:
             abort(400)
 
 
-    # Register security headers
-    app.after_request(add_security_headers)
+    # Each worker process purges expired rows on its own schedule.
+    app.retention_job = RetentionJob(app.config.get("RETENTION_INTERVAL_SECONDS", 0))
+    if not app.testing and app.retention_job.interval > 0:
+        app.before_request(app.retention_job.ensure_started)
+
+    # Rendered pages of anonymous GET requests; off in debug so template edits show up.
+    app.page_cache = PageCache(0 if app.debug else app.config.get("PAGE_CACHE_MAX_BYTES", 0))
+    if app.page_cache.enabled:
+        app.before_request(serve_cached_page)
+
+    # Registered first among the response hooks, so it runs last.
+    app.compressor = ResponseCompressor(
+        app.config.get("COMPRESS_LEVEL", 0), app.config.get("COMPRESS_MIN_BYTES", 1024)
+    )
+    if app.compressor.enabled:
+        app.after_request(app.compressor.compress)
+
+    # Register security headers, built once from the config
+    app.security_headers = SecurityHeaders(app.config)
+    app.after_request(app.security_headers)
+
+    @app.after_request
+    def commit_unit_of_work(response):
+        """Commit the request database work once, before the response is sent."""
+        # Unhandled exceptions also reach after_request, with a 500 response.
+        end_unit_of_work(commit=response.status_code < 500)
+        return response
+
+    @app.teardown_request
+    def rollback_unit_of_work(_exc):
+        """Roll back database work left open by a failed request."""
+        end_unit_of_work(commit=False)
 
     class AnyExtensionConverter(PathConverter):  # pylint: disable=too-few-public-methods
         """Capture any path that contains a dot (like files with extension)."""
@@ -200,4 +226,14 @@ def create_app(config_class=Config, debug=None):
     app.url_map.converters["anyext"] = AnyExtensionConverter
     app.components = Components(app)
 
+    # public/ and component static/ files served from memory; off in debug so edits show up.
+    app.static_index = StaticIndex(
+        0 if app.debug else app.config.get("STATIC_INDEX_MAX_BYTES", 0),
+        app.config.get("STATIC_INDEX_MAX_FILE_BYTES", 1048576),
+    )
+    if app.static_index.enabled:
+        app.static_index.add_directory(app.config["STATIC_FOLDER"])
+        for component in app.components.collection.values():
+            app.static_index.add_directory(f"{component['path']}/static")
+
     return app
@@ -9,6 +9,7 @@ from importlib import import_module
 from flask import Blueprint
 
 from constants import UUID_MAX_LEN, UUID_MIN_LEN
+from core.schema_overlay import FrozenDict, SchemaEncoder, freeze
 from utils.utils import merge_dict, parse_vars
 
 from .config import Config
@@ -44,6 +45,31 @@ class Components:
         self._register_blueprints()
         self._component_snip()
 
+        # Read-only base shared by every request schema (see core.schema_overlay).
+        self.base_schema = freeze(self.schema)
+        self.locale_trans = self._locale_snapshots()
+        self.schema_json = SchemaEncoder()
+
+    def _locale_snapshots(self):
+        """Translation tables for each site language, plus the default one.
+
+        A request renders in a single language, so the schema it sends to
+        Neutral TS only needs that table and the one for the default language
+        (the first in data->current->site->languages) instead of all of them.
+        """
+        trans = self.base_schema["inherit"]["locale"].get("trans", {})
+        languages = self.base_schema["data"]["current"]["site"].get("languages") or []
+        default = languages[0] if languages else None
+        snapshots = {}
+
+        for language in languages:
+            codes = dict.fromkeys((language, default))
+            snapshots[language] = FrozenDict(
+                (code, trans[code]) for code in codes if code in trans
+            )
+
+        return snapshots
+
     def _register_manifest(self):
         """Registers manifests for valid components."""
 
@@ -65,12 +65,20 @@ class Config: # pylint: disable=too-few-public-methods
     TEMPLATE_NAME = config.get('TEMPLATE_NAME', 'index.ntpl')
     TEMPLATE_NAME_ERROR = config.get('TEMPLATE_NAME_ERROR', 'error.ntpl')
     TEMPLATE_HTML_MINIFY = _env_bool(config.get('TEMPLATE_HTML_MINIFY'), False)
+    TEMPLATE_STREAM = _env_bool(config.get('TEMPLATE_STREAM'), False)
+    TEMPLATE_STREAM_CHUNK_SIZE = int(config.get('TEMPLATE_STREAM_CHUNK_SIZE', 16384))
+    # gzip/br of dynamic responses, opt-in (BREACH, see config/README.md)
+    COMPRESS_LEVEL = int(config.get('COMPRESS_LEVEL', 0))
+    COMPRESS_MIN_BYTES = int(config.get('COMPRESS_MIN_BYTES', 1024))
     TEMPLATE_MAIL = os.path.join(BASE_DIR, "neutral", "mail")
     MODEL_DIR = os.path.join(BASE_DIR, "model")
     COMPONENT_DIR = os.path.join(BASE_DIR, "component")
 
     STATIC_FOLDER = os.path.join(BASE_DIR, "..", "public")
     STATIC_CACHE_CONTROL = config.get('STATIC_CACHE_CONTROL', "max-age=14400")
+    # In-memory static assets with ETag and gzip/br variants; STATIC_INDEX_MAX_BYTES=0 disables it
+    STATIC_INDEX_MAX_BYTES = int(config.get('STATIC_INDEX_MAX_BYTES', 67108864))
+    STATIC_INDEX_MAX_FILE_BYTES = int(config.get('STATIC_INDEX_MAX_FILE_BYTES', 1048576))
     CONFIG_DB_PATH = (
         config.get('CONFIG_DB_PATH', '')
         or os.path.join(BASE_DIR, "..", "config", "config.db")
@@ -106,6 +114,17 @@ class Config: # pylint: disable=too-few-public-methods
     SESSION_KEY = "SESSION"
     SESSION_TOKEN_LENGTH = int(config.get('SESSION_TOKEN_LENGTH', 32))
     SESSION_IDLE_EXPIRES_SECONDS = int(config.get('SESSION_IDLE_EXPIRES_SECONDS', 2592000))
+    # In-process session row cache; SESSION_CACHE_TTL=0 disables it
+    SESSION_CACHE_TTL = int(config.get('SESSION_CACHE_TTL', 30))
+    SESSION_CACHE_MAX_ENTRIES = int(config.get('SESSION_CACHE_MAX_ENTRIES', 10000))
+    SESSION_CACHE_POLL_SECONDS = int(config.get('SESSION_CACHE_POLL_SECONDS', 2))
+    # Write-behind session touches; SESSION_TOUCH_FLUSH_SECONDS=0 writes them in the request
+    SESSION_TOUCH_FLUSH_SECONDS = float(config.get('SESSION_TOUCH_FLUSH_SECONDS', 5))
+    SESSION_TOUCH_BATCH_SIZE = int(config.get('SESSION_TOUCH_BATCH_SIZE', 100))
+    # Versioned per-user role cache; ROLE_CACHE_MAX_ENTRIES=0 disables it
+    ROLE_CACHE_MAX_ENTRIES = int(config.get('ROLE_CACHE_MAX_ENTRIES', 10000))
+    # Rendered pages of anonymous GETs (manifest "page_cache"); PAGE_CACHE_MAX_BYTES=0 disables it
+    PAGE_CACHE_MAX_BYTES = int(config.get('PAGE_CACHE_MAX_BYTES', 33554432))
     UTOKEN_KEY = "USER_SECURITY"
     UTOKEN_IDLE_EXPIRES_SECONDS = int(config.get('UTOKEN_IDLE_EXPIRES_SECONDS', 14400))
     FTOKEN_EXPIRES_SECONDS = int(config.get('FTOKEN_EXPIRES_SECONDS', 240))
@@ -171,6 +190,22 @@ class Config: # pylint: disable=too-few-public-methods
     DB_FILES_PORT = config.get('DB_FILES_PORT', '')
     DB_FILES_PATH = config.get('DB_FILES_PATH', '') or os.path.join(BASE_DIR, "..", 'storage')  # SQLite  # pylint: disable=line-too-long
 
+    # Connection pool shared by every Model using the same database URL
+    DB_POOL_SIZE = int(config.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(config.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_PRE_PING = _env_bool(config.get('DB_POOL_PRE_PING'), False)
+    DB_POOL_RECYCLE = int(config.get('DB_POOL_RECYCLE', 3600))
+
+    # Data retention (core.retention); a negative age disables that policy
+    RETENTION_INTERVAL_SECONDS = int(config.get('RETENTION_INTERVAL_SECONDS', 3600))
+    RETENTION_BATCH_SIZE = int(config.get('RETENTION_BATCH_SIZE', 500))
+    RETENTION_MAX_BATCHES = int(config.get('RETENTION_MAX_BATCHES', 100))
+    RETENTION_SESSION_EXPIRED_SECONDS = int(config.get('RETENTION_SESSION_EXPIRED_SECONDS', 0))
+    RETENTION_SESSION_CLOSED_SECONDS = int(config.get('RETENTION_SESSION_CLOSED_SECONDS', 86400))
+    RETENTION_SESSION_CHANGE_SECONDS = int(config.get('RETENTION_SESSION_CHANGE_SECONDS', 3600))
+    RETENTION_PIN_SECONDS = int(config.get('RETENTION_PIN_SECONDS', 0))
+    RETENTION_UID_SECONDS = int(config.get('RETENTION_UID_SECONDS', 86400))
+
     if DB_PWA_TYPE == 'sqlite':
         DB_PWA = f"sqlite:///{Path(DB_PWA_PATH).joinpath(f'{DB_PWA_NAME}')}"
     else:
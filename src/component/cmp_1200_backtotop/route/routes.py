@@ -1,8 +1,8 @@
 """Back To Top routes module."""
 
-from flask import Response, send_from_directory
+from flask import Response, abort
 
-from app.config import Config
+from core.static_index import serve_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -12,14 +12,16 @@ STATIC = f"{bp.component['path']}/static"
 @bp.route("/css/backtotop.min.css", methods=["GET"])
 def backtotop_css() -> Response:
     """backtotop.css"""
-    response = send_from_directory(STATIC, "backtotop.min.css")
-    response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+    response = serve_static(STATIC, "backtotop.min.css")
+    if response is None:
+        abort(404)
     return response
 
 
 @bp.route("/js/backtotop.min.js", methods=["GET"])
 def backtotop_js() -> Response:
     """backtotop.js"""
-    response = send_from_directory(STATIC, "backtotop.min.js")
-    response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+    response = serve_static(STATIC, "backtotop.min.js")
+    if response is None:
+        abort(404)
     return response
@@ -1,9 +1,9 @@
 """Ftoken routes module."""
 
-from flask import Response, request, send_from_directory
+from flask import Response, abort, request
 
-from app.config import Config
 from app.extensions import require_header_set
+from core.static_index import serve_static
 
 from . import bp  # pylint: disable=no-name-in-module
 from .dispatcher_ftoken import DispatcherFtoken
@@ -23,6 +23,7 @@ def ftoken(route, key, fetch_id, form_id) -> Response:
 @bp.route("/ftoken.min.js", methods=["GET"])
 def ftoken_js() -> Response:
     """ftoken.min.js"""
-    response = send_from_directory(STATIC, "ftoken.min.js")
-    response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+    response = serve_static(STATIC, "ftoken.min.js")
+    if response is None:
+        abort(404)
     return response
@@ -16,6 +16,7 @@ import core.dispatcher as core_dispatcher_module
 import dispatcher_form_sign as sign_dispatcher_module  # pylint: disable=import-error
 from dispatcher_form_sign import DispatcherFormSignPin  # pylint: disable=import-error
 from constants import PIN_TARGET_REMINDER, UNCONFIRMED
+from core.role_cache import RoleCache
 from core.user import User
 
 _TEST_DIR = Path(__file__).resolve().parent
@@ -35,6 +36,7 @@ def _methods_for_rule(flask_app, rule_path: str) -> set[str]:
 def _build_user_for_unit(model):
     user = User.__new__(User)
     user.model = model
+    user.role_cache = RoleCache(max_entries=0)
     user.now = 1700000000
     user.hash_login = lambda email: email  # type: ignore[assignment]
     return user
@@ -184,7 +186,7 @@ def test_pin_form_post_valid_token_and_pin_redirects_home(client, monkeypatch):
     )
 
     class _FakeUser:
-        def __init__(self):
+        def __init__(self, **_kwargs):
             self.model = SimpleNamespace(exec=lambda *_args, **_kwargs: {"success": True})
 
         def build_session_user_data(self, user_id):
@@ -353,6 +355,9 @@ def test_user_role_helpers_assign_and_remove():
             self.has_error = False
             self.roles = {"admin", "editor"}
 
+        def clear_error(self):
+            self.has_error = False
+
         def exec(self, _domain, operation, params):
             if operation == "assign-role-by-code":
                 assert params["code"] == "admin"
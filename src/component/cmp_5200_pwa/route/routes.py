@@ -1,12 +1,11 @@
 """PWA routes module."""
 
-import os
-
-from flask import Response, request, send_from_directory
+from flask import Response, abort, request
 
 from app.config import Config
 from app.extensions import limiter
 from core.dispatcher import Dispatcher
+from core.static_index import serve_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -25,8 +24,9 @@ def service_worker() -> Response:
     else:
         static = STATIC
 
-    response = send_from_directory(static, "service-worker.js")
-    response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+    response = serve_static(static, "service-worker.js")
+    if response is None:
+        abort(404)
     return response
 
 
@@ -38,8 +38,9 @@ def pwa_manifest_json(route) -> Response:
     """manifest.json requires variable replacement."""
 
     if CONFIG["public-has-manifest"]:
-        response = send_from_directory(PUBLIC, f"{DIR}/manifest.json")
-        response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+        response = serve_static(PUBLIC, f"{DIR}/manifest.json")
+        if response is None:
+            abort(404)
         return response
 
     dispatch = Dispatcher(request, route, bp.neutral_route)
@@ -61,8 +62,9 @@ def pwa_offline(route) -> Response:
     """offline.html variable replacement."""
 
     if CONFIG["public-has-offline"]:
-        response = send_from_directory(PUBLIC, f"{DIR}/offline.html")
-        response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+        response = serve_static(PUBLIC, f"{DIR}/offline.html")
+        if response is None:
+            abort(404)
         return response
 
     dispatch = Dispatcher(request, route, bp.neutral_route)
@@ -81,12 +83,8 @@ def pwa_static(relative_route) -> Response:
     else:
         static = STATIC
 
-    route = f"{DIR}/{relative_route}"
-    file_path = os.path.join(static, route)
-
-    if os.path.exists(file_path) and not os.path.isdir(file_path):
-        response = send_from_directory(static, route)
-        response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+    response = serve_static(static, f"{DIR}/{relative_route}")
+    if response is not None:
         return response
 
     dispatch = Dispatcher(request, "404")
@@ -2,14 +2,12 @@
 
 """Hello component routes module."""
 
-import os
-
-from flask import Response, request, send_from_directory
+from flask import Response, request
 from hellocomp_0yt2sa import hellocomp
 
-from app.config import Config
 from app.extensions import require_header_set
 from core.dispatcher import Dispatcher
+from core.static_index import serve_static
 
 from . import bp  # pylint: disable=no-name-in-module
 from .dispatcher_hellocomp import DispatcherHelloComp
@@ -50,10 +48,8 @@ def hellocomp_catch_all(route) -> Response:
     """Handle undefined urls."""
 
     if route:
-        file_path = os.path.join(STATIC, route)
-        if os.path.exists(file_path) and not os.path.isdir(file_path):
-            response = send_from_directory(STATIC, route)
-            response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+        response = serve_static(STATIC, route)
+        if response is not None:
             return response
 
     dispatch = Dispatcher(request, route, bp.neutral_route)
@@ -1,6 +1,7 @@
 """Dispatcher for admin component routes and user administration logic."""
 
 import time
+from urllib.parse import urlencode
 
 from flask import Response, abort, request
 
@@ -34,6 +35,9 @@ class DispatcherAdmin(Dispatcher):
             "role_filter": "",
             "disabled_filter": "",
             "order": "created",
+            "cursor": "",
+            "next_url": "",
+            "prev_url": "",
             "users": [],
             "disabled_options": DispatcherAdmin._build_disabled_options(),
             "can_full": False,
@@ -207,37 +211,46 @@ class DispatcherAdmin(Dispatcher):
             "disabled_date",
         }
         state["order"] = requested_order if requested_order in allowed_orders else "created"
+        state["cursor"] = (request.values.get("cursor") or "").strip()
         return state
 
+    @staticmethod
+    def _page_url(state: dict, cursor: str) -> str:
+        if not cursor:
+            return ""
+        return "?" + urlencode({
+            "search": state["search"],
+            "role_filter": state["role_filter"],
+            "disabled_filter": state["disabled_filter"],
+            "order": state["order"],
+            "cursor": cursor,
+        })
+
     def _fill_user_list(self, state: dict) -> None:
-        state["users"] = self.user.admin_list_users(
+        page = self.user.admin_list_users_page(
             order_by=state["order"],
             search=state["search"],
             role_code=state["role_filter"],
             disabled_reason=state["disabled_filter"],
             limit=100,
-            offset=0,
+            cursor=state["cursor"],
         )
+        state["users"] = page["users"]
+        state["next_url"] = self._page_url(state, page["next_cursor"])
+        state["prev_url"] = self._page_url(state, page["prev_cursor"])
 
-        disabled_labels = {
-            int(code): name
-            for name, code in Config.DISABLED.items()
-        }
-
+        # Roles and disabled reasons come batched for the whole page.
         for user_row in state["users"]:
-            disabled_items = []
-            for item in user_row.get("disabled", []):
-                reason_code = int(item.get("reason"))
-                disabled_items.append(
-                    {
-                        "reason": reason_code,
-                        "name": disabled_labels.get(reason_code, str(reason_code)),
-                        "description": item.get("description") or "",
-                        "created": item.get("created"),
-                        "modified": item.get("modified"),
-                    }
-                )
-            user_row["disabled"] = disabled_items
+            user_row["disabled"] = [
+                {
+                    "reason": int(item.get("reason")),
+                    "name": item.get("name"),
+                    "description": item.get("description") or "",
+                    "created": item.get("created"),
+                    "modified": item.get("modified"),
+                }
+                for item in user_row.get("disabled", [])
+            ]
 
     def render_route(self) -> Response:
         """Execute admin route logic and render."""
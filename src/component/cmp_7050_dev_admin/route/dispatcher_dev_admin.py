@@ -1,7 +1,6 @@
 """Dispatcher for dev admin component routes."""
 
 import hmac
-import ipaddress
 import json
 import secrets
 import time
@@ -16,6 +15,7 @@ from app.config_db import (
 )
 from constants import UUID_MAX_LEN, UUID_MIN_LEN
 from core.dispatcher import Dispatcher
+from utils.network import ANY_ADDRESS, LOOPBACK, get_ip_matcher
 from utils.utils import get_ip
 
 _AUTH_SESSION_KEY = "DEV_ADMIN_AUTH"
@@ -45,36 +45,12 @@ class DispatcherDevAdmin(Dispatcher):
 
     @staticmethod
     def _is_allowed_ip(remote_addr):
-        try:
-            remote_ip = ipaddress.ip_address((remote_addr or "").strip())
-        except ValueError:
-            return False
-
-        if current_app.config.get("DEV_ADMIN_LOCAL_ONLY", True) and not remote_ip.is_loopback:
-            return False
+        if current_app.config.get("DEV_ADMIN_LOCAL_ONLY", True):
+            if not get_ip_matcher(LOOPBACK).contains(remote_addr):
+                return False
 
-        allowed = current_app.config.get("DEV_ADMIN_ALLOWED_IPS", [])
-        if not allowed:
-            return True
-
-        for item in allowed:
-            value = (item or "").strip()
-            if not value:
-                continue
-            try:
-                network = ipaddress.ip_network(value, strict=False)
-                if remote_ip in network:
-                    return True
-                continue
-            except ValueError:
-                pass
-            try:
-                if remote_ip == ipaddress.ip_address(value):
-                    return True
-            except ValueError:
-                continue
-
-        return False
+        allowed = current_app.config.get("DEV_ADMIN_ALLOWED_IPS", []) or ANY_ADDRESS
+        return get_ip_matcher(allowed).contains(remote_addr)
 
     @staticmethod
     def _credentials_ready():
@@ -1,12 +1,11 @@
 """catch_all Blueprint Module."""
 
-import os
-
-from flask import Response, request, send_from_directory
+from flask import Response, request
 
 from app.config import Config
 from app.extensions import limiter
 from core.dispatcher import Dispatcher
+from core.static_index import serve_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -15,10 +14,8 @@ from . import bp  # pylint: disable=no-name-in-module
 @limiter.limit(Config.STATIC_LIMITS)
 def serve_static_file(route) -> Response:
     """static file"""
-    file_path = os.path.join(Config.STATIC_FOLDER, route)
-    if os.path.exists(file_path) and not os.path.isdir(file_path):
-        response = send_from_directory(Config.STATIC_FOLDER, route)
-        response.headers['Cache-Control'] = Config.STATIC_CACHE_CONTROL
+    response = serve_static(Config.STATIC_FOLDER, route)
+    if response is not None:
         return response
 
     dispatch = Dispatcher(request, "404")
@@ -0,0 +1,176 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Compression of dynamic responses (rendered pages, JSON).
+
+ResponseCompressor.compress() runs as the last after_request hook. The
+encoding is negotiated from Accept-Encoding: br when the optional brotli
+package is installed, otherwise gzip. A response is left as it is when:
+
+- its type is already compressed (images, fonts, archives...) or it is not
+  in COMPRESSIBLE_TYPES,
+- it has a Content-Encoding (static index variants) or is sent from a file,
+- its body is under COMPRESS_MIN_BYTES or Cache-Control has no-transform.
+
+Streamed pages (TEMPLATE_STREAM) are compressed chunk by chunk with a sync
+flush, so the head still reaches the browser first.
+
+Compressed size and CPU time are counted per worker, see stats(); use it,
+or "bin/benchmark.py compress", to choose COMPRESS_LEVEL. It is off by
+default (0): compressing pages that carry tokens next to reflected request
+data exposes them to BREACH, see config/README.md.
+"""
+
+import threading
+import time
+import zlib
+from typing import Iterable, Iterator
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ETag suffix per encoding, shared with the static index variants.
+ETAG_SUFFIXES = {"br": "br", "gzip": "gz"}
+
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+    "image/x-icon",
+    "image/vnd.microsoft.icon",
+    "font/ttf",
+    "font/otf",
+}
+
+
+def is_compressible(mimetype: str) -> bool:
+    """True for text types and the types in COMPRESSIBLE_TYPES."""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES
+
+
+class _Encoder:
+    """gzip or brotli stream with the same interface."""
+
+    __slots__ = ("_obj", "_brotli")
+
+    def __init__(self, encoding: str, level: int):
+        self._brotli = encoding == "br"
+        if self._brotli:
+            self._obj = brotli.Compressor(quality=min(level, 11))
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def feed(self, data: bytes) -> bytes:
+        """Compress data and flush it, so it can be sent now."""
+        if self._brotli:
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the rest and end the stream."""
+        if self._brotli:
+            return self._obj.process(data) + self._obj.finish()
+        return self._obj.compress(data) + self._obj.flush()
+
+
+class ResponseCompressor:
+    """after_request hook that compresses dynamic responses."""
+
+    def __init__(self, level: int, min_bytes: int = 1024):
+        self.level = max(0, min(level, 9))
+        self.min_bytes = min_bytes
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        self._lock = threading.Lock()
+        self._responses = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._cpu = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """True when responses are compressed."""
+        return self.level > 0
+
+    def stats(self) -> dict:
+        """Responses compressed by this worker, with ratio and CPU time."""
+        with self._lock:
+            responses, bytes_in, bytes_out, cpu = (
+                self._responses, self._bytes_in, self._bytes_out, self._cpu,
+            )
+        return {
+            "level": self.level,
+            "responses": responses,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "ratio": round(bytes_in / bytes_out, 2) if bytes_out else 0.0,
+            "cpu_ms": round(cpu * 1000, 3),
+            "cpu_ms_per_response": round(cpu * 1000 / responses, 3) if responses else 0.0,
+        }
+
+    def _record(self, bytes_in: int, bytes_out: int, cpu: float) -> None:
+        with self._lock:
+            self._responses += 1
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+            self._cpu += cpu
+
+    def compress(self, response: Response) -> Response:
+        """Compress the response if the client accepts it and it is worth it."""
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or not is_compressible(response.mimetype or "")
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if "no-transform" in response.headers.get("Cache-Control", ""):
+            return response
+
+        accepted = request.accept_encodings
+        encoding = next((name for name in self.encodings if accepted[name]), None)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.iter_encoded(), encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_bytes:
+                return response
+            start = time.thread_time()
+            data = _Encoder(encoding, self.level).finish(body)
+            self._record(len(body), len(data), time.thread_time() - start)
+            if len(data) >= len(body):
+                return response
+            response.set_data(data)
+
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{ETAG_SUFFIXES[encoding]}", weak)
+        return response
+
+    def _stream(self, chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+        encoder = _Encoder(encoding, self.level)
+        bytes_in = bytes_out = 0
+        cpu = 0.0
+        for chunk in chunks:
+            start = time.thread_time()
+            data = encoder.feed(chunk)
+            cpu += time.thread_time() - start
+            bytes_in += len(chunk)
+            bytes_out += len(data)
+            if data:
+                yield data
+        data = encoder.finish()
+        self._record(bytes_in, bytes_out + len(data), cpu)
+        yield data
@@ -13,6 +13,7 @@ from .schema import Schema
 from .session import Session
 from .user import User
 from .template import Template
+from .unit_of_work import get_unit_of_work
 
 
 class Dispatcher: # pylint: disable=too-many-instance-attributes
@@ -28,8 +29,9 @@ class Dispatcher: # pylint: disable=too-many-instance-attributes
         self.schema_data = self.schema.properties['data']
         self.schema_local_data = self.schema.properties['inherit']['data']
         self.ajax_request = self.schema_data['CONTEXT']['HEADERS'].get("Requested-With-Ajax") or False  # pylint: disable=line-too-long
-        self.session = Session(self.schema_data['CONTEXT']['SESSION'])
-        self.user = User()
+        self.unit_of_work = get_unit_of_work()
+        self.session = Session(self.schema_data['CONTEXT']['SESSION'], unit_of_work=self.unit_of_work)
+        self.user = User(unit_of_work=self.unit_of_work)
         self.view = Template(self.schema)
         self._set_current_comp()
         self.common()
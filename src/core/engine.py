@@ -0,0 +1,113 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Process-wide registry of SQLAlchemy engines.
+
+Creating an engine builds a new connection pool, so doing it per Model instance
+means every request reconnects to the database. The registry keeps a single
+pooled engine per database URL and shares it between every Model, Session and
+User in the process. Engines are reset in forked children so that pooled
+connections are never shared between worker processes.
+
+pysqlite does not send BEGIN itself (it opens a transaction only before DML
+and commits before other statements), so a SAVEPOINT would start, and its
+RELEASE would commit, the outer transaction. SQLite engines get the
+SQLAlchemy workaround: driver autocommit plus an explicit BEGIN on every
+transaction start.
+"""
+
+import os
+import threading
+from typing import Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from app.config import Config
+
+
+class EngineRegistry:
+    """Keep one pooled SQLAlchemy engine per database URL."""
+
+    def __init__(self):
+        self._engines: Dict[str, Engine] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db_url: str) -> Engine:
+        """Return the shared engine for db_url, creating it on first use."""
+        engine = self._engines.get(db_url)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            engine = self._engines.get(db_url)
+            if engine is None:
+                engine = create_engine(db_url, **self.engine_options(db_url))
+                if engine.dialect.name == "sqlite":
+                    _emit_sqlite_begin(engine)
+                self._engines[db_url] = engine
+
+        return engine
+
+    @staticmethod
+    def engine_options(db_url: str) -> dict:
+        """Build pool options for db_url from the application config."""
+        options = {
+            "pool_pre_ping": Config.DB_POOL_PRE_PING,
+            "pool_recycle": Config.DB_POOL_RECYCLE,
+        }
+
+        url = make_url(db_url)
+        # In-memory SQLite uses a per-thread singleton pool without overflow.
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            return options
+
+        options["pool_size"] = Config.DB_POOL_SIZE
+        options["max_overflow"] = Config.DB_MAX_OVERFLOW
+        return options
+
+    def dispose(self) -> None:
+        """Close every pooled connection and forget all engines."""
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+
+        for engine in engines:
+            engine.dispose()
+
+    def reset_after_fork(self) -> None:
+        """Drop pooled connections inherited from the parent process.
+
+        close=False leaves the parent's connections untouched; the child simply
+        starts with empty pools.
+        """
+        self._lock = threading.Lock()
+        for engine in self._engines.values():
+            engine.dispose(close=False)
+
+
+def _emit_sqlite_begin(engine: Engine) -> None:
+    """Let SQLAlchemy, not pysqlite, start SQLite transactions."""
+
+    @event.listens_for(engine, "connect")
+    def _autocommit_driver(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+registry = EngineRegistry()
+
+
+def get_engine(db_url: str) -> Engine:
+    """Return the process-wide engine for db_url."""
+    return registry.get(db_url)
+
+
+def dispose_engines() -> None:
+    """Dispose every engine in the process-wide registry."""
+    registry.dispose()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=registry.reset_after_fork)
@@ -0,0 +1,124 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+
+"""
+Streaming HTML minifier (TEMPLATE_HTML_MINIFY).
+
+Removes the indentation, and the blank lines, in front of a tag that starts
+a line, the same as the former per-response substitution
+r"^\\s+<(?!pre\\b|...)([^>]+>)" but in one forward scan:
+
+- Whitespace in front of <pre>, <code>, <samp>, <kbd>, <var>, <textarea>,
+  <xmp>, <script>, <style> and <template> is kept.
+- The content of <pre>, <textarea>, <xmp>, <script>, <style> and HTML
+  comments is copied as it is, up to the closing tag.
+- Tag names are matched case-insensitively and only ASCII whitespace is
+  removed (a leading &nbsp; character is content).
+
+HtmlMinifier.feed() accepts the document in chunks of any size and returns
+the complete lines that are final; the last lines are held back until the
+next chunk or close(). The output is the same as minify_html() on the whole
+document.
+"""
+
+import re
+
+_KEEP_TAGS = r"(?:pre|code|samp|kbd|var|textarea|xmp|script|style|template)\b"
+
+# Whitespace run at a line start in front of a tag whose indentation goes,
+# matched from the "\n" before it so the scan can skip ahead to line breaks.
+_INDENT = re.compile(rf"\n[ \t\r\n\f\v]+(?=<(?!{_KEEP_TAGS})[^>])", re.IGNORECASE)
+_LEADING = re.compile(rf"\A[ \t\r\n\f\v]+(?=<(?!{_KEEP_TAGS})[^>])", re.IGNORECASE)
+
+# Content copied as it is up to the closing tag.
+_RAW = re.compile(r"<(?P<raw>pre|script|style|textarea|xmp)(?=[\s/>])|<!--", re.IGNORECASE)
+_CLOSE = {
+    name: re.compile(rf"</{name}\b[^>]*>", re.IGNORECASE)
+    for name in ("pre", "script", "style", "textarea", "xmp")
+}
+_COMMENT_END = re.compile(r"-->")
+
+# Longest token that may be cut by a chunk boundary ("</textarea" + 1).
+_HOLD = 16
+
+
+class HtmlMinifier:
+    """Incremental minifier, feed() chunks in order and close() at the end."""
+
+    __slots__ = ("_pending", "_close", "_line_start")
+
+    def __init__(self):
+        self._pending = ""
+        self._close = None
+        self._line_start = True
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        """Minify chunk and return the output that is already final."""
+        buf = self._pending + chunk if self._pending else chunk
+        if final:
+            return self._process(buf, len(buf))
+
+        # Cut after a "\n" that ends a non-blank line: the rest starts a line
+        # and no whitespace run or tag is split. Markup without line breaks
+        # is held until close().
+        end = len(buf) - _HOLD
+        while end > 0:
+            end = buf.rfind("\n", 0, end)
+            if end < 1 or not buf[end - 1].isspace():
+                break
+
+        if end <= 0:
+            self._pending = buf
+            return ""
+        return self._process(buf, end + 1)
+
+    def close(self) -> str:
+        """Return the rest of the document."""
+        return self.feed("", final=True)
+
+    def _process(self, buf: str, end: int) -> str:
+        out = []
+        pos = 0
+        while pos < end:
+            if self._close is not None:
+                match = self._close.search(buf, pos)
+                if match is None or match.start() >= end:
+                    out.append(buf[pos:end])
+                    pos = end
+                    break
+                out.append(buf[pos:match.end()])
+                pos = match.end()
+                self._close = None
+                continue
+
+            # Only the start of buf can be a line start the indent regex misses.
+            line_start = pos == 0 and self._line_start
+            match = _RAW.search(buf, pos)
+            if match is None or match.start() >= end:
+                out.append(self._minify(buf[pos:end], line_start))
+                pos = end
+                break
+
+            if match.group("raw"):
+                out.append(self._minify(buf[pos:match.start()], line_start))
+                out.append(match.group())
+                self._close = _CLOSE[match.group("raw").lower()]
+            else:
+                # Indentation in front of a comment goes too.
+                out.append(self._minify(buf[pos:match.end()], line_start))
+                self._close = _COMMENT_END
+            pos = match.end()
+
+        self._line_start = buf[pos - 1] == "\n" if pos else self._line_start
+        self._pending = buf[pos:]
+        return "".join(out)
+
+    @staticmethod
+    def _minify(text: str, line_start: bool) -> str:
+        if line_start:
+            text = _LEADING.sub("", text, count=1)
+        return _INDENT.sub("\n", text)
+
+
+def minify_html(text: str) -> str:
+    """Minify a whole document."""
+    return HtmlMinifier().feed(text, final=True)
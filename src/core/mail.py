@@ -13,8 +13,10 @@ from app.config import Config
 
 if Config.NEUTRAL_IPC:
     from neutral_ipc_template import NeutralIpcTemplate as NeutralTemplate
+    from neutral_ipc_template import neutral_ipc_config as ipc_config
 else:
     from neutraltemplate import NeutralTemplate
+    ipc_config = None  # pylint: disable=invalid-name
 
 
 class Mail():
@@ -80,7 +82,10 @@ class Mail():
         self.default_schema['data']['mail_data']["auth_pin"] = user_data.get('pin', '')
         self.default_schema['data']['mail_data']["user_alias"] = user_data.get('alias', '')
 
-        template = NeutralTemplate(self.template_layout, json.dumps(self.default_schema))
+        schema = self.default_schema
+        if ipc_config is None or ipc_config.SCHEMA_FORMAT != "binary":
+            schema = json.dumps(schema)
+        template = NeutralTemplate(self.template_layout, schema)
         body = template.render()
 
         if Config.MAIL_METHOD == 'sendmail':
@@ -0,0 +1,257 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+In-process cache of rendered pages for anonymous GET requests.
+
+A component opts in from its manifest.json:
+
+    "page_cache": {"ttl": 300, "routes": {"contact": 0}}
+
+"ttl" applies to every route of the component and "routes" overrides it for
+a route (the "route" argument of the view); 0 disables caching.
+
+Only GET requests without a session cookie and without query arguments other
+than the language/theme/color keys are cached. The key is the host, path,
+language, theme, color, the AJAX flag, whether the utoken cookie was sent and
+the remaining cookies (templates may read them). A hit is answered in a
+before_request hook, so Schema, Dispatcher and the renderer do not run.
+
+Per-request values are never served from the cache: the CSP nonce and the
+LTOKEN are replaced by markers when the page is stored and by fresh values on
+every hit, and the utoken and tab-change cookies are issued again exactly as
+Dispatcher.common does. Other cookies and headers set by the view are stored
+with the page.
+
+Entries are kept in an LRU limited by the total size of the stored bodies.
+Each worker process has its own cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from flask import Response, current_app, g, make_response, request
+
+from app.config import Config
+from utils.nonce import get_nonce
+from utils.sbase64url import sbase64url_md5
+from utils.tokens import ltoken_create, utoken_extract, utoken_update
+
+NONCE_MARK = "\x00page-cache:nonce\x00"
+LTOKEN_MARK = "\x00page-cache:ltoken\x00"
+
+# Response headers that belong to a single response.
+_SKIP_HEADERS = {"set-cookie", "content-length"}
+
+
+class CachedPage:  # pylint: disable=too-few-public-methods
+    """Rendered body with markers, status, headers and static cookies."""
+
+    __slots__ = ("status", "body", "headers", "cookies", "size", "expires")
+
+    def __init__(self, status, body, headers, cookies, expires):
+        self.status = status
+        self.body = body
+        self.headers = headers
+        self.cookies = cookies
+        self.size = len(body.encode("utf-8"))
+        self.expires = expires
+
+
+class PageCache:
+    """LRU of rendered pages limited by the total size of their bodies."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[Tuple, CachedPage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """True when the cache may hold entries."""
+        return self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, now: Optional[float] = None) -> Optional[CachedPage]:
+        """Return the page for key if it has not expired."""
+        now = time.time() if now is None else now
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                return None
+            if page.expires <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return page
+
+    def put(self, key, page: CachedPage) -> None:
+        """Store page, evicting the least recently used ones over budget."""
+        if not self.enabled or page.size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = page
+            self.bytes += page.size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop every cached page."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _remove(self, key) -> None:
+        page = self._entries.pop(key, None)
+        if page is not None:
+            self.bytes -= page.size
+
+
+def page_ttl(req) -> int:
+    """Seconds the page of this request may be cached according to its manifest."""
+    blueprint = current_app.blueprints.get(req.blueprint or "")
+    options = getattr(blueprint, "manifest", {}).get("page_cache") or {}
+    if not isinstance(options, dict):
+        return 0
+
+    ttl = options.get("ttl", 0)
+    routes = options.get("routes") or {}
+    route = (req.view_args or {}).get("route")
+    if route is not None and route in routes:
+        ttl = routes[route]
+
+    try:
+        return max(0, int(ttl))
+    except (TypeError, ValueError):
+        return 0
+
+
+def page_key(req, base_schema) -> Optional[Tuple]:
+    """Cache key for an anonymous GET request, or None if it is not cacheable.
+
+    Language, theme and color are resolved with the same precedence as
+    core.schema.Schema (GET argument, cookie, then default).
+    """
+    if req.method != "GET" or Config.SESSION_KEY in req.cookies:
+        return None
+
+    variant_keys = (Config.LANG_KEY, Config.THEME_KEY, Config.THEME_COLOR_KEY)
+    if any(key not in variant_keys for key in req.args):
+        return None
+
+    languages = base_schema["data"]["current"]["site"]["languages"]
+    language = (
+        req.args.get(Config.LANG_KEY)
+        or req.cookies.get(Config.LANG_KEY)
+        or req.accept_languages.best_match(languages)
+        or ""
+    )
+    if language not in languages:
+        language = languages[0]
+
+    theme = base_schema["inherit"]["data"]["current"]["theme"]
+    selected_theme = req.args.get(Config.THEME_KEY) or req.cookies.get(Config.THEME_KEY)
+    if selected_theme not in theme["allow_themes"]:
+        selected_theme = theme["theme"]
+    selected_color = (
+        req.args.get(Config.THEME_COLOR_KEY) or req.cookies.get(Config.THEME_COLOR_KEY)
+    )
+    if selected_color not in theme["allow_colors"]:
+        selected_color = theme["color"]
+
+    skip_cookies = (Config.UTOKEN_KEY, Config.TAB_CHANGES_KEY) + variant_keys
+    other_cookies = tuple(sorted(
+        (name, value) for name, value in req.cookies.items() if name not in skip_cookies
+    ))
+
+    return (
+        req.host_url,
+        req.path,
+        language,
+        selected_theme,
+        selected_color,
+        bool(req.headers.get("Requested-With-Ajax")),
+        Config.UTOKEN_KEY in req.cookies,
+        other_cookies,
+    )
+
+
+def serve_cached_page() -> Optional[Response]:
+    """before_request hook: answer from the cache or mark the request for storing."""
+    cache = getattr(current_app, "page_cache", None)
+    if cache is None or not cache.enabled:
+        return None
+
+    ttl = page_ttl(request)
+    if not ttl:
+        return None
+
+    key = page_key(request, current_app.components.base_schema)
+    if key is None:
+        return None
+
+    page = cache.get(key)
+    if page is None:
+        g.page_cache = (key, ttl)
+        return None
+
+    return _build_response(page)
+
+
+def store_page(status_code: int, contents: str, data, response, cookies) -> None:
+    """Store a page rendered by core.template.Template if its request was marked."""
+    pending = g.pop("page_cache", None)
+    if pending is None or data["CONTEXT"].get("SESSION") is not None:
+        return
+
+    key, ttl = pending
+    body = contents
+    if data.get("CSP_NONCE"):
+        body = body.replace(data["CSP_NONCE"], NONCE_MARK)
+    if data.get("LTOKEN"):
+        body = body.replace(data["LTOKEN"], LTOKEN_MARK)
+
+    headers = [
+        (name, value) for name, value in response.headers.items()
+        if name.lower() not in _SKIP_HEADERS
+    ]
+    cookies = {
+        name: params for name, params in cookies.items()
+        if name not in (Config.UTOKEN_KEY, Config.TAB_CHANGES_KEY)
+    }
+    current_app.page_cache.put(
+        key, CachedPage(status_code, body, headers, cookies, time.time() + ttl)
+    )
+
+
+def _build_response(page: CachedPage) -> Response:
+    """Response for a cache hit with fresh nonce, LTOKEN and utoken cookies."""
+    ajax = bool(request.headers.get("Requested-With-Ajax"))
+    if ajax:
+        utoken, utoken_cookie = utoken_extract(request.cookies.get(Config.UTOKEN_KEY))
+    else:
+        utoken, utoken_cookie = utoken_update(request.cookies.get(Config.UTOKEN_KEY))
+
+    body = page.body.replace(NONCE_MARK, get_nonce())
+    body = body.replace(LTOKEN_MARK, ltoken_create(utoken))
+
+    response = make_response(body, page.status)
+    for name, value in page.headers:
+        response.headers[name] = value
+
+    cookies = dict(page.cookies)
+    if not ajax:
+        cookies.update(utoken_cookie)
+        cookies[Config.TAB_CHANGES_KEY] = {
+            "key": Config.TAB_CHANGES_KEY,
+            "value": sbase64url_md5("start" + utoken + "none"),
+        }
+    for params in cookies.values():
+        response.set_cookie(**params)
+
+    return response
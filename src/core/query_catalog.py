@@ -0,0 +1,190 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Preloaded catalog of the JSON-defined SQL queries in src/model.
+
+Each model file is read and parsed once per process. The dialect of every
+(name, key, db_type) lookup is resolved the first time it is requested and the
+result is kept as a compiled TextClause together with its operation type, so
+Model.exec does no file I/O, JSON parsing or string inspection on the hot path.
+
+With hot_reload enabled (debug mode) the file mtime is checked on every lookup
+and a changed file is reloaded; in production files are never re-read.
+
+A parameter written as `IN :name` (without parentheses) is an expanding
+parameter: pass a list and it is rendered as one placeholder per item, so a
+page of ids can be fetched in one statement.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql.elements import TextClause
+from app.config import Config
+
+DEFAULT_TYPE = '@portable'
+MAX_ALIAS_DEPTH = 8
+EXPANDING_PARAM = re.compile(r"\bIN\s+:(\w+)", re.IGNORECASE)
+
+
+def get_operation_type(sql: str) -> Optional[str]:
+    """Determine the type of SQL operation from a SQL statement.
+
+    Args:
+        sql: SQL statement to analyze
+
+    Returns:
+        The type of operation ('SELECT', 'INSERT', 'UPDATE', 'DELETE') or None
+    """
+    sql_upper = sql.strip().upper()
+    if sql_upper.startswith("INSERT"):
+        return "INSERT"
+    elif sql_upper.startswith("UPDATE"):
+        return "UPDATE"
+    elif sql_upper.startswith("DELETE"):
+        return "DELETE"
+    elif sql_upper.startswith("SELECT"):
+        return "SELECT"
+    return None
+
+
+class CompiledStatement:  # pylint: disable=too-few-public-methods
+    """A single SQL statement ready to execute."""
+
+    __slots__ = ("sql", "clause", "operation")
+
+    def __init__(self, sql: str):
+        self.sql: str = sql
+        self.clause: TextClause = text(sql)
+        expanding = sorted(set(EXPANDING_PARAM.findall(sql)))
+        if expanding:
+            self.clause = self.clause.bindparams(
+                *(bindparam(name, expanding=True) for name in expanding)
+            )
+        self.operation: Optional[str] = get_operation_type(sql)
+
+
+class CompiledQuery:  # pylint: disable=too-few-public-methods
+    """Resolved query for one (name, key, db_type): one statement or a transaction."""
+
+    __slots__ = ("statements", "transaction")
+
+    def __init__(self, statements: Tuple[CompiledStatement, ...], transaction: bool):
+        self.statements = statements
+        self.transaction = transaction
+
+
+class QueryCatalog:
+    """Process-wide cache of model files and their compiled queries."""
+
+    def __init__(self, model_dir: str = None, hot_reload: bool = False):
+        self.model_dir = model_dir or Config.MODEL_DIR
+        self.hot_reload = hot_reload
+        self._files: Dict[str, Tuple[float, dict]] = {}
+        self._compiled: Dict[Tuple[str, str, str], Optional[CompiledQuery]] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> str:
+        """Return the JSON file path for a model name."""
+        return f"{self.model_dir}/{name}.json"
+
+    def preload(self) -> None:
+        """Load every model file in model_dir so the first requests do not pay for it."""
+        try:
+            names = sorted(os.listdir(self.model_dir))
+        except OSError:
+            return
+
+        for filename in names:
+            if filename.endswith(".json"):
+                try:
+                    self._content(filename[:-5])
+                except (OSError, ValueError):
+                    continue
+
+    def clear(self) -> None:
+        """Forget all loaded files and compiled queries."""
+        with self._lock:
+            self._files.clear()
+            self._compiled.clear()
+
+    def get(self, name: str, key: str, db_type: str) -> Optional[CompiledQuery]:
+        """Return the compiled query for name/key/db_type, or None if it is not defined.
+
+        Raises:
+            OSError: the model file cannot be read
+            json.JSONDecodeError: the model file is not valid JSON
+            TypeError: the query definition is neither a string nor a list
+        """
+        content = self._content(name)
+        cache_key = (name, key, db_type)
+
+        try:
+            return self._compiled[cache_key]
+        except KeyError:
+            pass
+
+        compiled = self._compile(content.get(key, {}), db_type)
+        self._compiled[cache_key] = compiled
+        return compiled
+
+    def _content(self, name: str) -> dict:
+        entry = self._files.get(name)
+        if entry is not None and not self.hot_reload:
+            return entry[1]
+
+        file_path = self.path(name)
+        mtime = os.stat(file_path).st_mtime
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        with self._lock:
+            entry = self._files.get(name)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+
+            with open(file_path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+
+            self._files[name] = (mtime, content)
+            for cache_key in [k for k in self._compiled if k[0] == name]:
+                del self._compiled[cache_key]
+
+        return content
+
+    @staticmethod
+    def _resolve(definition: dict, db_type: str):
+        """Resolve the dialect entry for db_type following '@alias' references."""
+        if not isinstance(definition, dict):
+            return ""
+
+        sql_content = definition.get(f"@{db_type}", definition.get(DEFAULT_TYPE, ""))
+        seen = set()
+        while isinstance(sql_content, str) and sql_content.startswith('@'):
+            if sql_content in seen or len(seen) >= MAX_ALIAS_DEPTH:
+                return ""
+            seen.add(sql_content)
+            sql_content = definition.get(sql_content, "")
+
+        return sql_content
+
+    def _compile(self, definition: dict, db_type: str) -> Optional[CompiledQuery]:
+        sql_content = self._resolve(definition, db_type)
+
+        if not sql_content:
+            return None
+
+        if isinstance(sql_content, str):
+            return CompiledQuery((CompiledStatement(sql_content),), False)
+
+        if isinstance(sql_content, list) and all(isinstance(sql, str) for sql in sql_content):
+            statements: List[CompiledStatement] = [CompiledStatement(sql) for sql in sql_content]
+            return CompiledQuery(tuple(statements), True)
+
+        raise TypeError(f"Invalid SQL content type: {type(sql_content).__name__}")
+
+
+catalog = QueryCatalog()
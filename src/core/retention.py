@@ -0,0 +1,180 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Data retention: purge rows that are no longer needed.
+
+Nothing else deletes expired or closed sessions, expired PINs, the
+session_change log or the uid rows reserved by Model.create_uid for users and
+profiles that were never created or have been deleted. Each policy below
+names the model query that deletes one bounded batch (LIMIT :limit) of rows
+older than `now - age`, walking an index on the age column.
+
+Every batch is its own short transaction, so a sweep never holds long locks.
+A policy stops when a batch deletes fewer rows than the batch size or after
+RETENTION_MAX_BATCHES batches; the remainder is left for the next run.
+
+The ages come from the RETENTION_* settings; a negative age disables the
+policy. Sweeps run from bin/retention.py or periodically inside each worker
+when RETENTION_INTERVAL_SECONDS is greater than 0.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.config import Config
+from .model import Model
+
+
+class RetentionPolicy:  # pylint: disable=too-few-public-methods
+    """Which rows to purge: model query, database and the setting holding the age."""
+
+    __slots__ = ("name", "database", "model", "key", "age_setting", "params")
+
+    def __init__(self, name: str, database: str, model: str, key: str,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 age_setting: str, params: Optional[dict] = None):
+        self.name = name
+        self.database = database
+        self.model = model
+        self.key = key
+        self.age_setting = age_setting
+        self.params = params or {}
+
+    def age(self) -> int:
+        """Seconds a row is kept past its reference time; negative disables the policy."""
+        return int(getattr(Config, self.age_setting))
+
+
+POLICIES: Tuple[RetentionPolicy, ...] = (
+    RetentionPolicy(
+        "session-expired", "safe", "session", "purge-expired",
+        "RETENTION_SESSION_EXPIRED_SECONDS",
+    ),
+    RetentionPolicy(
+        "session-closed", "safe", "session", "purge-closed",
+        "RETENTION_SESSION_CLOSED_SECONDS", {"open": Config.SESSION_OPEN['false']},
+    ),
+    RetentionPolicy(
+        "session-change", "safe", "session", "purge-changes",
+        "RETENTION_SESSION_CHANGE_SECONDS",
+    ),
+    RetentionPolicy(
+        "pin-expired", "pwa", "user", "purge-expired-pins",
+        "RETENTION_PIN_SECONDS",
+    ),
+    RetentionPolicy(
+        "uid-orphan", "pwa", "app", "purge-orphan-uids",
+        "RETENTION_UID_SECONDS",
+    ),
+)
+
+
+class RetentionSweeper:
+    """Run the retention policies against the configured databases."""
+
+    def __init__(
+        self,
+        databases: Optional[Dict[str, Tuple[str, str]]] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None,
+        policies: Tuple[RetentionPolicy, ...] = POLICIES,
+    ):
+        self.databases = databases or {
+            "pwa": (Config.DB_PWA, Config.DB_PWA_TYPE),
+            "safe": (Config.DB_SAFE, Config.DB_SAFE_TYPE),
+        }
+        self.batch_size = max(1, batch_size or Config.RETENTION_BATCH_SIZE)
+        self.max_batches = max(1, max_batches or Config.RETENTION_MAX_BATCHES)
+        self.policies = policies
+
+    def sweep(self, now: Optional[int] = None) -> List[dict]:
+        """Apply every enabled policy and return one report per policy.
+
+        Each report has: policy, deleted (rows), batches, seconds and error
+        (None, or the technical error that stopped the policy).
+        """
+        now = int(time.time()) if now is None else now
+        return [self.purge(policy, now) for policy in self.policies if policy.age() >= 0]
+
+    def purge(self, policy: RetentionPolicy, now: int) -> dict:
+        """Delete the rows of one policy in bounded batches."""
+        started = time.perf_counter()
+        db_url, db_type = self.databases[policy.database]
+        model = Model(db_url, db_type)
+        params = {**policy.params, "before": now - policy.age(), "limit": self.batch_size}
+
+        deleted = 0
+        batches = 0
+        error = None
+        while batches < self.max_batches:
+            result = model.exec(policy.model, policy.key, params)
+            if model.has_error:
+                error = model.last_error
+                break
+
+            batches += 1
+            rowcount = max(0, result.get('rowcount') or 0)
+            deleted += rowcount
+            if rowcount < self.batch_size:
+                break
+
+        return {
+            "policy": policy.name,
+            "deleted": deleted,
+            "batches": batches,
+            "seconds": round(time.perf_counter() - started, 3),
+            "error": error,
+        }
+
+
+def format_report(reports: List[dict]) -> str:
+    """One line per policy: name, rows removed, batches, duration and error."""
+    lines = []
+    for report in reports:
+        line = (
+            f"{report['policy']}: {report['deleted']} rows removed"
+            f" in {report['batches']} batches ({report['seconds']:.3f}s)"
+        )
+        if report['error']:
+            line += f" ERROR: {report['error']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class RetentionJob:
+    """Background thread that sweeps every `interval` seconds in the current process."""
+
+    def __init__(self, interval: float, sweeper_factory=RetentionSweeper):
+        self.interval = interval
+        self.sweeper_factory = sweeper_factory
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._stop = threading.Event()
+
+    def ensure_started(self) -> None:
+        """Start the thread once per process (forked workers start their own)."""
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            threading.Thread(target=self._run, name="retention-sweeper", daemon=True).start()
+
+    def stop(self) -> None:
+        """Ask the thread to exit after the current sweep."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        stop = self._stop
+        while not stop.wait(self.interval):
+            try:
+                reports = self.sweeper_factory().sweep()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                print(f"✗ retention sweep failed: {exc}")
+                continue
+
+            if any(report['deleted'] or report['error'] for report in reports):
+                print(f"✓ retention sweep\n{format_report(reports)}")
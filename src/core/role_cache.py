@@ -0,0 +1,84 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Versioned per-user role cache.
+
+Building CURRENT_USER needs the user's role codes, which is a JOIN of role and
+user_role. The cache keeps the roles of each user together with the value of
+user_role_version.version they were read under. A request only reads that
+version (a primary key lookup); the JOIN runs when the version differs from
+the cached one.
+
+User.assign_role, remove_role and delete_user bump the version in the
+database, so every worker sees the change on its next request. The database
+stays the source of truth: a missing or unreadable version is never served
+from the cache.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.config import Config
+
+
+class RoleCache:
+    """LRU of (version, role codes) per user id for one database."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """True when the cache may hold entries."""
+        return self.max_entries > 0
+
+    def get(self, user_id: str, version: int) -> Optional[Tuple[str, ...]]:
+        """Return the cached roles if they were read under this version."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id: str, version: int, roles) -> None:
+        """Cache the roles read under version."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[user_id] = (version, tuple(roles))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop one user from the cache."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached user."""
+        with self._lock:
+            self._entries.clear()
+
+
+_caches: Dict[str, RoleCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_role_cache(db_url: str) -> RoleCache:
+    """Return the process-wide role cache for a database URL."""
+    cache = _caches.get(db_url)
+    if cache is not None:
+        return cache
+
+    with _caches_lock:
+        cache = _caches.get(db_url)
+        if cache is None:
+            cache = RoleCache(Config.ROLE_CACHE_MAX_ENTRIES)
+            _caches[db_url] = cache
+
+    return cache
@@ -1,7 +1,6 @@
 """Fill the schema with default values"""
 
 import os
-import copy
 from http.cookies import SimpleCookie
 
 import woothee
@@ -9,8 +8,8 @@ from flask import current_app
 
 from app.config import Config
 from constants import TMP_DIR
-from utils.utils import get_ip, merge_dict
-from utils.network import normalize_host, is_allowed_host
+from utils.utils import get_ip, merge_dict, request_host
+from .schema_overlay import OverlayDict
 
 
 
@@ -32,7 +31,9 @@ class Schema:
         self.set_theme()
 
     def _default(self) -> None:
-        self.properties = copy.deepcopy(current_app.components.schema)
+        # Copy-on-write view of the frozen base: only the branches this request
+        # reads are copied, the rest is shared and serialized from the base.
+        self.properties = OverlayDict(current_app.components.base_schema)
         self.data = self.properties['data']
         self.local_data = self.properties['inherit']['data']
         self.properties['config']['cache_disable'] = Config.NEUTRAL_CACHE_DISABLE
@@ -91,10 +92,9 @@ class Schema:
             for key, morsel in cookie.items():
                 self.data['CONTEXT']['COOKIES'][key] = morsel.value
 
-        raw_host = (self.req.host or self.req.headers.get('Host') or '').strip().lower()
-        normalized_host = normalize_host(raw_host)
+        raw_host, allowed = request_host()
 
-        if normalized_host and is_allowed_host(normalized_host, Config.ALLOWED_HOSTS):
+        if allowed:
             self.data['current']['site']['host'] = raw_host
             self.data['current']['site']['url'] = self.req.scheme + "://" + raw_host
         else:
@@ -116,6 +116,12 @@ class Schema:
         if self.properties['inherit']['locale']['current'] not in languages:
             self.properties['inherit']['locale']['current'] = languages[0]
 
+        # Only carry the translations for this language and the default one.
+        locale = self.properties['inherit']['locale']
+        trans = current_app.components.locale_trans.get(locale['current'])
+        if trans is not None:
+            locale['trans'] = trans
+
         self.data['CONTEXT']['LANGUAGE'] = self.properties['inherit']['locale'][
             'current'
         ]
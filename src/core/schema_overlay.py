@@ -0,0 +1,161 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Copy-on-write view of the merged component schema.
+
+The merged schema is built once at startup and frozen (FrozenDict/FrozenList).
+Each request gets an OverlayDict on top of it instead of a deep copy. An
+OverlayDict starts as a shallow copy of one level of the base; a nested dict
+or list is copied the first time it is read through [] / get() / setdefault()
+and the copy replaces the shared reference. Branches a request never reads
+stay shared with the base and are serialized straight from it.
+
+OverlayDict and FrozenDict are dict subclasses, so isinstance() checks,
+json.dumps() and the usual dict API keep working. Values reached through
+items()/values() or a shallow copy() are not copied: mutating a frozen branch
+through them raises TypeError instead of changing the base for every request.
+
+Because frozen branches never change, SchemaEncoder serializes each of them
+once and splices the cached JSON into the document of every request that
+still shares it; only the branches a request has copied are encoded again.
+"""
+
+import copy
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any
+
+
+def _readonly(*_args, **_kwargs):
+    raise TypeError("the base schema is read-only; modify the request schema instead")
+
+
+class FrozenDict(dict):
+    """Read-only dict used for the shared base schema."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in dict.items(self)}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list used for the shared base schema."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only deep copy of a JSON-like structure."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a value the request may modify without touching the base."""
+    if isinstance(value, FrozenDict):
+        return OverlayDict(value)
+    if isinstance(value, FrozenList):
+        return copy.deepcopy(value)
+    return value
+
+
+class OverlayDict(dict):
+    """Per-request dict that copies frozen branches of the base on first read."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if isinstance(value, (FrozenDict, FrozenList)):
+            value = thaw(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, key, *default):
+        return thaw(dict.pop(self, key, *default))
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        return key, thaw(value)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in dict.items(self)}
+
+    def __reduce__(self):
+        return (dict, (copy.deepcopy(self),))
+
+
+class SchemaEncoder:
+    """json.dumps() for request schemas that reuses the JSON of frozen branches.
+
+    The output is byte-identical to json.dumps(value) with default options.
+    Fragments are cached by the identity of the frozen branch, so the encoder
+    must live as long as the base schema it serves (see app.components).
+    """
+
+    def __init__(self):
+        self._fragments = {}
+
+    def dumps(self, value: Any) -> str:
+        """Serialize value as json.dumps(value) would."""
+        parts = []
+        self._encode(value, parts)
+        return "".join(parts)
+
+    def fragment(self, value: Any) -> str:
+        """Cached JSON for a frozen branch."""
+        entry = self._fragments.get(id(value))
+        if entry is None or entry[0] is not value:
+            entry = (value, json.dumps(value))
+            self._fragments[id(value)] = entry
+        return entry[1]
+
+    def _encode(self, value, parts) -> None:
+        if isinstance(value, (FrozenDict, FrozenList)):
+            parts.append(self.fragment(value))
+        elif isinstance(value, OverlayDict) and all(isinstance(key, str) for key in value):
+            separator = "{"
+            for key, item in dict.items(value):
+                parts.append(separator)
+                parts.append(encode_basestring_ascii(key))
+                parts.append(": ")
+                self._encode(item, parts)
+                separator = ", "
+            parts.append("}" if separator == ", " else "{}")
+        else:
+            parts.append(json.dumps(value))
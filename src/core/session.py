@@ -7,21 +7,29 @@ import time
 from app.config import Config
 from constants import SECONDS_MINUTE
 from .model import Model
+from .session_cache import get_session_cache
+from .session_touch import get_session_touch_buffer
 
 
 class Session:
     """session"""
 
-    def __init__(self, session_id, db_url=Config.DB_SAFE, db_type=Config.DB_SAFE_TYPE):
+    def __init__(
+        self, session_id, db_url=Config.DB_SAFE, db_type=Config.DB_SAFE_TYPE, unit_of_work=None
+    ):
         """session"""
-        self.model = Model(db_url, db_type)
+        self.model = Model(db_url, db_type, unit_of_work)
+        self.cache = get_session_cache(db_url)
+        self.touches = get_session_touch_buffer(db_url, db_type)
         self._session_id = session_id
         self.now = int(time.time())
 
-    def get(self) -> tuple[str | None, dict]:
-        """get session"""
-        if not self._session_id:
-            return None, {}
+    def _get_row(self) -> tuple | None:
+        """Return the open session row, from the session cache when possible."""
+        self.cache.sync(self.model)
+        row = self.cache.get(self._session_id, self.now)
+        if row is not None:
+            return row
 
         result = self.model.exec('session', 'get', {
             "sessionId": self._session_id,
@@ -30,14 +38,39 @@ class Session:
         })
 
         if not result or not result.get('rows') or not result['rows'][0]:
+            return None
+
+        row = tuple(result['rows'][0])
+        self.cache.put(self._session_id, row)
+        return row
+
+    def _invalidate(self, session_id) -> None:
+        """Drop the session from this worker's cache and tell the other workers."""
+        self.cache.invalidate(session_id)
+        if not self.cache.enabled:
+            return
+
+        self.model.exec('session', 'log-change', {
+            "sessionId": session_id,
+            "changed": self.now
+        })
+        self.model.clear_error()
+
+    def get(self) -> tuple[str | None, dict]:
+        """get session"""
+        if not self._session_id:
+            return None, {}
+
+        row = self._get_row()
+        if not row:
             return None, {}
 
-        modified = result['rows'][0][4]
-        expire = result['rows'][0][5]
+        modified = row[4]
+        expire = row[5]
 
         # Update session if modified more than 15 minutes ago
         if (self.now - modified) > (SECONDS_MINUTE * 15):
-            session_cookie = self.update(self._session_id)
+            session_cookie = self.touch(row)
             return self._session_id, session_cookie
 
         return self._session_id, self.create_session_cookie(self._session_id, max(0, expire - self.now))
@@ -47,16 +80,11 @@ class Session:
         if not self._session_id:
             return {}
 
-        result = self.model.exec('session', 'get', {
-            "sessionId": self._session_id,
-            "open": Config.SESSION_OPEN['true'],
-            "now": self.now
-        })
-
-        if not result or not result.get('rows') or not result['rows'][0]:
+        row = self._get_row()
+        if not row:
             return {}
 
-        raw = result['rows'][0][3]
+        raw = row[3]
         if not raw:
             return {}
 
@@ -84,6 +112,8 @@ class Session:
                     "now": self.now
                 })
 
+            self._invalidate(self._session_id)
+
         return self.delete_session_cookie()
 
     def create(self, user_id, ua, session_data) -> dict:
@@ -107,9 +137,26 @@ class Session:
 
         return self.create_session_cookie(session_token, Config.SESSION_IDLE_EXPIRES_SECONDS)
 
+    def touch(self, row) -> dict:
+        """Slide the idle expiration of the current session without waiting for the write.
+
+        The UPDATE is queued in the write-behind buffer and the cached row is
+        refreshed, so this worker does not touch the session again until the
+        next 15 minute window.
+        """
+        if not self.touches.enabled:
+            return self.update(self._session_id)
+
+        expire = self.now + Config.SESSION_IDLE_EXPIRES_SECONDS
+        self.touches.touch(self._session_id, self.now, expire)
+        self.cache.put(self._session_id, (*row[:4], self.now, expire, *row[6:]))
+
+        return self.create_session_cookie(self._session_id, Config.SESSION_IDLE_EXPIRES_SECONDS)
+
     def update(self, session_token) -> dict:
         """update session"""
         expire = self.now + Config.SESSION_IDLE_EXPIRES_SECONDS
+        self.touches.discard(session_token)
 
         self.model.exec('session', 'update', {
             "sessionId": session_token,
@@ -118,8 +165,11 @@ class Session:
         })
 
         if self.model.has_error:
+            self.cache.invalidate(session_token)
             return self.delete_session_cookie()
 
+        self._invalidate(session_token)
+
         return self.create_session_cookie(session_token, Config.SESSION_IDLE_EXPIRES_SECONDS)
 
     def create_session_cookie(self, session_token, max_age_seconds) -> dict:
@@ -0,0 +1,128 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+In-process LRU cache of open session rows.
+
+Most requests come from returning signed-in users, and each of them used to
+read its row from the session table. The cache keeps the row (userId,
+properties, modified, expire) for SESSION_CACHE_TTL seconds.
+
+Invalidation:
+- close() and update() drop the local entry immediately.
+- Both also append the session id to the session_change table. Each worker
+  polls that table at most every SESSION_CACHE_POLL_SECONDS and drops the
+  listed ids, so a sign-out on one worker or node reaches all the others.
+- If the poll fails the whole cache is cleared.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.config import Config
+
+
+class SessionCache:
+    """LRU + TTL cache of session rows for one database."""
+
+    def __init__(self, max_entries: int, ttl: int, poll_seconds: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.poll_seconds = poll_seconds
+        self._entries: "OrderedDict[str, Tuple[float, tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_poll = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """True when both TTL and size allow caching."""
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, session_id: str, now: int) -> Optional[tuple]:
+        """Return the cached row if it is fresh and the session has not expired."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+
+            cached_at, row = entry
+            if time.monotonic() - cached_at > self.ttl or row[5] <= now:
+                del self._entries[session_id]
+                return None
+
+            self._entries.move_to_end(session_id)
+            return row
+
+    def put(self, session_id: str, row: tuple) -> None:
+        """Cache an open session row."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[session_id] = (time.monotonic(), tuple(row))
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: str) -> None:
+        """Drop one session from the cache."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached session."""
+        with self._lock:
+            self._entries.clear()
+
+    def sync(self, model) -> None:
+        """Apply session changes made by other workers, at most once per poll interval."""
+        if not self.enabled:
+            return
+
+        current = time.monotonic()
+        with self._lock:
+            if current - self._last_poll < self.poll_seconds:
+                return
+            self._last_poll = current
+            # Rows read after this point are fresh; nothing to invalidate.
+            if not self._entries:
+                return
+
+        # Any change older than ttl + poll interval cannot affect a cached entry.
+        since = int(time.time()) - self.ttl - self.poll_seconds
+        result = model.exec('session', 'changes-since', {"since": since})
+
+        if model.has_error or not result:
+            model.clear_error()
+            self.clear()
+            return
+
+        with self._lock:
+            for row in result.get('rows') or []:
+                self._entries.pop(row[0], None)
+
+
+_caches: Dict[str, SessionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_session_cache(db_url: str) -> SessionCache:
+    """Return the process-wide session cache for a database URL."""
+    cache = _caches.get(db_url)
+    if cache is not None:
+        return cache
+
+    with _caches_lock:
+        cache = _caches.get(db_url)
+        if cache is None:
+            cache = SessionCache(
+                Config.SESSION_CACHE_MAX_ENTRIES,
+                Config.SESSION_CACHE_TTL,
+                Config.SESSION_CACHE_POLL_SECONDS,
+            )
+            _caches[db_url] = cache
+
+    return cache
@@ -0,0 +1,186 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Write-behind buffer for session touch updates.
+
+Every session used more than 15 minutes after its last touch gets its modified
+and expire columns moved forward. Doing that UPDATE inside the request made the
+request wait for a write whose only purpose is to slide the idle expiration.
+
+The buffer keeps the newest (modified, expire) per session id, so several
+touches of the same session in one window become a single row, and a
+background thread writes them with one executemany() every
+SESSION_TOUCH_FLUSH_SECONDS, or earlier once SESSION_TOUCH_BATCH_SIZE sessions
+are pending. A failed batch is kept and retried on the next flush. Pending
+touches are flushed at interpreter exit.
+
+SESSION_TOUCH_FLUSH_SECONDS=0 disables the buffer: touches are written inside
+the request as before. In-memory SQLite databases always write synchronously
+because each thread sees its own database.
+"""
+
+import atexit
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.engine import make_url
+
+from app.config import Config
+from .model import Model
+
+
+class SessionTouchBuffer:
+    """Coalesced, periodically flushed session touches for one database."""
+
+    def __init__(self, db_url: str, db_type: str, flush_seconds: float, batch_size: int):
+        self.db_url = db_url
+        self.db_type = db_type
+        self.flush_seconds = flush_seconds
+        self.batch_size = max(1, batch_size)
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def enabled(self) -> bool:
+        """True when touches are written behind the request."""
+        return self.flush_seconds > 0
+
+    def pending(self) -> int:
+        """Number of sessions waiting to be written."""
+        with self._lock:
+            return len(self._pending)
+
+    def touch(self, session_id: str, modified: int, expire: int) -> None:
+        """Queue a touch; a later touch of the same session replaces it."""
+        with self._lock:
+            self._merge(session_id, modified, expire)
+            full = len(self._pending) >= self.batch_size
+            self._start()
+
+        if full:
+            self._wakeup.set()
+
+    def discard(self, session_id: str) -> None:
+        """Forget a pending touch, e.g. because the session was written directly."""
+        with self._lock:
+            self._pending.pop(session_id, None)
+
+    def flush(self) -> int:
+        """Write every pending touch now and return the number of rows sent."""
+        with self._lock:
+            batch = self._pending
+            self._pending = {}
+
+        if not batch:
+            return 0
+
+        try:
+            model = Model(self.db_url, self.db_type)
+            model.exec_many('session', 'update', [
+                {"sessionId": session_id, "modified": modified, "expire": expire}
+                for session_id, (modified, expire) in batch.items()
+            ])
+            failed = model.has_error
+        except Exception:
+            self._requeue(batch)
+            raise
+
+        if failed:
+            self._requeue(batch)
+            return 0
+
+        return len(batch)
+
+    def stop(self) -> None:
+        """Stop the flusher thread and write what is left."""
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(1.0, self.flush_seconds))
+        self.flush()
+
+    def reset_after_fork(self) -> None:
+        """Drop the parent's thread and pending touches in a forked child."""
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pending = {}
+        self._stopping = False
+
+    def _requeue(self, batch: Dict[str, Tuple[int, int]]) -> None:
+        """Put a batch that was not written back, keeping newer touches."""
+        with self._lock:
+            for session_id, (modified, expire) in batch.items():
+                self._merge(session_id, modified, expire)
+
+    def _merge(self, session_id: str, modified: int, expire: int) -> None:
+        current = self._pending.get(session_id)
+        if current is None or current[0] <= modified:
+            self._pending[session_id] = (modified, expire)
+
+    def _start(self) -> None:
+        if self._thread is not None or self._stopping:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="session-touch-flush", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Keep the flusher alive; the rows are retried on the next pass.
+                continue
+
+
+_buffers: Dict[str, SessionTouchBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_session_touch_buffer(db_url: str, db_type: str) -> SessionTouchBuffer:
+    """Return the process-wide touch buffer for a database URL."""
+    buffer = _buffers.get(db_url)
+    if buffer is not None:
+        return buffer
+
+    with _buffers_lock:
+        buffer = _buffers.get(db_url)
+        if buffer is None:
+            url = make_url(db_url)
+            in_memory = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+            buffer = SessionTouchBuffer(
+                db_url,
+                db_type,
+                0 if in_memory else Config.SESSION_TOUCH_FLUSH_SECONDS,
+                Config.SESSION_TOUCH_BATCH_SIZE,
+            )
+            _buffers[db_url] = buffer
+
+    return buffer
+
+
+def flush_session_touches() -> None:
+    """Flush every buffer and stop the flusher threads."""
+    for buffer in list(_buffers.values()):
+        buffer.stop()
+
+
+def _reset_after_fork() -> None:
+    global _buffers_lock  # pylint: disable=global-statement
+    _buffers_lock = threading.Lock()
+    for buffer in _buffers.values():
+        buffer.reset_after_fork()
+
+
+atexit.register(flush_session_touches)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,210 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+In-memory index of static assets (public/ and each component's static/).
+
+Built once per worker at startup. For every file it keeps the size, mtime,
+mimetype and a content hash used as a strong ETag. Files up to
+STATIC_INDEX_MAX_FILE_BYTES are held in memory, together with gzip (and
+brotli, when the package is installed) bodies for compressible types, while
+the total stays under STATIC_INDEX_MAX_BYTES; larger files are sent from disk
+with the precomputed ETag.
+
+If-None-Match is answered with 304 from the index, without touching the
+file system. Each encoding has its own ETag ("<hash>-gz", "<hash>-br"), the
+same suffixes the response compressor adds when it encodes an indexed file
+that has no precomputed variant.
+
+The index is not refreshed: files changed on disk are picked up on restart,
+and it is disabled in debug mode. Paths not in the index (added after
+startup) are served from disk as before.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Optional, Tuple
+
+from flask import Response, current_app, request, send_file, send_from_directory
+from werkzeug.http import http_date
+from werkzeug.utils import get_content_type
+
+from app.config import Config
+
+from .compression import ETAG_SUFFIXES, is_compressible
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller bodies are not worth a compressed variant.
+COMPRESS_MIN_BYTES = 512
+
+# Preferred first when the client accepts several.
+_ENCODINGS = tuple((name, ETAG_SUFFIXES[name]) for name in ("br", "gzip"))
+
+
+class StaticAsset:  # pylint: disable=too-few-public-methods
+    """Metadata of a static file and, when held in memory, its bodies."""
+
+    __slots__ = ("path", "size", "mtime", "etag", "mimetype", "body", "variants")
+
+    def __init__(self, path, size, mtime, etag, mimetype, body=None, variants=None):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.etag = etag
+        self.mimetype = mimetype
+        self.body = body
+        self.variants = variants or {}
+
+
+def _compress(body: bytes) -> Dict[str, bytes]:
+    """Encoded bodies that are smaller than the original."""
+    variants = {}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body)
+    variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+    return {name: data for name, data in variants.items() if len(data) < len(body)}
+
+
+class StaticIndex:
+    """Static files by (directory, relative path), built at startup."""
+
+    def __init__(self, max_bytes: int, max_file_bytes: int = 1048576):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.bytes = 0
+        self._assets: Dict[Tuple[str, str], StaticAsset] = {}
+        self._roots: Dict[str, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """True when the index may hold assets."""
+        return self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def _root(self, directory: str) -> str:
+        root = self._roots.get(directory)
+        if root is None:
+            root = self._roots[directory] = os.path.realpath(directory)
+        return root
+
+    def add_directory(self, directory: str) -> None:
+        """Index every file below directory."""
+        root = self._root(directory)
+        if not os.path.isdir(root):
+            return
+        for dirpath, _dirs, files in os.walk(root):
+            for name in files:
+                path = os.path.join(dirpath, name)
+                route = os.path.relpath(path, root).replace(os.sep, "/")
+                asset = self._load(path)
+                if asset is not None:
+                    self._assets[(root, route)] = asset
+
+    def _load(self, path: str) -> Optional[StaticAsset]:
+        try:
+            stat = os.stat(path)
+            with open(path, "rb") as file:
+                digest = hashlib.sha256()
+                body = b""
+                if stat.st_size <= self.max_file_bytes:
+                    body = file.read()
+                    digest.update(body)
+                else:
+                    for block in iter(lambda: file.read(65536), b""):
+                        digest.update(block)
+        except OSError:
+            return None
+
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        asset = StaticAsset(
+            path, stat.st_size, int(stat.st_mtime), digest.hexdigest()[:32], mimetype
+        )
+        if stat.st_size > self.max_file_bytes or self.bytes + stat.st_size > self.max_bytes:
+            return asset
+
+        variants = {}
+        if stat.st_size >= COMPRESS_MIN_BYTES and is_compressible(mimetype):
+            variants = _compress(body)
+        size = stat.st_size + sum(len(data) for data in variants.values())
+        if self.bytes + size > self.max_bytes:
+            variants, size = {}, stat.st_size
+        asset.body = body
+        asset.variants = variants
+        self.bytes += size
+        return asset
+
+    def get(self, directory: str, route: str) -> Optional[StaticAsset]:
+        """Asset for route below directory, or None if not indexed."""
+        return self._assets.get((self._root(directory), route))
+
+    @staticmethod
+    def respond(asset: StaticAsset) -> Response:
+        """200 with the best accepted encoding, or 304 if the client has it."""
+        if asset.body is None:
+            response = send_file(
+                asset.path,
+                mimetype=asset.mimetype,
+                etag=asset.etag,
+                last_modified=asset.mtime,
+                conditional=True,
+            )
+            response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+            return response
+
+        body, etag, encoding = asset.body, asset.etag, None
+        if asset.variants:
+            accepted = request.accept_encodings
+            for name, suffix in _ENCODINGS:
+                if name in asset.variants and accepted[name]:
+                    body, etag, encoding = asset.variants[name], f"{asset.etag}-{suffix}", name
+                    break
+
+        headers = {
+            "ETag": f'"{etag}"',
+            "Last-Modified": http_date(asset.mtime),
+            "Cache-Control": Config.STATIC_CACHE_CONTROL,
+        }
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304, headers=headers)
+
+        # Without variants the response compressor may have encoded the body.
+        if not asset.variants and is_compressible(asset.mimetype):
+            for _name, suffix in _ENCODINGS:
+                encoded = f"{asset.etag}-{suffix}"
+                if request.if_none_match.contains_weak(encoded):
+                    headers["ETag"] = f'"{encoded}"'
+                    headers["Vary"] = "Accept-Encoding"
+                    return Response(status=304, headers=headers)
+
+        headers["Content-Type"] = get_content_type(asset.mimetype, "utf-8")
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(body, headers=headers)
+
+
+def serve_static(directory: str, route: str) -> Optional[Response]:
+    """
+    Response for the file route below directory, or None if there is no
+    such file. Indexed assets are answered from memory.
+    """
+    index = current_app.static_index
+    if index.enabled:
+        asset = index.get(directory, route)
+        if asset is not None:
+            return index.respond(asset)
+
+    file_path = os.path.join(directory, route)
+    if os.path.exists(file_path) and not os.path.isdir(file_path):
+        response = send_from_directory(directory, route)
+        response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
+        return response
+    return None
@@ -2,17 +2,25 @@
 
 """template and response"""
 
-import json
 import re
+from typing import Iterator
 
-from flask import Response, current_app, make_response
+from flask import Response, current_app, g, make_response
 
 from app.config import Config
 
+from .html_minify import HtmlMinifier, minify_html
+from .page_cache import store_page
+from .unit_of_work import end_unit_of_work
+
 if Config.NEUTRAL_IPC:
     from neutral_ipc_template import NeutralIpcTemplate as NeutralTemplate
+    from neutral_ipc_template import neutral_ipc_config as ipc_config
 else:
     from neutraltemplate import NeutralTemplate
+    ipc_config = None  # pylint: disable=invalid-name
+
+_LEADING_SPACE = re.compile(r"[\n\r\t ]*")
 
 
 class Template:
@@ -34,18 +42,11 @@ class Template:
         """render template and return response"""
         tpl = tpl or self.data['TEMPLATE_LAYOUT']
 
-        template = NeutralTemplate(tpl, json.dumps(self.schema.properties))
+        # Commit before rendering, so no write lock is held during the render.
+        end_unit_of_work(commit=True)
+        template = NeutralTemplate(tpl, self._render_schema())
         self.contents = template.render()
 
-        self.contents = self.contents.lstrip('\n\r\t ')
-        if Config.TEMPLATE_HTML_MINIFY:
-            self.contents = re.sub(
-                r"^\s+<(?!pre\b|code\b|samp\b|kbd\b|var\b|textarea\b|xmp\b|script\b|style\b|template\b)([^>]+>)",
-                r"<\1",
-                self.contents,
-                flags=re.MULTILINE
-            )
-
         status_code = int(template.get_status_code())
         status_text = template.get_status_text()
         status_param = template.get_status_param()
@@ -68,7 +69,20 @@ class Template:
                 self.response.headers[key] = value
 
         self.response.status_code = status_code
+
+        # Pages going to the page cache are stored whole.
+        if Config.TEMPLATE_STREAM and "page_cache" not in g:
+            self.response.response = self._stream(self.contents)
+            self.response.headers.pop("Content-Length", None)
+            self._set_cookies()
+            return self.response
+
+        self.contents = self.contents.lstrip('\n\r\t ')
+        if Config.TEMPLATE_HTML_MINIFY:
+            self.contents = minify_html(self.contents)
+
         self.response.set_data(self.contents)
+        store_page(status_code, self.contents, self.data, self.response, self._cookies)
         self._set_cookies()
         return self.response
 
@@ -83,26 +97,58 @@ class Template:
             "param": status_param,
         }
 
-        template = NeutralTemplate(
-            self.data['TEMPLATE_ERROR'], json.dumps(self.schema.properties)
-        )
+        end_unit_of_work(commit=True)
+        template = NeutralTemplate(self.data['TEMPLATE_ERROR'], self._render_schema())
         self.contents = template.render()
 
         self.contents = self.contents.lstrip('\n\r\t ')
         if Config.TEMPLATE_HTML_MINIFY:
-            self.contents = re.sub(
-                r"^\s+<(?!pre\b|code\b|samp\b|kbd\b|var\b|textarea\b|xmp\b|script\b|style\b|template\b)([^>]+>)",
-                r"<\1",
-                self.contents,
-                flags=re.MULTILINE
-            )
+            self.contents = minify_html(self.contents)
 
         self.response.status_code = status_code
         self.response.set_data(self.contents)
+        store_page(status_code, self.contents, self.data, self.response, self._cookies)
         self._set_cookies()
 
         return self.response
 
+    @staticmethod
+    def _stream(contents: str) -> Iterator[str]:
+        """
+        Yield the rendered page: up to the end of </head> first, so the
+        browser can start fetching CSS/JS, then TEMPLATE_STREAM_CHUNK_SIZE
+        pieces. Minified chunk by chunk, without copies of the whole page.
+        """
+        minifier = HtmlMinifier() if Config.TEMPLATE_HTML_MINIFY else None
+        chunk_size = max(1, Config.TEMPLATE_STREAM_CHUNK_SIZE)
+
+        pos = _LEADING_SPACE.match(contents).end()
+        head_end = contents.find("</head>", pos)
+        end = head_end + len("</head>") if head_end != -1 else pos + chunk_size
+
+        while pos < len(contents):
+            chunk = contents[pos:end]
+            if minifier is not None:
+                chunk = minifier.feed(chunk)
+            if chunk:
+                yield chunk
+            pos, end = end, end + chunk_size
+
+        if minifier is not None:
+            chunk = minifier.close()
+            if chunk:
+                yield chunk
+
+    def _render_schema(self):
+        """
+        schema for NeutralTemplate: the object itself when the IPC client sends
+        it in binary ("schema_format": "binary"), otherwise JSON reusing the
+        serialized static parts
+        """
+        if ipc_config is not None and ipc_config.SCHEMA_FORMAT == "binary":
+            return self.schema.properties
+        return current_app.components.schema_json.dumps(self.schema.properties)
+
     def _set_cookies(self) -> None:
         """set cookies"""
         if self._cookies is not None:
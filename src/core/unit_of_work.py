@@ -0,0 +1,151 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Request-scoped database unit of work.
+
+Without it every Model.exec call opens its own engine.begin() transaction, so a
+signed-in page view runs three or four separate transactions, two of them the
+same session SELECT. A UnitOfWork memoizes identical read statements and keeps
+the writes of the request in one transaction per engine, committed once:
+by Template.render() before the page is rendered, so no write lock is held
+during the render, or in after_request for responses without a template.
+
+Until the request writes to an engine, each read borrows a pooled connection
+and returns it right away, so read-only requests never hold one while the view
+renders. The first write opens the request connection and its transaction;
+later reads on that engine use it, so they see the pending writes.
+
+Reads and writes on the request connection run inside a SAVEPOINT so a failing
+operation is rolled back on its own, as it was when each call had its own
+transaction, without losing the earlier writes of the request. Every write
+drops the memoized reads because they may be stale.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+from flask import g, has_request_context
+from sqlalchemy.engine import Connection, Engine, RootTransaction
+
+G_KEY = "unit_of_work"
+
+
+class UnitOfWork:
+    """Memoized reads, one write transaction per engine and a single final commit."""
+
+    def __init__(self):
+        self._connections: Dict[Engine, Tuple[Connection, RootTransaction]] = {}
+        self._reads: Dict[Hashable, dict] = {}
+
+    def connection(self, engine: Engine) -> Connection:
+        """Return the write connection for engine, beginning its transaction on first use."""
+        entry = self._connections.get(engine)
+        if entry is None:
+            conn = engine.connect()
+            entry = (conn, conn.begin())
+            self._connections[engine] = entry
+        return entry[0]
+
+    @contextmanager
+    def read(self, engine: Engine) -> Iterator[Connection]:
+        """
+        Run a read on a connection released right after it, or inside a
+        SAVEPOINT on the request connection once engine has pending writes.
+        """
+        entry = self._connections.get(engine)
+        if entry is None:
+            with engine.connect() as conn:
+                yield conn
+            return
+        with self._nested(entry[0]) as conn:
+            yield conn
+
+    @contextmanager
+    def savepoint(self, engine: Engine) -> Iterator[Connection]:
+        """Run a write inside a SAVEPOINT on the request connection."""
+        conn = self.connection(engine)
+        self._reads.clear()
+        with self._nested(conn):
+            yield conn
+
+    @staticmethod
+    @contextmanager
+    def _nested(conn: Connection) -> Iterator[Connection]:
+        nested = conn.begin_nested()
+        try:
+            yield conn
+        except Exception:
+            if nested.is_active:
+                nested.rollback()
+            raise
+        nested.commit()
+
+    @staticmethod
+    def read_key(engine: Engine, sql: str, params: Optional[dict]) -> Optional[Hashable]:
+        """Build the memo key for a read, or None if params are not hashable."""
+        try:
+            key = (id(engine), sql, tuple(sorted((params or {}).items())))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get_read(self, key: Optional[Hashable]) -> Optional[dict]:
+        """Return a copy of a memoized read result."""
+        if key is None:
+            return None
+        cached = self._reads.get(key)
+        if cached is None:
+            return None
+        return {**cached, 'rows': list(cached['rows'])}
+
+    def store_read(self, key: Optional[Hashable], result: Any) -> None:
+        """Memoize a successful read result."""
+        if key is not None and isinstance(result, dict) and result.get('success'):
+            self._reads[key] = {**result, 'rows': list(result['rows'])}
+
+    def commit(self) -> None:
+        """Commit every open transaction and release the connections."""
+        self._finish(commit=True)
+
+    def rollback(self) -> None:
+        """Roll back every open transaction and release the connections."""
+        self._finish(commit=False)
+
+    def _finish(self, commit: bool) -> None:
+        self._reads.clear()
+        entries = list(self._connections.values())
+        self._connections.clear()
+        for entry in entries:
+            self._end(entry, commit)
+
+    @staticmethod
+    def _end(entry: Tuple[Connection, RootTransaction], commit: bool) -> None:
+        conn, transaction = entry
+        try:
+            if transaction.is_active:
+                if commit:
+                    transaction.commit()
+                else:
+                    transaction.rollback()
+        finally:
+            conn.close()
+
+
+def get_unit_of_work() -> Optional[UnitOfWork]:
+    """Return the unit of work of the current request, creating it on first use."""
+    if not has_request_context():
+        return None
+    if G_KEY not in g:
+        setattr(g, G_KEY, UnitOfWork())
+    return getattr(g, G_KEY)
+
+
+def end_unit_of_work(commit: bool = True) -> None:
+    """Commit (or roll back) and detach the unit of work of the current request."""
+    unit_of_work = g.pop(G_KEY, None)
+    if unit_of_work is None:
+        return
+    if commit:
+        unit_of_work.commit()
+    else:
+        unit_of_work.rollback()
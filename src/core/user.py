@@ -2,15 +2,16 @@
 
 """Module for handling user operations"""
 
+import json
 import random
 from datetime import datetime, timezone
 import time
-# import json
 import bcrypt
 from constants import USER_EXISTS, UNCONFIRMED, UNVALIDATED, PIN_TARGET_REMINDER
-from utils.sbase64url import sbase64url_sha256, sbase64url_token
+from utils.sbase64url import sbase64url_decode, sbase64url_encode, sbase64url_sha256, sbase64url_token
 from app.config import Config
 from .model import Model
+from .role_cache import get_role_cache
 # import pprint
 
 
@@ -24,11 +25,12 @@ class User:
     )
     _RBAC_BOOTSTRAPPED = set()
 
-    def __init__(self, db_url=Config.DB_PWA, db_type=Config.DB_PWA_TYPE):
+    def __init__(self, db_url=Config.DB_PWA, db_type=Config.DB_PWA_TYPE, unit_of_work=None):
         """Initialize the User class with a database connection."""
         self._db_url = db_url
         self._db_type = db_type
-        self.model = Model(db_url, db_type)
+        self.model = Model(db_url, db_type, unit_of_work)
+        self.role_cache = get_role_cache(db_url)
         self.now = int(time.time())
         self._setup_rbac()
 
@@ -299,13 +301,42 @@ class User:
         }
 
     def get_roles(self, user_id) -> list[str]:
-        """Get all role codes assigned to a user."""
+        """Get all role codes assigned to a user.
+
+        Served from the role cache while the user's role version is unchanged.
+        """
         if not user_id:
             return []
+        user_id = str(user_id)
+
+        version = self._get_role_version(user_id) if self.role_cache.enabled else None
+        if version is not None:
+            roles = self.role_cache.get(user_id, version)
+            if roles is not None:
+                return list(roles)
+
         result = self.model.exec("user", "get-roles-by-userid", {"userId": user_id})
-        if not result or not result.get("rows"):
+        if self.model.has_error:
             return []
-        return sorted({str(row[0]) for row in result["rows"] if row and row[0]})
+        roles = sorted({str(row[0]) for row in (result or {}).get("rows") or [] if row and row[0]})
+        if version is not None:
+            self.role_cache.put(user_id, version, roles)
+        return roles
+
+    def _get_role_version(self, user_id: str) -> int | None:
+        """Current role version of a user (0 if never changed), None on error."""
+        result = self.model.exec("user", "get-role-version", {"userId": user_id})
+        if self.model.has_error or not result:
+            self.model.clear_error()
+            return None
+        rows = result.get("rows") or []
+        return int(rows[0][0]) if rows and rows[0] else 0
+
+    def _bump_role_version(self, user_id) -> None:
+        """Mark the cached roles of a user as stale in every worker."""
+        self.role_cache.invalidate(str(user_id))
+        self.model.exec("user", "bump-role-version", {"userId": str(user_id)})
+        self.model.clear_error()
 
     def has_role(self, user_id, role_code: str) -> bool:
         """Check if a user has a role."""
@@ -330,6 +361,7 @@ class User:
         if self.model.has_error:
             return False
         if result and result.get("rowcount", 0) > 0:
+            self._bump_role_version(user_id)
             return True
         return self.has_role(user_id, code)
 
@@ -346,6 +378,7 @@ class User:
         if self.model.has_error:
             return False
         if result and result.get("rowcount", 0) > 0:
+            self._bump_role_version(user_id)
             return True
         return not self.has_role(user_id, code)
 
@@ -375,6 +408,35 @@ class User:
         except (TypeError, ValueError, OSError):
             return ""
 
+    ADMIN_LIST_ORDERS = {
+        "created": ("admin-list-by-created", "created"),
+        "modified": ("admin-list-by-modified", "modified"),
+        "role_date": ("admin-list-by-role-date", "role_lasttime"),
+        "disabled_created_date": ("admin-list-by-disabled-created-date", "disabled_created_lasttime"),
+        "disabled_modified_date": ("admin-list-by-disabled-modified-date", "disabled_modified_lasttime"),
+        # Backward compatibility with previous single disabled ordering key
+        "disabled_date": ("admin-list-by-disabled-modified-date", "disabled_modified_lasttime"),
+    }
+
+    @staticmethod
+    def encode_list_cursor(operation: str, direction: str, sort_key, user_id) -> str:
+        """Opaque cursor for a (sort key, userId) position in an admin listing."""
+        return sbase64url_encode(json.dumps([operation, direction, int(sort_key or 0), str(user_id)]))
+
+    @staticmethod
+    def decode_list_cursor(cursor: str, operation: str) -> tuple[str, int, str] | None:
+        """Return (direction, sort key, userId), or None if the cursor is not for this listing."""
+        if not cursor:
+            return None
+        try:
+            cursor_operation, direction, sort_key, user_id = json.loads(sbase64url_decode(cursor))
+            sort_key = int(sort_key)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            return None
+        if cursor_operation != operation or direction not in ("next", "prev"):
+            return None
+        return direction, sort_key, str(user_id)
+
     def admin_list_users(
         self,
         order_by="created",
@@ -382,19 +444,38 @@ class User:
         role_code="",
         disabled_reason="",
         limit=100,
-        offset=0,
+        cursor="",
     ) -> list[dict]:
         """List users for admin views with roles and disabled flags."""
-        operation_map = {
-            "created": "admin-list-by-created",
-            "modified": "admin-list-by-modified",
-            "role_date": "admin-list-by-role-date",
-            "disabled_created_date": "admin-list-by-disabled-created-date",
-            "disabled_modified_date": "admin-list-by-disabled-modified-date",
-            # Backward compatibility with previous single disabled ordering key
-            "disabled_date": "admin-list-by-disabled-modified-date",
-        }
-        operation = operation_map.get(order_by, "admin-list-by-created")
+        return self.admin_list_users_page(
+            order_by, search, role_code, disabled_reason, limit, cursor
+        )["users"]
+
+    def admin_list_users_page(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+        self,
+        order_by="created",
+        search="",
+        role_code="",
+        disabled_reason="",
+        limit=100,
+        cursor="",
+    ) -> dict:
+        """One page of the admin user listing with next/previous cursors.
+
+        Pages are addressed by (sort key, userId) keyset cursors instead of
+        OFFSET, so every page costs the same as the first one. Roles and
+        disabled reasons for the whole page are read with two IN-list
+        queries, not two queries per user.
+
+        Returns:
+            {"users": [...], "next_cursor": str, "prev_cursor": str}; an empty
+            cursor means there is no page in that direction.
+        """
+        page = {"users": [], "next_cursor": "", "prev_cursor": ""}
+        operation, key_column = self.ADMIN_LIST_ORDERS.get(order_by, self.ADMIN_LIST_ORDERS["created"])
+        position = self.decode_list_cursor(cursor, operation)
+        backward = position is not None and position[0] == "prev"
+        limit = max(1, int(limit))
 
         normalized_disabled_reason = ""
         if str(disabled_reason).strip():
@@ -403,19 +484,20 @@ class User:
             except (TypeError, ValueError):
                 normalized_disabled_reason = ""
 
-        result = self.model.exec(
-            "user",
-            operation,
-            {
-                "search": (search or "").strip(),
-                "role_code": self._normalize_role_code(role_code),
-                "disabled_reason": normalized_disabled_reason,
-                "limit": int(limit),
-                "offset": int(offset),
-            },
-        )
+        params = {
+            "search": (search or "").strip(),
+            "role_code": self._normalize_role_code(role_code),
+            "disabled_reason": normalized_disabled_reason,
+            "limit": limit + 1,
+        }
+        # The first page has its own statement, so the cursor predicate can use the index.
+        query_key = operation
+        if position is not None:
+            query_key = f"{operation}-{'before' if backward else 'after'}"
+            params.update(cursor_key=position[1], cursor_id=position[2])
+        result = self.model.exec("user", query_key, params)
         if self.model.has_error:
-            return []
+            return page
 
         users = self._rows_to_dicts(result)
         for user_row in users:
@@ -425,19 +507,65 @@ class User:
             user_row["created_human"] = self._format_unix_timestamp(user_row.get("created"))
             user_row["modified_human"] = self._format_unix_timestamp(user_row.get("modified"))
             user_row["lasttime_human"] = self._format_unix_timestamp(user_row.get("lasttime"))
-            user_id = user_row.get("userId")
-            user_row["roles"] = self.get_roles(user_id)
-            disabled_result = self.model.exec("user", "admin-get-disabled-by-userid", {"userId": user_id})
-            if self.model.has_error:
-                user_row["disabled"] = []
-                self.model.clear_error()
-                continue
-            user_row["disabled"] = self._rows_to_dicts(disabled_result)
-            for disabled_row in user_row["disabled"]:
-                disabled_row["created_human"] = self._format_unix_timestamp(disabled_row.get("created"))
-                disabled_row["modified_human"] = self._format_unix_timestamp(disabled_row.get("modified"))
+            user_row["roles"] = []
+            user_row["disabled"] = []
+
+        # One extra row tells whether there is more in the direction of travel.
+        has_more = len(users) > limit
+        users = users[:limit]
+        if backward:
+            users.reverse()
+
+        self._attach_roles_and_disabled(users)
+        page["users"] = users
+        if not users:
+            return page
+
+        first, last = users[0], users[-1]
+        more_after = has_more if not backward else True
+        more_before = has_more if backward else position is not None
+        if more_after:
+            page["next_cursor"] = self.encode_list_cursor(
+                operation, "next", last.get(key_column), last.get("userId")
+            )
+        if more_before:
+            page["prev_cursor"] = self.encode_list_cursor(
+                operation, "prev", first.get(key_column), first.get("userId")
+            )
+        return page
+
+    def _attach_roles_and_disabled(self, users: list[dict]) -> None:
+        """Fill roles and disabled reasons of a page of users with one query each."""
+        by_id = {str(user_row.get("userId")): user_row for user_row in users if user_row.get("userId")}
+        if not by_id:
+            return
+        params = {"userIds": list(by_id)}
 
-        return users
+        roles_result = self.model.exec("user", "admin-get-roles-by-userids", params)
+        if self.model.has_error:
+            self.model.clear_error()
+        else:
+            roles_by_id = {}
+            for user_id, code in roles_result.get("rows") or []:
+                if code:
+                    roles_by_id.setdefault(str(user_id), set()).add(str(code))
+            for user_id, codes in roles_by_id.items():
+                by_id[user_id]["roles"] = sorted(codes)
+
+        disabled_result = self.model.exec("user", "admin-get-disabled-by-userids", params)
+        if self.model.has_error:
+            self.model.clear_error()
+            return
+
+        for disabled_row in self._rows_to_dicts(disabled_result):
+            user_row = by_id.get(str(disabled_row.pop("userId")))
+            if user_row is None:
+                continue
+            reason = disabled_row.get("reason")
+            disabled_row["name"] = Config.DISABLED_KEY.get(str(reason), str(reason))
+            disabled_row["created_human"] = self._format_unix_timestamp(disabled_row.get("created"))
+            disabled_row["modified_human"] = self._format_unix_timestamp(disabled_row.get("modified"))
+            user_row["disabled"].append(disabled_row)
 
     def set_user_disabled(self, user_id, reason, description="") -> bool:
         """Add or update a disabled reason for a user."""
@@ -461,6 +589,7 @@ class User:
         result = self.model.exec("user", "admin-delete-user", {"userId": user_id})
         if self.model.has_error:
             return False
+        self._bump_role_version(user_id)
         return bool(result and result.get("success"))
 
     def user_reminder(self, user_data):
@@ -3,3 +3,4 @@ Neutral IPC Template package.
 """
 
 from .neutral_ipc_template import NeutralIpcTemplate
+from .neutral_ipc_async import AsyncNeutralIpcTemplate
@@ -0,0 +1,175 @@
+"""
+asyncio client for the Neutral IPC protocol.
+
+Same record format and configuration as the blocking client, for async views
+and background jobs that want to issue several renders at once:
+
+    tpl = AsyncNeutralIpcTemplate(path, schema)
+    html = await tpl.render()
+
+    pages = await asyncio.gather(*(tpl.render() for tpl in templates))
+
+Connections are pooled per event loop and endpoint (asyncio streams belong
+to the loop that opened them) with the pool_size and max_idle settings of
+/etc/neutral-ipc-cfg.json. Endpoints are chosen, and ejected, by the same
+per-worker balancer as the blocking client.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from collections import deque
+
+from . import neutral_ipc_config as ipc_config
+from .neutral_ipc_balancer import RenderAttempts, get_balancer
+from .neutral_ipc_pool import BaseIpcPool
+from .neutral_ipc_template import (
+    BaseIpcClient,
+    NeutralIpcRecord,
+    NeutralIpcTemplate,
+    decode_content,
+)
+
+
+class AsyncNeutralIpcPool(BaseIpcPool):
+    """Idle stream connections to one Neutral IPC endpoint for one event loop."""
+
+    async def connect(self):
+        """Open a new (reader, writer) pair to the endpoint."""
+        if isinstance(self.address, str):
+            opening = asyncio.open_unix_connection(self.address)
+        else:
+            opening = asyncio.open_connection(*self.address)
+        return await asyncio.wait_for(opening, self.timeout)
+
+    async def acquire(self):
+        """Return ((reader, writer), reused), see NeutralIpcPool.acquire."""
+        now = time.monotonic()
+        while self._idle:
+            conn, last_used = self._idle.pop()
+            reader, writer = conn
+            if now - last_used <= self.max_idle and not reader.at_eof() \
+                    and not writer.is_closing():
+                return conn, True
+            self.discard(conn)
+
+        return await self.connect(), False
+
+    def release(self, conn):
+        """Return a connection after a complete request/response exchange."""
+        if len(self._idle) < self.max_size:
+            self._idle.append((conn, time.monotonic()))
+        else:
+            self.discard(conn)
+
+    @staticmethod
+    def discard(conn):
+        """Close a connection that must not be reused."""
+        conn[1].close()
+
+    def close(self):
+        """Close every idle connection."""
+        idle, self._idle = self._idle, deque()
+        for conn, _ in idle:
+            self.discard(conn)
+
+
+_pools = weakref.WeakKeyDictionary()
+# Reassigned after a fork: module state, not a constant.
+_pools_pid = None  # pylint: disable=invalid-name
+
+
+def get_async_pool(address):
+    """Return the pool of the running event loop for an endpoint address."""
+    global _pools_pid  # pylint: disable=global-statement
+
+    if _pools_pid != os.getpid():
+        _pools.clear()
+        _pools_pid = os.getpid()
+
+    loop = asyncio.get_running_loop()
+    loop_pools = _pools.setdefault(loop, {})
+    pool = loop_pools.get(address)
+    if pool is None:
+        pool = AsyncNeutralIpcPool(
+            address, ipc_config.TIMEOUT, ipc_config.POOL_SIZE, ipc_config.MAX_IDLE
+        )
+        loop_pools[address] = pool
+
+    return pool
+
+
+class AsyncNeutralIpcClient(BaseIpcClient):
+    """asyncio Neutral IPC client."""
+
+    async def start(self):
+        """Send the request record and return the decoded response record."""
+        attempts = RenderAttempts(get_balancer())
+        for endpoint in attempts:
+            try:
+                pool = get_async_pool(endpoint.address)
+                self.result = await self._send(pool, self.encode(endpoint))
+                if self.refused_binary(endpoint):
+                    self.result = await self._send(pool, self.encode(endpoint))
+            except asyncio.TimeoutError:
+                attempts.failed(retry=False)
+                raise
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                if attempts.failed():
+                    continue
+                raise
+            except BaseException:
+                # Cancelled: not the endpoint's fault.
+                attempts.done()
+                raise
+
+            attempts.done()
+            return self.result
+
+    async def _send(self, pool, request):
+        """Exchange one record on a pooled connection of an endpoint."""
+        while True:
+            conn, reused = await pool.acquire()
+            try:
+                result = await asyncio.wait_for(self._exchange(conn, request), pool.timeout)
+            except (OSError, ValueError, asyncio.IncompleteReadError) as error:
+                pool.discard(conn)
+                # A pooled connection may have been closed by the server while idle.
+                if reused and not isinstance(error, asyncio.TimeoutError):
+                    continue
+                raise
+            except BaseException:
+                # Cancelled mid-exchange: the stream is out of sync.
+                pool.discard(conn)
+                raise
+
+            pool.release(conn)
+            return result
+
+    @staticmethod
+    async def _exchange(conn, request):
+        """Send one request record and read its response record."""
+        reader, writer = conn
+        writer.writelines(request)
+        await writer.drain()
+
+        response_header = await reader.readexactly(NeutralIpcRecord.HEADER_LEN)
+        response = NeutralIpcRecord.decode_header(response_header)
+
+        content1 = await reader.readexactly(response['length-1'])
+        content2 = await reader.readexactly(response['length-2'])
+
+        return NeutralIpcRecord.decode_record(
+            response_header,
+            decode_content(response['format-1'], content1),
+            decode_content(response['format-2'], content2),
+        )
+
+
+class AsyncNeutralIpcTemplate(NeutralIpcTemplate):
+    """Neutral IPC Template rendered with `await tpl.render()`."""
+
+    async def render(self):  # pylint: disable=invalid-overridden-method
+        """Render template with schema."""
+        return self._set_result(await AsyncNeutralIpcClient(*self._request()).start())
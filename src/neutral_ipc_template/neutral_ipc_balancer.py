@@ -0,0 +1,239 @@
+"""
+Load balancing across several Neutral IPC render servers.
+
+Each endpoint of the "endpoints" setting gets its own NeutralIpcPool. A
+render takes an endpoint with acquire() and gives it back with release():
+
+    least_outstanding   fewest renders in flight from this worker, ties
+                        rotate so idle endpoints share the load.
+    latency             in-flight renders weighted by the endpoint's
+                        smoothed latency (EWMA), so a slower server gets
+                        proportionally less work.
+
+Health checks are passive: max_failures consecutive transport errors eject
+an endpoint for cooldown seconds and close its idle connections. When the
+cooldown ends the next render probes it again; one more failure ejects it
+again, a success puts it back. If every endpoint is ejected the one whose
+cooldown ends first is still tried rather than failing the render outright.
+
+Counters and latencies are per worker process, see stats().
+"""
+
+import os
+import threading
+import time
+
+from . import neutral_ipc_config as ipc_config
+from .neutral_ipc_pool import NeutralIpcPool
+
+
+class IpcEndpoint:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """One render server and its counters."""
+
+    __slots__ = (
+        'address', 'pool', 'outstanding', 'requests', 'failures',
+        'consecutive_failures', 'ejections', 'ejected_until', 'latency',
+        'total_time', 'binary_schema',
+    )
+
+    def __init__(self, pool):
+        self.address = pool.address
+        self.pool = pool
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.latency = None
+        self.total_time = 0.0
+        # None until the server accepts or refuses a CONTENT_BIN schema.
+        self.binary_schema = None
+
+    @property
+    def label(self):
+        """host:port or the socket path."""
+        if isinstance(self.address, str):
+            return self.address
+        return f"{self.address[0]}:{self.address[1]}"
+
+
+class NeutralIpcBalancer:
+    """Choose an endpoint per render and track its health and latency."""
+
+    STRATEGIES = ('least_outstanding', 'latency')
+    LATENCY_ALPHA = 0.3
+
+    def __init__(self, pools, strategy='least_outstanding', max_failures=3, cooldown=10):
+        """
+        Args:
+            pools (list): One NeutralIpcPool per endpoint.
+            strategy (str): "least_outstanding" or "latency".
+            max_failures (int): Consecutive failures that eject an endpoint.
+            cooldown (float): Seconds an ejected endpoint is skipped.
+        """
+        if not pools:
+            raise ValueError("at least one endpoint is required")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"unknown balance strategy: {strategy!r}")
+
+        self.endpoints = [IpcEndpoint(pool) for pool in pools]
+        self.strategy = strategy
+        self.max_failures = max(1, max_failures)
+        self.cooldown = cooldown
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, exclude=()):
+        """
+        Return the endpoint for the next render, or None if all are excluded.
+
+        The endpoint counts as outstanding until release() is called.
+        """
+        now = time.monotonic()
+        with self._lock:
+            count = len(self.endpoints)
+            start = self._next
+            self._next = (start + 1) % count
+            candidates = [
+                self.endpoints[(start + i) % count] for i in range(count)
+                if self.endpoints[(start + i) % count] not in exclude
+            ]
+            if not candidates:
+                return None
+
+            healthy = [ep for ep in candidates if ep.ejected_until <= now]
+            if healthy:
+                endpoint = min(healthy, key=self._score)
+            else:
+                endpoint = min(candidates, key=lambda ep: ep.ejected_until)
+
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint, elapsed, ok=True):
+        """Record the outcome of a render sent to endpoint."""
+        eject = False
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.requests += 1
+            if ok:
+                endpoint.consecutive_failures = 0
+                endpoint.total_time += elapsed
+                if endpoint.latency is None:
+                    endpoint.latency = elapsed
+                else:
+                    endpoint.latency += self.LATENCY_ALPHA * (elapsed - endpoint.latency)
+            else:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.max_failures:
+                    endpoint.ejected_until = time.monotonic() + self.cooldown
+                    endpoint.ejections += 1
+                    eject = True
+
+        if eject:
+            endpoint.pool.close()
+
+    def binary_refused(self):
+        """True when every endpoint has refused a CONTENT_BIN schema."""
+        return all(endpoint.binary_schema is False for endpoint in self.endpoints)
+
+    def stats(self):
+        """Per-endpoint counters of this worker process, latencies in milliseconds."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'endpoint': ep.label,
+                    'outstanding': ep.outstanding,
+                    'requests': ep.requests,
+                    'failures': ep.failures,
+                    'ejections': ep.ejections,
+                    'ejected': ep.ejected_until > now,
+                    'latency_ms': None if ep.latency is None else ep.latency * 1000,
+                    'avg_ms': (
+                        ep.total_time * 1000 / (ep.requests - ep.failures)
+                        if ep.requests > ep.failures else None
+                    ),
+                }
+                for ep in self.endpoints
+            ]
+
+    def close(self):
+        """Close the idle connections of every endpoint."""
+        for endpoint in self.endpoints:
+            endpoint.pool.close()
+
+    def _score(self, endpoint):
+        if self.strategy == 'latency':
+            # Endpoints without a sample yet score 0 and get probed first.
+            return (endpoint.outstanding + 1) * (endpoint.latency or 0.0)
+        return endpoint.outstanding
+
+
+class RenderAttempts:
+    """
+    Endpoint choice and retry policy of one render, shared by the blocking
+    and asyncio clients: every attempt is counted against its endpoint, and
+    after a transport error the render moves on to an endpoint not tried yet.
+    """
+
+    def __init__(self, balancer):
+        self.balancer = balancer
+        self.endpoint = None
+        self._tried = []
+        self._started = 0.0
+
+    def __iter__(self):
+        """Endpoints to try, until done() or a failed() that returns False."""
+        while True:
+            self.endpoint = self.balancer.acquire(self._tried)
+            self._started = time.monotonic()
+            yield self.endpoint
+
+    def done(self):
+        """Release the endpoint after a complete exchange."""
+        self.balancer.release(self.endpoint, time.monotonic() - self._started)
+
+    def failed(self, retry=True):
+        """Count a transport error; True if another endpoint should be tried."""
+        self.balancer.release(self.endpoint, time.monotonic() - self._started, ok=False)
+        if not retry:
+            return False
+        self._tried.append(self.endpoint)
+        return len(self._tried) < len(self.balancer.endpoints)
+
+
+# Reassigned after a fork: module state, not constants.
+_balancer = None  # pylint: disable=invalid-name
+_balancer_pid = None  # pylint: disable=invalid-name
+_balancer_lock = threading.Lock()
+
+
+def get_balancer():
+    """Return the balancer of this worker process for the configured endpoints."""
+    global _balancer, _balancer_pid  # pylint: disable=global-statement
+
+    pid = os.getpid()
+    if _balancer is not None and _balancer_pid == pid:
+        return _balancer
+
+    with _balancer_lock:
+        if _balancer is None or _balancer_pid != pid:
+            # Connections inherited through fork belong to the parent.
+            addresses = ipc_config.ENDPOINTS or [
+                ipc_config.UNIX_SOCKET or (ipc_config.HOST, ipc_config.PORT)
+            ]
+            pools = [
+                NeutralIpcPool(
+                    address, ipc_config.TIMEOUT, ipc_config.POOL_SIZE, ipc_config.MAX_IDLE
+                )
+                for address in addresses
+            ]
+            _balancer = NeutralIpcBalancer(
+                pools, ipc_config.BALANCE, ipc_config.MAX_FAILURES, ipc_config.EJECT_COOLDOWN
+            )
+            _balancer_pid = pid
+
+    return _balancer
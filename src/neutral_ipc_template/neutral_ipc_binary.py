@@ -0,0 +1,214 @@
+"""
+Binary schema encoding for Neutral IPC records (content-format 40).
+
+The encoding is the MessagePack subset needed for JSON-like data, so a
+server can decode it with any MessagePack library:
+
+    nil, false, true
+    positive/negative fixint, uint 8/16/32/64, int 8/16/32/64
+    float 64
+    fixstr, str 8/16/32 (UTF-8)
+    fixarray, array 16/32
+    fixmap, map 16/32 (string keys)
+
+Lengths and numbers are big endian. Anything else (bytes, sets, custom
+objects) raises TypeError, like json.dumps does.
+"""
+
+import struct
+
+_PACK_F64 = struct.Struct('>d').pack
+_PACK_U8 = struct.Struct('>B').pack
+_PACK_U16 = struct.Struct('>H').pack
+_PACK_U32 = struct.Struct('>I').pack
+_PACK_U64 = struct.Struct('>Q').pack
+_PACK_I8 = struct.Struct('>b').pack
+_PACK_I16 = struct.Struct('>h').pack
+_PACK_I32 = struct.Struct('>i').pack
+_PACK_I64 = struct.Struct('>q').pack
+
+_UNPACK = {
+    0xca: (struct.Struct('>f'), 4),
+    0xcb: (struct.Struct('>d'), 8),
+    0xcc: (struct.Struct('>B'), 1),
+    0xcd: (struct.Struct('>H'), 2),
+    0xce: (struct.Struct('>I'), 4),
+    0xcf: (struct.Struct('>Q'), 8),
+    0xd0: (struct.Struct('>b'), 1),
+    0xd1: (struct.Struct('>h'), 2),
+    0xd2: (struct.Struct('>i'), 4),
+    0xd3: (struct.Struct('>q'), 8),
+}
+
+
+class BinaryDecodeError(ValueError):
+    """Malformed or unsupported binary content."""
+
+
+def dumps(value):
+    """Encode a JSON-like value."""
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def _encode_str(value, out):
+    data = value.encode('utf-8')
+    size = len(data)
+    if size < 32:
+        out.append(0xa0 | size)
+    elif size < 0x100:
+        out += b'\xd9' + _PACK_U8(size)
+    elif size < 0x10000:
+        out += b'\xda' + _PACK_U16(size)
+    else:
+        out += b'\xdb' + _PACK_U32(size)
+    out += data
+
+
+def _encode_int(value, out):  # pylint: disable=too-many-branches
+    if 0 <= value < 0x80:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xff)
+    elif value >= 0:
+        if value < 0x100:
+            out += b'\xcc' + _PACK_U8(value)
+        elif value < 0x10000:
+            out += b'\xcd' + _PACK_U16(value)
+        elif value < 0x100000000:
+            out += b'\xce' + _PACK_U32(value)
+        elif value < 0x10000000000000000:
+            out += b'\xcf' + _PACK_U64(value)
+        else:
+            raise OverflowError("integer too large for the binary schema")
+    elif value >= -0x80:
+        out += b'\xd0' + _PACK_I8(value)
+    elif value >= -0x8000:
+        out += b'\xd1' + _PACK_I16(value)
+    elif value >= -0x80000000:
+        out += b'\xd2' + _PACK_I32(value)
+    elif value >= -0x8000000000000000:
+        out += b'\xd3' + _PACK_I64(value)
+    else:
+        raise OverflowError("integer too large for the binary schema")
+
+
+def _encode(value, out):  # pylint: disable=too-many-branches
+    if isinstance(value, str):
+        _encode_str(value, out)
+    elif isinstance(value, dict):
+        size = len(value)
+        if size < 16:
+            out.append(0x80 | size)
+        elif size < 0x10000:
+            out += b'\xde' + _PACK_U16(size)
+        else:
+            out += b'\xdf' + _PACK_U32(size)
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"keys must be str, not {type(key).__name__}")
+            _encode_str(key, out)
+            _encode(item, out)
+    elif isinstance(value, (list, tuple)):
+        size = len(value)
+        if size < 16:
+            out.append(0x90 | size)
+        elif size < 0x10000:
+            out += b'\xdc' + _PACK_U16(size)
+        else:
+            out += b'\xdd' + _PACK_U32(size)
+        for item in value:
+            _encode(item, out)
+    elif value is None:
+        out.append(0xc0)
+    elif value is True:
+        out.append(0xc3)
+    elif value is False:
+        out.append(0xc2)
+    elif isinstance(value, int):
+        _encode_int(value, out)
+    elif isinstance(value, float):
+        out += b'\xcb' + _PACK_F64(value)
+    else:
+        raise TypeError(f"Object of type {type(value).__name__} is not binary serializable")
+
+
+def loads(data):
+    """Decode a value produced by dumps (or any MessagePack in the subset)."""
+    view = memoryview(data)
+    try:
+        value, offset = _decode(view, 0)
+    except (IndexError, struct.error, UnicodeDecodeError) as error:
+        raise BinaryDecodeError(f"truncated or invalid binary content: {error}") from error
+
+    if offset != len(view):
+        raise BinaryDecodeError("trailing bytes after binary content")
+    return value
+
+
+def _decode(view, offset):  # pylint: disable=too-many-return-statements,too-many-branches
+    code = view[offset]
+    offset += 1
+
+    if code < 0x80:
+        return code, offset
+    if code >= 0xe0:
+        return code - 0x100, offset
+    if 0xa0 <= code <= 0xbf:
+        return _decode_str(view, offset, code & 0x1f)
+    if 0x80 <= code <= 0x8f:
+        return _decode_map(view, offset, code & 0x0f)
+    if 0x90 <= code <= 0x9f:
+        return _decode_array(view, offset, code & 0x0f)
+    if code == 0xc0:
+        return None, offset
+    if code == 0xc2:
+        return False, offset
+    if code == 0xc3:
+        return True, offset
+    if code in _UNPACK:
+        unpacker, size = _UNPACK[code]
+        return unpacker.unpack_from(view, offset)[0], offset + size
+    if code in (0xd9, 0xda, 0xdb):
+        size, offset = _length(view, offset, code - 0xd9)
+        return _decode_str(view, offset, size)
+    if code in (0xdc, 0xdd):
+        size, offset = _length(view, offset, code - 0xdc + 1)
+        return _decode_array(view, offset, size)
+    if code in (0xde, 0xdf):
+        size, offset = _length(view, offset, code - 0xde + 1)
+        return _decode_map(view, offset, size)
+
+    raise BinaryDecodeError(f"unsupported type byte 0x{code:02x}")
+
+
+def _length(view, offset, width):
+    """Read a length of 1 << width bytes (width 0, 1 or 2)."""
+    unpacker, size = _UNPACK[0xcc + width]
+    return unpacker.unpack_from(view, offset)[0], offset + size
+
+
+def _decode_str(view, offset, size):
+    end = offset + size
+    if end > len(view):
+        raise BinaryDecodeError("truncated string")
+    return str(view[offset:end], 'utf-8'), end
+
+
+def _decode_array(view, offset, size):
+    items = []
+    for _ in range(size):
+        item, offset = _decode(view, offset)
+        items.append(item)
+    return items, offset
+
+
+def _decode_map(view, offset, size):
+    result = {}
+    for _ in range(size):
+        key, offset = _decode(view, offset)
+        if not isinstance(key, str):
+            raise BinaryDecodeError("map keys must be strings")
+        result[key], offset = _decode(view, offset)
+    return result, offset
@@ -20,6 +20,20 @@ class NeutralIpcConfig:
         PORT (int): Default port number (4273)
         TIMEOUT (int): Default timeout in seconds (10)
         BUFFER_SIZE (int): Default buffer size in bytes (8192)
+        UNIX_SOCKET (str): Unix domain socket path, used instead of host/port
+                           when set (empty)
+        POOL_SIZE (int): Idle connections kept per worker, 0 disables
+                         connection reuse (8)
+        MAX_IDLE (int): Seconds an idle connection may be reused (30)
+        SCHEMA_FORMAT (str): "json" or "binary"; binary sends object schemas
+                             as CONTENT_BIN and falls back to JSON for the
+                             endpoints that refuse it ("json")
+        ENDPOINTS (list): Render servers to balance across, "host:port" or a
+                          Unix socket path each; empty uses unix_socket or
+                          host/port ([])
+        BALANCE (str): "least_outstanding" or "latency" ("least_outstanding")
+        MAX_FAILURES (int): Consecutive failures that eject an endpoint (3)
+        EJECT_COOLDOWN (int): Seconds an ejected endpoint is skipped (10)
     """
 
     # Default values
@@ -27,6 +41,14 @@ class NeutralIpcConfig:
     PORT = 4273
     TIMEOUT = 10
     BUFFER_SIZE = 8192
+    UNIX_SOCKET = ''
+    POOL_SIZE = 8
+    MAX_IDLE = 30
+    SCHEMA_FORMAT = 'json'
+    ENDPOINTS = []
+    BALANCE = 'least_outstanding'
+    MAX_FAILURES = 3
+    EJECT_COOLDOWN = 10
 
     # The IPC server configuration file
     CONFIG_FILE = '/etc/neutral-ipc-cfg.json'
@@ -67,9 +89,20 @@ class NeutralIpcConfig:
             return default_value
 
         # Type validation for specific keys
-        if key == 'host' and isinstance(value, str):
+        if key in ['host', 'unix_socket'] and isinstance(value, str):
             return value
-        elif key in ['port', 'timeout', 'buffer_size'] and isinstance(value, int):
+        elif key == 'schema_format' and value in ('json', 'binary'):
+            return value
+        elif key == 'balance' and value in ('least_outstanding', 'latency'):
+            return value
+        elif key == 'endpoints' and isinstance(value, list):
+            try:
+                return [parse_endpoint(item) for item in value]
+            except (TypeError, ValueError):
+                return default_value
+        elif key in ['port', 'timeout', 'buffer_size', 'pool_size', 'max_idle',
+                     'max_failures', 'eject_cooldown'] \
+                and isinstance(value, int) and not isinstance(value, bool):
             return value
 
         return default_value
@@ -98,9 +131,85 @@ class NeutralIpcConfig:
         config = cls.load_config()
         return cls.get_config_value(config, 'buffer_size', cls.BUFFER_SIZE)
 
+    @classmethod
+    def get_unix_socket(cls):
+        """Get configured Unix domain socket path."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'unix_socket', cls.UNIX_SOCKET)
+
+    @classmethod
+    def get_pool_size(cls):
+        """Get configured number of idle connections kept per worker."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'pool_size', cls.POOL_SIZE)
+
+    @classmethod
+    def get_max_idle(cls):
+        """Get configured maximum idle time of a pooled connection."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'max_idle', cls.MAX_IDLE)
+
+    @classmethod
+    def get_schema_format(cls):
+        """Get configured schema transport format."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'schema_format', cls.SCHEMA_FORMAT)
+
+    @classmethod
+    def get_endpoints(cls):
+        """Get configured endpoint addresses: (host, port) tuples or socket paths."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'endpoints', cls.ENDPOINTS)
+
+    @classmethod
+    def get_balance(cls):
+        """Get configured endpoint selection strategy."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'balance', cls.BALANCE)
+
+    @classmethod
+    def get_max_failures(cls):
+        """Get configured consecutive failures before an endpoint is ejected."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'max_failures', cls.MAX_FAILURES)
+
+    @classmethod
+    def get_eject_cooldown(cls):
+        """Get configured seconds an ejected endpoint is skipped."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'eject_cooldown', cls.EJECT_COOLDOWN)
+
+
+def parse_endpoint(value):
+    """
+    Parse one "endpoints" entry.
+
+    "host:port" and "[ipv6]:port" give a (host, port) tuple, an absolute path
+    is a Unix domain socket. Anything else raises ValueError.
+    """
+    if not isinstance(value, str):
+        raise TypeError("endpoint must be a string")
+    if value.startswith('/'):
+        return value
+
+    host, sep, port = value.rpartition(':')
+    if not sep or not host or not port.isdigit():
+        raise ValueError(f"invalid endpoint: {value!r}")
+    if host.startswith('[') and host.endswith(']'):
+        host = host[1:-1]
+    return (host, int(port))
+
 
 # Set module-level variables with appropriate values using public methods
 HOST = NeutralIpcConfig.get_host()
 PORT = NeutralIpcConfig.get_port()
 TIMEOUT = NeutralIpcConfig.get_timeout()
 BUFFER_SIZE = NeutralIpcConfig.get_buffer_size()
+UNIX_SOCKET = NeutralIpcConfig.get_unix_socket()
+POOL_SIZE = NeutralIpcConfig.get_pool_size()
+MAX_IDLE = NeutralIpcConfig.get_max_idle()
+SCHEMA_FORMAT = NeutralIpcConfig.get_schema_format()
+ENDPOINTS = NeutralIpcConfig.get_endpoints()
+BALANCE = NeutralIpcConfig.get_balance()
+MAX_FAILURES = NeutralIpcConfig.get_max_failures()
+EJECT_COOLDOWN = NeutralIpcConfig.get_eject_cooldown()
@@ -0,0 +1,116 @@
+"""
+Persistent connections to the Neutral IPC server.
+
+Opening a TCP connection for every render costs a handshake and leaves a
+socket in TIME_WAIT. NeutralIpcPool keeps finished connections open and
+hands them to the next render of the same worker process.
+
+A pooled connection is checked before it is reused: if the server closed it
+(or left unread data on it) it is dropped and another one is taken. Idle
+connections older than max_idle seconds are closed, and at most max_size
+idle connections are kept. The record protocol is not changed; a server that
+closes the connection after each response simply gets a new one every time.
+
+Each worker has one pool per endpoint, see neutral_ipc_balancer.get_balancer.
+"""
+
+import select
+import socket
+import threading
+import time
+from collections import deque
+
+
+class BaseIpcPool:  # pylint: disable=too-few-public-methods
+    """Settings and idle connections of the blocking and asyncio pools."""
+
+    def __init__(self, address, timeout, max_size, max_idle):
+        """
+        Args:
+            address: (host, port) for TCP or a path for a Unix domain socket.
+            timeout (float): Connect and I/O timeout in seconds.
+            max_size (int): Idle connections kept; 0 disables pooling.
+            max_idle (float): Seconds an idle connection may be reused.
+        """
+        self.address = address
+        self.timeout = timeout
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._idle = deque()
+
+
+class NeutralIpcPool(BaseIpcPool):
+    """Idle connections to one Neutral IPC endpoint."""
+
+    def __init__(self, address, timeout, max_size, max_idle):
+        super().__init__(address, timeout, max_size, max_idle)
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Open a new connection to the endpoint."""
+        if isinstance(self.address, str):
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.settimeout(self.timeout)
+            try:
+                conn.connect(self.address)
+            except OSError:
+                conn.close()
+                raise
+            return conn
+
+        conn = socket.create_connection(self.address, self.timeout)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn
+
+    def acquire(self):
+        """
+        Return (connection, reused).
+
+        reused is True when the connection comes from the pool; a failure on
+        it may just mean the server dropped it while idle.
+        """
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+
+            if now - last_used <= self.max_idle and self._is_healthy(conn):
+                return conn, True
+            conn.close()
+
+        return self.connect(), False
+
+    def release(self, conn):
+        """Return a connection after a complete request/response exchange."""
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    @staticmethod
+    def discard(conn):
+        """Close a connection that must not be reused."""
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for conn, _ in idle:
+            self.discard(conn)
+
+    @staticmethod
+    def _is_healthy(conn):
+        """An idle connection must have nothing to read: no EOF, no stray bytes."""
+        # select.select, unlike select.poll, is also available on Windows.
+        try:
+            readable, _, _ = select.select([conn], [], [], 0)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return False
+        return not readable
@@ -9,7 +9,9 @@ import json
 import socket
 import struct
 
-from .neutral_ipc_config import NeutralIpcConfig
+from . import neutral_ipc_binary
+from . import neutral_ipc_config as ipc_config
+from .neutral_ipc_balancer import RenderAttempts, get_balancer
 
 
 class NeutralIpcRecord:
@@ -68,13 +70,25 @@ class NeutralIpcRecord:
             int(length2)
         )
 
+    @staticmethod
+    def encode_parts(control, format1, content1, format2, content2):
+        """
+        Encode IPC record as [header, content1, content2].
+
+        Each content is UTF-8 encoded once (bytes are used as they are) and
+        the parts are not concatenated, so they can be sent with scatter/gather.
+        """
+        body1 = _as_bytes(content1)
+        body2 = _as_bytes(content2)
+        header = NeutralIpcRecord.encode_header(control, format1, len(body1), format2, len(body2))
+        return [header, body1, body2]
+
     @staticmethod
     def encode_record(control, format1, content1, format2, content2):
         """Encode complete IPC record."""
-        length1 = len(content1.encode('utf-8'))
-        length2 = len(content2.encode('utf-8'))
-        header = NeutralIpcRecord.encode_header(control, format1, length1, format2, length2)
-        return header + content1.encode('utf-8') + content2.encode('utf-8')
+        return b''.join(
+            NeutralIpcRecord.encode_parts(control, format1, content1, format2, content2)
+        )
 
     @staticmethod
     def decode_record(header, content1, content2):
@@ -90,53 +104,178 @@ class NeutralIpcRecord:
         return record
 
 
-class NeutralIpcClient:
-    """Neutral IPC client."""
+class BaseIpcClient:  # pylint: disable=too-many-instance-attributes
+    """Request record of the blocking and asyncio clients."""
 
-    def __init__(self, control, format1, content1, format2, content2):
-        """Initialize IPC client with parameters."""
+    def __init__(self, control, format1, content1, format2, content2, fallback=None):
+        """
+        Initialize IPC client with parameters.
+
+        fallback returns content1 as JSON text, sent instead of a CONTENT_BIN
+        content1 to an endpoint that does not accept it.
+        """
         self.control = control
         self.format1 = format1
         self.content1 = content1
         self.format2 = format2
         self.content2 = content2
+        self.fallback = fallback
         self.result = {}
+        self._sent_binary = False
+
+    def encode(self, endpoint=None):
+        """The request record for endpoint as [header, content1, content2]."""
+        format1, content1 = self.format1, self.content1
+        self._sent_binary = format1 == NeutralIpcRecord.CONTENT_BIN
+        if self._sent_binary and self.fallback is not None and endpoint is not None \
+                and endpoint.binary_schema is False:
+            format1, content1 = NeutralIpcRecord.CONTENT_JSON, self.fallback()
+            self._sent_binary = False
+        return NeutralIpcRecord.encode_parts(
+            self.control, format1, content1, self.format2, self.content2
+        )
+
+    def refused_binary(self, endpoint):
+        """
+        True if endpoint refused the CONTENT_BIN content1 just sent, which is
+        then to be sent again as JSON.
+
+        A server that reads content-format 40 answers in it, with status KO
+        too (syntax error, missing file); only a KO in another format is a
+        refusal. Each endpoint is negotiated on its first binary exchange.
+        """
+        if not self._sent_binary or self.fallback is None:
+            return False
+        refused = (
+            self.result['control'] != NeutralIpcRecord.CTRL_STATUS_OK
+            and self.result['format-1'] != NeutralIpcRecord.CONTENT_BIN
+        )
+        if refused or endpoint.binary_schema is None:
+            endpoint.binary_schema = not refused
+        return refused
+
+
+class NeutralIpcClient(BaseIpcClient):
+    """Neutral IPC client."""
 
     def start(self):
         """Start IPC communication and process response."""
-        with socket.create_connection((NeutralIpcConfig.HOST, NeutralIpcConfig.PORT),
-                                    NeutralIpcConfig.TIMEOUT) as conn:
-            request = NeutralIpcRecord.encode_record(
-                self.control, self.format1, self.content1, self.format2, self.content2
-            )
-            conn.sendall(request)
+        attempts = RenderAttempts(get_balancer())
+        for endpoint in attempts:
+            try:
+                self.result = self._send(endpoint.pool, self.encode(endpoint))
+                if self.refused_binary(endpoint):
+                    self.result = self._send(endpoint.pool, self.encode(endpoint))
+            except socket.timeout:
+                attempts.failed(retry=False)
+                raise
+            except (OSError, ValueError):
+                # Try the other endpoints once before giving up.
+                if attempts.failed():
+                    continue
+                raise
+
+            attempts.done()
+            return self.result
 
-            response_header = conn.recv(NeutralIpcRecord.HEADER_LEN)
-            if len(response_header) != NeutralIpcRecord.HEADER_LEN:
-                raise ValueError("Incomplete header received")
+    def _send(self, pool, request):
+        """Exchange one record on a pooled connection of an endpoint."""
+        while True:
+            conn, reused = pool.acquire()
+            try:
+                result = self._exchange(conn, request)
+            except socket.timeout:
+                pool.discard(conn)
+                raise
+            except (OSError, ValueError):
+                pool.discard(conn)
+                # A pooled connection may have been closed by the server while idle.
+                if reused:
+                    continue
+                raise
+
+            pool.release(conn)
+            return result
+
+    def _exchange(self, conn, request):
+        """Send one request record and read its response record."""
+        send_parts(conn, request)
+
+        response_header = recv_exact(conn, NeutralIpcRecord.HEADER_LEN)
+        if len(response_header) != NeutralIpcRecord.HEADER_LEN:
+            raise ValueError("Incomplete header received")
+
+        response = NeutralIpcRecord.decode_header(response_header)
+
+        content1 = self._read_content(conn, response['length-1'], response['format-1'])
+        content2 = self._read_content(conn, response['length-2'], response['format-2'])
+
+        return NeutralIpcRecord.decode_record(response_header, content1, content2)
+
+    def _read_content(self, conn, length, content_format):
+        """Read content from connection with specified length."""
+        content = recv_exact(conn, length, ipc_config.BUFFER_SIZE)
+        if len(content) != length:
+            raise ValueError("Error reading from stream")
 
-            response = NeutralIpcRecord.decode_header(response_header)
+        return decode_content(content_format, content)
 
-            content1 = self._read_content(conn, response['length-1'])
-            content2 = self._read_content(conn, response['length-2'])
 
-            self.result = NeutralIpcRecord.decode_record(response_header, content1, content2)
+def decode_content(content_format, content):
+    """Binary content stays bytes, everything else is UTF-8 text."""
+    if content_format == NeutralIpcRecord.CONTENT_BIN:
+        return bytes(content)
+    return content.decode('utf-8')
 
-            return self.result
 
-    def _read_content(self, conn, length):
-        """Read content from connection with specified length."""
-        chunks = []
-        buffer_size = NeutralIpcConfig.BUFFER_SIZE
+def _as_bytes(content):
+    """Content as a bytes-like object, UTF-8 encoding text."""
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return content
+    return content.encode('utf-8')
+
 
-        while length > 0:
-            chunk = conn.recv(min(buffer_size, length))
-            if not chunk:
-                raise ValueError("Error reading from stream")
-            chunks.append(chunk)
-            length -= len(chunk)
+def send_parts(conn, parts):
+    """Send all parts in order, with sendmsg (scatter/gather) where available."""
+    views = [memoryview(part) for part in parts if len(part)]
 
-        return b''.join(chunks).decode('utf-8')
+    if not hasattr(conn, 'sendmsg'):
+        for view in views:
+            conn.sendall(view)
+        return
+
+    while views:
+        sent = conn.sendmsg(views)
+        while sent:
+            if sent >= views[0].nbytes:
+                sent -= views.pop(0).nbytes
+            else:
+                views[0] = views[0][sent:]
+                sent = 0
+
+
+def recv_exact(conn, length, chunk_size=None):
+    """
+    Receive length bytes into a preallocated bytearray.
+
+    The result is shorter than length only if the stream ends first.
+    """
+    buffer = bytearray(length)
+    received = 0
+
+    with memoryview(buffer) as view:
+        while received < length:
+            wanted = length - received
+            if chunk_size:
+                wanted = min(chunk_size, wanted)
+            count = conn.recv_into(view[received:], wanted)
+            if not count:
+                break
+            received += count
+
+    if received < length:
+        del buffer[received:]
+    return buffer
 
 
 class NeutralIpcTemplate:
@@ -146,22 +285,66 @@ class NeutralIpcTemplate:
         """Initialize template with schema and content."""
         self.template = template
         self.tpl_type = tpl_type
-        self.schema = json.dumps(schema) if not isinstance(schema, str) else schema
+        self._schema_text = None
+        self._schema_binary = None
+        self.schema = schema
         self.result = {}
 
+    @property
+    def schema(self):
+        """Schema as JSON text."""
+        if self._schema_text is None:
+            self._schema_text = json.dumps(neutral_ipc_binary.loads(self._schema_binary))
+        return self._schema_text
+
+    @schema.setter
+    def schema(self, schema):
+        """
+        Serialize the schema now, so later changes to the caller's object
+        are not sent. JSON text is kept as it is; an object is encoded as
+        MessagePack when "schema_format" is "binary" and no endpoint has
+        refused it, and as JSON otherwise.
+        """
+        self._schema_text = self._schema_binary = None
+        if isinstance(schema, str):
+            self._schema_text = schema
+        elif ipc_config.SCHEMA_FORMAT == 'binary' and not get_balancer().binary_refused():
+            self._schema_binary = neutral_ipc_binary.dumps(schema)
+        else:
+            self._schema_text = json.dumps(schema)
+
     def render(self):
         """Render template with schema."""
-        record = NeutralIpcClient(
+        return self._set_result(NeutralIpcClient(*self._request()).start())
+
+    def _request(self):
+        """Client arguments for a parse-template request."""
+        if self._schema_binary is not None:
+            schema_format = NeutralIpcRecord.CONTENT_BIN
+            schema = self._schema_binary
+        else:
+            schema_format = NeutralIpcRecord.CONTENT_JSON
+            schema = self.schema
+
+        return (
             NeutralIpcRecord.CTRL_PARSE_TEMPLATE,
-            NeutralIpcRecord.CONTENT_JSON,
-            self.schema,
+            schema_format,
+            schema,
             self.tpl_type,
-            self.template
+            self.template,
+            lambda: self.schema,
         )
-        result = record.start()
+
+    def _set_result(self, result):
+        """Store a decoded response record and return the rendered content."""
+        if result['format-1'] == NeutralIpcRecord.CONTENT_BIN:
+            metadata = neutral_ipc_binary.loads(result['content-1'])
+        else:
+            metadata = json.loads(result['content-1'])
+
         self.result = {
             'status': result['control'],
-            'result': json.loads(result['content-1']),
+            'result': metadata,
             'content': result['content-2'],
         }
 
@@ -179,9 +362,12 @@ class NeutralIpcTemplate:
 
     def merge_schema(self, schema):
         """Merge new schema with existing schema."""
-        current_schema = json.loads(self.schema)
+        if self._schema_binary is not None:
+            current_schema = neutral_ipc_binary.loads(self._schema_binary)
+        else:
+            current_schema = json.loads(self.schema)
         new_schema = json.loads(schema) if isinstance(schema, str) else schema
-        self.schema = json.dumps(deep_merge(current_schema, new_schema))
+        self.schema = deep_merge(current_schema, new_schema)
 
     def has_error(self):
         """Check if template has errors."""
@@ -1,6 +1,15 @@
 """Network utility functions."""
 
+import bisect
 import fnmatch
+import ipaddress
+import re
+import threading
+from collections import OrderedDict
+
+# Entries matching every valid address, and the loopback addresses.
+ANY_ADDRESS = ("0.0.0.0/0", "::/0")
+LOOPBACK = ("127.0.0.0/8", "::1")
 
 
 def normalize_host(host):
@@ -31,3 +40,146 @@ def is_allowed_host(host, allowed_hosts):
         if normalized_pattern == "*" or fnmatch.fnmatch(host, normalized_pattern):
             return True
     return False
+
+
+class HostMatcher:
+    """
+    ALLOWED_HOSTS check compiled once: patterns are normalized, exact hosts
+    go to a set and wildcard patterns to one regex. Verdicts for recent
+    Host values are kept in a small LRU.
+    """
+
+    def __init__(self, allowed_hosts, max_cache=1024):
+        self.allow_all = False
+        self.exact = set()
+        wildcards = []
+        for pattern in allowed_hosts or []:
+            normalized_pattern = (pattern or '').strip().lower().rstrip('.')
+            if not normalized_pattern:
+                continue
+            if normalized_pattern == "*":
+                self.allow_all = True
+            elif any(char in normalized_pattern for char in "*?["):
+                wildcards.append(fnmatch.translate(normalized_pattern))
+            else:
+                self.exact.add(normalized_pattern)
+        self._wildcard = re.compile("|".join(wildcards)) if wildcards else None
+
+        self.max_cache = max_cache
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_allowed(self, host):
+        """Check a normalized host, as is_allowed_host does."""
+        if not host:
+            return False
+        if self.allow_all or host in self.exact:
+            return True
+        return self._wildcard is not None and self._wildcard.match(host) is not None
+
+    def contains(self, raw_host):
+        """Normalize a Host header value and check it."""
+        with self._lock:
+            result = self._cache.get(raw_host)
+            if result is not None:
+                self._cache.move_to_end(raw_host)
+                return result
+
+        result = self.is_allowed(normalize_host(raw_host))
+        with self._lock:
+            self._cache[raw_host] = result
+            if len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        return result
+
+
+class IpMatcher:
+    """
+    Membership test for a list of CIDRs and single IPs, compiled to sorted
+    integer ranges per IP version. Invalid entries are ignored. Results for
+    recent addresses are kept in a small LRU.
+    """
+
+    def __init__(self, entries, max_cache=1024):
+        ranges = {4: [], 6: []}
+        for item in entries or []:
+            value = (item or "").strip()
+            if not value:
+                continue
+            try:
+                network = ipaddress.ip_network(value, strict=False)
+                first, last = network.network_address, network.broadcast_address
+            except ValueError:
+                try:
+                    first = last = ipaddress.ip_address(value)
+                except ValueError:
+                    continue
+            ranges[first.version].append((int(first), int(last)))
+
+        self._starts = {}
+        self._ends = {}
+        for version, items in ranges.items():
+            merged = []
+            for start, end in sorted(items):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self._starts[version] = [start for start, _ in merged]
+            self._ends[version] = [end for _, end in merged]
+
+        self.max_cache = max_cache
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return any(self._starts.values())
+
+    def contains(self, address):
+        """True if address (a string) is inside one of the entries."""
+        with self._lock:
+            result = self._cache.get(address)
+            if result is not None:
+                self._cache.move_to_end(address)
+                return result
+
+        result = self._match(address)
+        with self._lock:
+            self._cache[address] = result
+            if len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        return result
+
+    def _match(self, address):
+        try:
+            ip = ipaddress.ip_address((address or "").strip())
+        except ValueError:
+            return False
+        value = int(ip)
+        index = bisect.bisect_right(self._starts[ip.version], value) - 1
+        return index >= 0 and value <= self._ends[ip.version][index]
+
+
+_MATCHERS = {}
+_MATCHERS_LOCK = threading.Lock()
+
+
+def _get_matcher(cls, entries):
+    key = (cls, tuple(entries or ()))
+    matcher = _MATCHERS.get(key)
+    if matcher is None:
+        with _MATCHERS_LOCK:
+            matcher = _MATCHERS.get(key)
+            if matcher is None:
+                matcher = _MATCHERS[key] = cls(key[1])
+    return matcher
+
+
+def get_ip_matcher(entries):
+    """Compiled IpMatcher for entries, built once per distinct list."""
+    return _get_matcher(IpMatcher, entries)
+
+
+def get_host_matcher(allowed_hosts):
+    """Compiled HostMatcher for allowed_hosts, built once per distinct list."""
+    return _get_matcher(HostMatcher, allowed_hosts)
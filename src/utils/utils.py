@@ -3,7 +3,9 @@
 import json
 import ipaddress
 
-from flask import current_app, request
+from flask import current_app, g, request
+
+from .network import get_host_matcher, get_ip_matcher
 
 
 def get_ip():
@@ -19,6 +21,18 @@ def get_ip():
     return remote_addr
 
 
+def request_host():
+    """
+    Host header of the request (stripped, lower case) and whether
+    ALLOWED_HOSTS accepts it. Checked once per request, then read from g.
+    """
+    if "request_host" not in g:
+        raw_host = (request.host or request.headers.get("Host") or "").strip().lower()
+        matcher = get_host_matcher(current_app.config.get("ALLOWED_HOSTS", []))
+        g.request_host = (raw_host, matcher.contains(raw_host))
+    return g.request_host
+
+
 def _parse_ip(value):
     try:
         return ipaddress.ip_address(value)
@@ -27,22 +41,8 @@ def _parse_ip(value):
 
 
 def _is_trusted_proxy(remote_addr):
-    remote_ip = _parse_ip(remote_addr)
-    if remote_ip is None:
-        return False
-
     trusted_proxies = current_app.config.get("TRUSTED_PROXY_CIDRS", [])
-    for cidr in trusted_proxies:
-        try:
-            network = ipaddress.ip_network(cidr, strict=False)
-            if remote_ip in network:
-                return True
-        except ValueError:
-            trusted_ip = _parse_ip(cidr)
-            if trusted_ip is not None and remote_ip == trusted_ip:
-                return True
-
-    return False
+    return get_ip_matcher(trusted_proxies).contains(remote_addr)
 
 
 def format_ua(ua):
@@ -2,12 +2,17 @@
 Pytest configuration and fixtures.
 """
 
+import json
+import socket
+import struct
 import sys
+import threading
 
 import pytest
 
 from app import create_app
 from app.config import Config
+from neutral_ipc_template import neutral_ipc_binary
 
 
 class TestConfig(Config):
@@ -62,3 +67,109 @@ def runner(flask_app):
     A test CLI runner for the app.
     """
     return flask_app.test_cli_runner()
+
+
+class StandInIpcServer:
+    """
+    Minimal Neutral IPC server for client tests.
+
+    It answers every parse-template record with status OK, a JSON result and
+    "<format-2>:<content-2>" as the rendered content, and serves several
+    records per connection unless close_after_response is set. A binary
+    (content-format 40) schema is decoded and answered in binary when
+    accept_binary is set, and refused with status KO otherwise. The template
+    "fail" is answered with status KO, as a template error.
+    """
+
+    def __init__(self, address, close_after_response=False, accept_binary=False):
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.bind(address)
+        self.sock.listen(16)
+        self.address = self.sock.getsockname()
+        self.close_after_response = close_after_response
+        self.accept_binary = accept_binary
+        self.accepted = 0
+        self.records = []
+        self.schemas = []
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.accepted += 1
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                header = self._read(conn, 12)
+                if len(header) < 12:
+                    return
+                _, control, format1, length1, format2, length2 = struct.unpack("!BBBIBI", header)
+                content1 = self._read(conn, length1)
+                content2 = self._read(conn, length2)
+                self.records.append((control, format1, content1, format2, content2))
+                status, result_format, result = self._result(format1, content1, content2)
+                content = f"{format2}:{content2.decode()}".encode()
+                conn.sendall(
+                    struct.pack("!BBBIBI", 0, status, result_format, len(result), 30, len(content))
+                    + result + content
+                )
+                if self.close_after_response:
+                    return
+
+    def _result(self, format1, content1, content2):
+        status = 1 if content2 == b"fail" else 0
+        result = {"status_code": "500" if status else "200", "has_error": bool(status)}
+        if format1 != 40:
+            self.schemas.append(json.loads(content1))
+            return status, 10, json.dumps(result).encode()
+        if not self.accept_binary:
+            return 1, 10, json.dumps({"error": "unsupported schema format"}).encode()
+        self.schemas.append(neutral_ipc_binary.loads(content1))
+        return status, 40, neutral_ipc_binary.dumps(result)
+
+    @staticmethod
+    def _read(conn, length):
+        data = b""
+        while len(data) < length:
+            chunk = conn.recv(length - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def close(self):
+        """Stop accepting connections."""
+        try:
+            # Wakes the accept() thread, which would otherwise keep listening.
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+@pytest.fixture
+def ipc_server_factory():
+    """Start stand-in Neutral IPC servers, closed at teardown."""
+    servers = []
+
+    def start(address=("127.0.0.1", 0), close_after_response=False, accept_binary=False):
+        server = StandInIpcServer(address, close_after_response, accept_binary)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def ipc_server(ipc_server_factory):  # pylint: disable=redefined-outer-name
+    """Stand-in Neutral IPC server on a free localhost port."""
+    return ipc_server_factory()
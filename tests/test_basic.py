@@ -2,8 +2,11 @@
 Basic tests for application setup and routing.
 """
 
+from flask import g
+
 from app import create_app
 from app.config import Config
+from utils.utils import request_host
 
 
 def test_app_is_created(flask_app):
@@ -38,6 +41,15 @@ def test_accepts_allowed_host(client):
     assert response.status_code == 200
 
 
+def test_host_verdict_is_computed_once_per_request(flask_app):
+    """The before_request check stores the verdict on g for Schema to reuse."""
+    with flask_app.test_request_context("/", headers={"Host": "localhost:5000"}):
+        assert request_host() == ("localhost:5000", True)
+        assert g.request_host == ("localhost:5000", True)
+        g.request_host = ("localhost:5000", False)
+        assert request_host() == ("localhost:5000", False)
+
+
 def test_accepts_loopback_ip_when_localhost_is_allowed(client):
     """Loopback IPv4 should be accepted when localhost is in ALLOWED_HOSTS."""
     response = client.get("/", headers={"Host": "127.0.0.1"})
@@ -0,0 +1,113 @@
+"""Tests for compression of dynamic responses."""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify
+
+from core.compression import ResponseCompressor
+
+PAGE = "<html><body>" + "<p>paragraph</p>\n" * 400 + "</body></html>"
+
+
+@pytest.fixture(name="compressed")
+def fixture_compressed():
+    """Minimal app with the compressor as an after_request hook."""
+    app = Flask(__name__)
+    app.compressor = ResponseCompressor(level=6, min_bytes=1024)
+    app.after_request(app.compressor.compress)
+
+    @app.route("/page")
+    def page():
+        response = Response(PAGE, mimetype="text/html")
+        response.set_etag("abc")
+        return response
+
+    @app.route("/small")
+    def small():
+        return Response("<p>short</p>", mimetype="text/html")
+
+    @app.route("/json")
+    def json_data():
+        return jsonify({"items": ["value"] * 500})
+
+    @app.route("/image.png")
+    def image():
+        return Response(b"\x89PNG" + b"\x00" * 4096, mimetype="image/png")
+
+    @app.route("/encoded")
+    def encoded():
+        return Response(gzip.compress(PAGE.encode()), headers={"Content-Encoding": "gzip"})
+
+    @app.route("/stream")
+    def stream():
+        return Response((PAGE[i:i + 2048] for i in range(0, len(PAGE), 2048)), mimetype="text/html")
+
+    return app
+
+
+def test_html_and_json_are_compressed_when_accepted(compressed):
+    """gzip is negotiated, the body decompresses to the page and the ETag changes."""
+    client = compressed.test_client()
+
+    response = client.get("/page", headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == '"abc-gz"'
+    assert int(response.headers["Content-Length"]) < len(PAGE) // 5
+    assert gzip.decompress(response.get_data()).decode() == PAGE
+
+    response = client.get("/json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+
+    response = client.get("/page")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.get_data(as_text=True) == PAGE
+    assert "Content-Encoding" not in client.get(
+        "/page", headers={"Accept-Encoding": "gzip;q=0"}
+    ).headers
+
+
+def test_small_compressed_and_encoded_responses_are_bypassed(compressed):
+    """Bodies under the threshold, images and encoded bodies go out unchanged."""
+    client = compressed.test_client()
+    headers = {"Accept-Encoding": "gzip"}
+
+    assert "Content-Encoding" not in client.get("/small", headers=headers).headers
+    image = client.get("/image.png", headers=headers)
+    assert "Content-Encoding" not in image.headers and "Vary" not in image.headers
+    encoded = client.get("/encoded", headers=headers)
+    assert gzip.decompress(encoded.get_data()).decode() == PAGE
+
+
+def test_streamed_pages_are_compressed_chunk_by_chunk(compressed):
+    """Every chunk is flushed, so the client can decode the head before the end."""
+    client = compressed.test_client()
+
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+
+    decoder = zlib.decompressobj(31)
+    chunks = [decoder.decompress(chunk) for chunk in response.response]
+    assert chunks[0].decode() == PAGE[:2048]
+    assert b"".join(chunks).decode() == PAGE
+    response.close()
+
+
+def test_stats_report_ratio_and_cpu(compressed):
+    """Compressed bytes and CPU time are counted per worker."""
+    client = compressed.test_client()
+    for _ in range(3):
+        client.get("/page", headers={"Accept-Encoding": "gzip"})
+
+    stats = compressed.compressor.stats()
+    assert stats["responses"] == 3
+    assert stats["bytes_in"] == 3 * len(PAGE)
+    assert stats["ratio"] > 5
+    assert stats["cpu_ms"] >= 0
+    assert not ResponseCompressor(level=0).enabled
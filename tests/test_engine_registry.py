@@ -0,0 +1,55 @@
+"""Tests for the process-wide SQLAlchemy engine registry."""
+
+from __future__ import annotations
+
+from core.engine import EngineRegistry, get_engine
+from core.model import Model
+
+
+def test_registry_returns_same_engine_for_same_url(tmp_path):
+    """One engine per URL, distinct engines for distinct URLs."""
+    registry = EngineRegistry()
+    first_url = f"sqlite:///{tmp_path / 'first.db'}"
+    second_url = f"sqlite:///{tmp_path / 'second.db'}"
+
+    assert registry.get(first_url) is registry.get(first_url)
+    assert registry.get(first_url) is not registry.get(second_url)
+
+    registry.dispose()
+
+
+def test_models_share_pooled_engine(tmp_path):
+    """Model instances for the same database reuse the registry engine."""
+    db_url = f"sqlite:///{tmp_path / 'shared.db'}"
+
+    first = Model(db_url, "sqlite")
+    second = Model(db_url, "sqlite")
+
+    assert first.engine is second.engine
+    assert first.engine is get_engine(db_url)
+
+
+def test_engine_options_skip_overflow_for_memory_sqlite(tmp_path):
+    """Pool sizing applies to file databases but not to in-memory SQLite."""
+    memory_options = EngineRegistry.engine_options("sqlite:///:memory:")
+    file_options = EngineRegistry.engine_options(f"sqlite:///{tmp_path / 'pool.db'}")
+
+    assert "max_overflow" not in memory_options
+    assert "pool_size" in file_options
+    assert "max_overflow" in file_options
+
+
+def test_reset_after_fork_keeps_engines_usable(tmp_path):
+    """After a fork reset the engine still opens fresh connections."""
+    registry = EngineRegistry()
+    engine = registry.get(f"sqlite:///{tmp_path / 'fork.db'}")
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+
+    registry.reset_after_fork()
+
+    assert registry.get(f"sqlite:///{tmp_path / 'fork.db'}") is engine
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT 1").scalar() == 1
+
+    registry.dispose()
@@ -0,0 +1,88 @@
+"""Tests for the streaming HTML minifier (TEMPLATE_HTML_MINIFY)."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from core.html_minify import HtmlMinifier, minify_html
+
+LEGACY = re.compile(
+    r"^\s+<(?!pre\b|code\b|samp\b|kbd\b|var\b|textarea\b|xmp\b|script\b|style\b|template\b)([^>]+>)",
+    re.MULTILINE,
+)
+
+PAGE = """<!DOCTYPE html>
+<html>
+    <head>
+
+        <title>Page</title>
+        <style>
+            body { margin: 0; }
+        </style>
+    </head>
+    <body>
+        <!--
+            <pre> in a comment is not a pre block
+        -->
+        <div class="card"
+             data-x="1">
+            text
+            <span>inline</span>
+        </div>
+        <pre>
+    <b>indented</b>
+        </pre>
+        <code>x</code>
+        <script>
+            if (a < b) {
+                <!-- not a comment -->
+            }
+        </script>
+        <textarea>
+  <i>raw</i>
+</TEXTAREA>
+        <p>end</p>
+    </body>
+</html>
+"""
+
+
+def test_matches_former_regex_outside_raw_regions():
+    """Well-formed markup without raw-text elements minifies as before."""
+    page = "<div>\n    <ul>\n\n      <li>a</li>\n      <li\n        class='b'>b</li>\n" \
+           "    </ul>\n  <code>c</code>\n  text <b>d</b>\n    <!-- e -->\n</div>\n"
+    assert minify_html(page) == LEGACY.sub(r"<\1", page)
+
+
+def test_raw_regions_are_kept():
+    """pre, script, style, textarea and comments are copied unchanged."""
+    result = minify_html(PAGE)
+
+    assert "\n<head>\n<title>Page</title>\n" in result
+    assert "        <style>\n            body { margin: 0; }\n        </style>\n</head>" in result
+    assert "<!--\n            <pre> in a comment is not a pre block\n        -->\n<div" in result
+    assert "\n             data-x=\"1\">\n            text\n<span>" in result
+    assert "        <pre>\n    <b>indented</b>\n        </pre>\n        <code>" in result
+    assert "                <!-- not a comment -->\n            }\n        </script>" in result
+    assert "<textarea>\n  <i>raw</i>\n</TEXTAREA>\n<p>end</p>" in result
+
+
+@pytest.mark.parametrize("size", [1, 3, 16, 17, 64, 4096])
+def test_chunked_output_equals_whole_document(size):
+    """feed() in chunks of any size gives the same output as one pass."""
+    minifier = HtmlMinifier()
+    out = [minifier.feed(PAGE[i:i + size]) for i in range(0, len(PAGE), size)]
+    out.append(minifier.close())
+
+    assert "".join(out) == minify_html(PAGE)
+
+
+def test_feed_releases_complete_lines():
+    """Finished lines are returned before the document ends."""
+    minifier = HtmlMinifier()
+    first = minifier.feed("<div>\n    <p>one</p>\n    <p>two</p>\n    <p>thr")
+
+    assert first.startswith("<div>\n<p>one</p>\n")
+    assert first + minifier.close() == "<div>\n<p>one</p>\n<p>two</p>\n<p>thr"
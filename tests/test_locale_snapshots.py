@@ -0,0 +1,39 @@
+"""Tests for the per-language translation tables of the render schema."""
+
+from __future__ import annotations
+
+import json
+
+from core.schema import Schema
+
+
+def test_request_carries_only_its_language(flask_app):
+    """The render schema keeps the chosen and the default language only."""
+    base = flask_app.components.base_schema
+    languages = base["data"]["current"]["site"]["languages"]
+    default = languages[0]
+    other = next(code for code in languages[1:] if code in base["inherit"]["locale"]["trans"])
+
+    with flask_app.test_request_context(f"/?lang={other}") as ctx:
+        schema = Schema(ctx.request)
+
+    trans = schema.properties["inherit"]["locale"]["trans"]
+    assert schema.properties["inherit"]["locale"]["current"] == other
+    assert set(trans) == {other, default}
+    assert trans[other] == base["inherit"]["locale"]["trans"][other]
+    assert len(json.dumps(schema.properties)) < len(json.dumps(base))
+
+
+def test_default_language_and_base_are_untouched(flask_app):
+    """The default language needs one table and the shared base keeps all."""
+    base = flask_app.components.base_schema
+    languages = base["data"]["current"]["site"]["languages"]
+
+    with flask_app.test_request_context(f"/?lang={languages[0]}") as ctx:
+        schema = Schema(ctx.request)
+        schema.properties["inherit"]["locale"]["trans"][languages[0]]["x"] = "y"
+
+    assert set(schema.properties["inherit"]["locale"]["trans"]) == {languages[0]}
+    assert "x" not in base["inherit"]["locale"]["trans"][languages[0]]
+    assert len(base["inherit"]["locale"]["trans"]) > 2
+    assert set(flask_app.components.locale_trans) == set(languages)
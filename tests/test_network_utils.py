@@ -1,6 +1,14 @@
 """Unit tests for network utility functions."""
 
-from utils.network import normalize_host, is_allowed_host
+from utils.network import (
+    ANY_ADDRESS,
+    HostMatcher,
+    IpMatcher,
+    get_host_matcher,
+    get_ip_matcher,
+    is_allowed_host,
+    normalize_host,
+)
 
 
 def test_normalize_host():
@@ -27,3 +35,61 @@ def test_is_allowed_host():
     assert is_allowed_host("localhost", ["*"]) is True
     assert is_allowed_host("any.thing", ["*"]) is True
     assert is_allowed_host("anything", []) is False
+
+
+def test_host_matcher_agrees_with_is_allowed_host():
+    """Exact hosts, wildcards and "*" give the same verdicts as is_allowed_host."""
+    allowed = ["LocalHost", "*.example.com", "other.org.", "api-?.test", "", None]
+    matcher = HostMatcher(allowed)
+    hosts = [
+        "localhost", "test.example.com", "example.com", "other.org", "api-1.test",
+        "api-10.test", "malicious.com", "", "a.b.example.com",
+    ]
+
+    assert matcher.exact == {"localhost", "other.org"}
+    for host in hosts:
+        assert matcher.is_allowed(host) is is_allowed_host(host, allowed), host
+    assert HostMatcher(["*"]).is_allowed("any.thing") is True
+    assert HostMatcher([]).is_allowed("anything") is False
+
+
+def test_host_matcher_normalizes_raw_host():
+    """Port, brackets and trailing dot are removed before the check; verdicts are cached."""
+    matcher = get_host_matcher(["localhost", "::1", "*.example.com"])
+
+    assert matcher.contains("localhost:5000") is True
+    assert matcher.contains("[::1]:5000") is True
+    assert matcher.contains("www.example.com.") is True
+    assert matcher.contains("evil.com:80") is False
+    assert set(matcher._cache) == {  # pylint: disable=protected-access
+        "localhost:5000", "[::1]:5000", "www.example.com.", "evil.com:80",
+    }
+    assert get_host_matcher(["localhost", "::1", "*.example.com"]) is matcher
+
+
+def test_ip_matcher_ranges():
+    """CIDRs and single IPs of both versions; invalid entries are ignored."""
+    matcher = IpMatcher(["10.0.0.0/8", " 192.168.1.7 ", "10.1.0.0/16", "2001:db8::/32", "bad", ""])
+
+    assert matcher.contains("10.255.255.255") is True
+    assert matcher.contains("11.0.0.0") is False
+    assert matcher.contains("192.168.1.7") is True
+    assert matcher.contains("192.168.1.8") is False
+    assert matcher.contains("2001:db8::1") is True
+    assert matcher.contains("2001:db9::1") is False
+    assert matcher.contains("::ffff:10.0.0.1") is False
+    assert matcher.contains("not-an-ip") is False
+    assert matcher.contains(None) is False
+    assert not IpMatcher(["bad", None])
+    assert IpMatcher(ANY_ADDRESS).contains("8.8.8.8") is True
+
+
+def test_ip_matcher_cache_and_reuse():
+    """Recent addresses are cached up to max_cache; equal lists share a matcher."""
+    matcher = IpMatcher(["127.0.0.1"], max_cache=2)
+    for address in ("127.0.0.1", "127.0.0.2", "127.0.0.1", "127.0.0.3"):
+        matcher.contains(address)
+
+    assert list(matcher._cache) == ["127.0.0.1", "127.0.0.3"]  # pylint: disable=protected-access
+    assert get_ip_matcher(["10.0.0.0/8"]) is get_ip_matcher(["10.0.0.0/8"])
+    assert get_ip_matcher(["10.0.0.0/8"]) is not get_ip_matcher(["10.0.0.0/16"])
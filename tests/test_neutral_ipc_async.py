@@ -0,0 +1,68 @@
+"""Tests for the asyncio Neutral IPC client."""
+
+from __future__ import annotations
+
+import asyncio
+
+from neutral_ipc_template import AsyncNeutralIpcTemplate
+from neutral_ipc_template import neutral_ipc_async
+from neutral_ipc_template.neutral_ipc_async import AsyncNeutralIpcPool
+from neutral_ipc_template.neutral_ipc_balancer import NeutralIpcBalancer
+from neutral_ipc_template.neutral_ipc_pool import NeutralIpcPool
+from neutral_ipc_template.neutral_ipc_template import NeutralIpcRecord
+
+
+def _use_pool(monkeypatch, address, max_size=4):
+    pools = []
+
+    def get_pool(endpoint_address):
+        assert endpoint_address == address
+        if not pools:
+            pools.append(AsyncNeutralIpcPool(address, timeout=5, max_size=max_size, max_idle=30))
+        return pools[0]
+
+    balancer = NeutralIpcBalancer([NeutralIpcPool(address, timeout=5, max_size=0, max_idle=30)])
+    monkeypatch.setattr(neutral_ipc_async, "get_balancer", lambda: balancer)
+    monkeypatch.setattr(neutral_ipc_async, "get_async_pool", get_pool)
+    return pools
+
+
+def _template(source):
+    return AsyncNeutralIpcTemplate(source, {"data": {}}, NeutralIpcRecord.CONTENT_TEXT)
+
+
+def test_concurrent_renders_share_pooled_connections(monkeypatch, ipc_server):
+    """Renders run concurrently and later ones reuse the pooled connections."""
+    _use_pool(monkeypatch, ipc_server.address)
+
+    async def run():
+        first = await asyncio.gather(*(_template(f"t{i}").render() for i in range(4)))
+        second = await asyncio.gather(*(_template(f"u{i}").render() for i in range(4)))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == [f"30:t{i}" for i in range(4)]
+    assert second == [f"30:u{i}" for i in range(4)]
+    assert ipc_server.accepted == 4
+    assert len(ipc_server.records) == 8
+
+
+def test_result_accessors_and_closed_connections(monkeypatch, ipc_server_factory):
+    """Status getters work and connections closed by the server are replaced."""
+    server = ipc_server_factory(close_after_response=True)
+    _use_pool(monkeypatch, server.address)
+
+    async def run():
+        tpl = _template("a")
+        content = await tpl.render()
+        await asyncio.sleep(0.05)
+        return content, tpl, await _template("b").render()
+
+    content, tpl, other = asyncio.run(run())
+
+    assert content == "30:a"
+    assert other == "30:b"
+    assert tpl.get_status_code() == "200"
+    assert not tpl.has_error()
+    assert server.accepted == 2
@@ -0,0 +1,124 @@
+"""Tests for load balancing across Neutral IPC endpoints."""
+
+from __future__ import annotations
+
+import pytest
+
+from neutral_ipc_template import neutral_ipc_template as ipc
+from neutral_ipc_template.neutral_ipc_balancer import NeutralIpcBalancer
+from neutral_ipc_template.neutral_ipc_config import NeutralIpcConfig, parse_endpoint
+from neutral_ipc_template.neutral_ipc_pool import NeutralIpcPool
+
+
+class _FakePool:
+    """Pool stand-in for selection tests, no connections."""
+
+    def __init__(self, address):
+        self.address = address
+        self.closed = 0
+
+    def close(self):
+        """Count idle-connection flushes."""
+        self.closed += 1
+
+
+def _balancer(addresses, **kwargs):
+    pools = [NeutralIpcPool(address, timeout=5, max_size=4, max_idle=30) for address in addresses]
+    return NeutralIpcBalancer(pools, **kwargs)
+
+
+def _render(monkeypatch, balancer, source="hello"):
+    monkeypatch.setattr(ipc, "get_balancer", lambda: balancer)
+    tpl = ipc.NeutralIpcTemplate(source, {"data": {}}, ipc.NeutralIpcRecord.CONTENT_TEXT)
+    return tpl.render()
+
+
+def test_renders_are_spread_across_endpoints(monkeypatch, ipc_server_factory):
+    """Idle endpoints share sequential renders and keep their own connections."""
+    servers = [ipc_server_factory(), ipc_server_factory()]
+    balancer = _balancer([server.address for server in servers])
+
+    for i in range(6):
+        assert _render(monkeypatch, balancer, f"r{i}") == f"30:r{i}"
+
+    assert [len(server.records) for server in servers] == [3, 3]
+    assert [server.accepted for server in servers] == [1, 1]
+    assert [row["requests"] for row in balancer.stats()] == [3, 3]
+    assert all(row["latency_ms"] > 0 and row["outstanding"] == 0 for row in balancer.stats())
+
+
+def test_failing_endpoint_fails_over_and_is_ejected(monkeypatch, ipc_server_factory):
+    """Renders succeed on the live endpoint and the dead one is skipped after max_failures."""
+    dead, live = ipc_server_factory(), ipc_server_factory()
+    dead.close()
+    balancer = _balancer([dead.address, live.address], max_failures=2, cooldown=60)
+
+    for i in range(6):
+        assert _render(monkeypatch, balancer, f"r{i}") == f"30:r{i}"
+
+    dead_stats, live_stats = balancer.stats()
+    assert dead_stats["failures"] == 2
+    assert dead_stats["ejected"] and dead_stats["ejections"] == 1
+    assert live_stats["requests"] == 6 and live_stats["failures"] == 0
+
+
+def test_all_endpoints_down_raises(monkeypatch, ipc_server_factory):
+    """Every endpoint is tried once, then the error reaches the caller."""
+    servers = [ipc_server_factory(), ipc_server_factory()]
+    for server in servers:
+        server.close()
+    balancer = _balancer([server.address for server in servers])
+
+    with pytest.raises(OSError):
+        _render(monkeypatch, balancer)
+    assert [row["failures"] for row in balancer.stats()] == [1, 1]
+
+
+def test_least_outstanding_and_cooldown_probe():
+    """In-flight renders steer selection; with all ejected the earliest cooldown is probed."""
+    pools = [_FakePool(("10.0.0.1", 1)), _FakePool(("10.0.0.2", 1))]
+    balancer = NeutralIpcBalancer(pools, max_failures=1, cooldown=60)
+
+    first, second = balancer.acquire(), balancer.acquire()
+    assert first is not second
+    assert balancer.acquire(exclude=[first, second]) is None
+
+    balancer.release(first, 0.01, ok=False)
+    balancer.release(second, 0.01, ok=False)
+    assert [pool.closed for pool in pools] == [1, 1]
+    first.ejected_until -= 30
+
+    assert balancer.acquire() is first
+
+
+def test_latency_strategy_prefers_faster_endpoint():
+    """Unsampled endpoints are probed first, then the faster one gets the work."""
+    fast, slow = _FakePool("/run/fast.sock"), _FakePool("/run/slow.sock")
+    balancer = NeutralIpcBalancer([fast, slow], strategy="latency")
+
+    seen = {balancer.acquire().address, balancer.acquire().address}
+    assert seen == {fast.address, slow.address}
+    for endpoint in balancer.endpoints:
+        balancer.release(endpoint, 0.001 if endpoint.pool is fast else 0.02)
+
+    picks = []
+    for _ in range(4):
+        endpoint = balancer.acquire()
+        picks.append(endpoint.address)
+        balancer.release(endpoint, 0.001 if endpoint.pool is fast else 0.02)
+    assert picks == [fast.address] * 4
+
+
+def test_endpoints_setting():
+    """Entries parse to (host, port) or socket paths; an invalid list is ignored."""
+    assert parse_endpoint("127.0.0.1:4273") == ("127.0.0.1", 4273)
+    assert parse_endpoint("[::1]:4274") == ("::1", 4274)
+    assert parse_endpoint("/run/neutral.sock") == "/run/neutral.sock"
+
+    config = {"endpoints": ["10.0.0.1:4273", "/run/neutral.sock"], "balance": "latency"}
+    assert NeutralIpcConfig.get_config_value(config, "endpoints", []) == [
+        ("10.0.0.1", 4273), "/run/neutral.sock",
+    ]
+    assert NeutralIpcConfig.get_config_value(config, "balance", "x") == "latency"
+    assert NeutralIpcConfig.get_config_value({"endpoints": ["nohost"]}, "endpoints", []) == []
+    assert NeutralIpcConfig.get_config_value({"balance": "random"}, "balance", "x") == "x"
@@ -0,0 +1,183 @@
+"""Tests for the binary (content-format 40) schema transport."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from core import template as template_module
+from neutral_ipc_template import neutral_ipc_binary as binary
+from neutral_ipc_template import neutral_ipc_config as ipc_config
+from neutral_ipc_template import neutral_ipc_template as ipc
+from neutral_ipc_template.neutral_ipc_balancer import NeutralIpcBalancer
+from neutral_ipc_template.neutral_ipc_pool import NeutralIpcPool
+
+SCHEMA = {
+    "config": {"cache_prefix": "neutral-cache", "filter_all": False},
+    "inherit": {"locale": {"current": "es", "trans": {"es": {"Hola": "Hola"}}}},
+    "data": {
+        "title": "ñandú " * 40,
+        "count": 3,
+        "ratio": 0.25,
+        "negative": -70000,
+        "big": 2**40,
+        "items": list(range(20)),
+        "empty": None,
+        "flags": [True, False],
+        "wide": {f"k{i}": i for i in range(20)},
+    },
+}
+
+
+def test_roundtrip_matches_json():
+    """Decoding gives back what JSON would, for every supported type."""
+    assert binary.loads(binary.dumps(SCHEMA)) == json.loads(json.dumps(SCHEMA))
+
+
+def test_messagepack_layout():
+    """Small values use the MessagePack fix formats."""
+    assert binary.dumps({"a": [1, -1, None, True]}) == b"\x81\xa1a\x94\x01\xff\xc0\xc3"
+    assert binary.dumps("x" * 40) == b"\xd9\x28" + b"x" * 40
+    assert binary.dumps(300) == b"\xcd\x01\x2c"
+    assert binary.dumps(1.5) == b"\xcb\x3f\xf8" + b"\x00" * 6
+
+
+@pytest.mark.parametrize("value", [{1: "a"}, b"bytes", {"a": {1, 2}}, 2**64])
+def test_unsupported_values_raise(value):
+    """Values JSON would reject (or that do not fit) are refused."""
+    with pytest.raises((TypeError, OverflowError)):
+        binary.dumps(value)
+
+
+@pytest.mark.parametrize("data", [b"\x92\x01", b"\xa5abc", b"\x01\x02", b"\xc1", b"\x81\x01\x02"])
+def test_malformed_content_raises(data):
+    """Truncated, trailing, unknown and non-string-key content is an error."""
+    with pytest.raises(binary.BinaryDecodeError):
+        binary.loads(data)
+
+
+def _balancer(address):
+    return NeutralIpcBalancer([NeutralIpcPool(address, timeout=5, max_size=4, max_idle=30)])
+
+
+def _render(monkeypatch, balancer, schema):
+    monkeypatch.setattr(ipc, "get_balancer", lambda: balancer)
+    tpl = ipc.NeutralIpcTemplate("hello", schema, ipc.NeutralIpcRecord.CONTENT_TEXT)
+    return tpl.render(), tpl
+
+
+def test_binary_schema_is_used_when_accepted(monkeypatch, ipc_server_factory):
+    """An object schema is sent as CONTENT_BIN and the binary result decoded."""
+    server = ipc_server_factory(accept_binary=True)
+    balancer = _balancer(server.address)
+    monkeypatch.setattr(ipc_config, "SCHEMA_FORMAT", "binary")
+
+    content, tpl = _render(monkeypatch, balancer, SCHEMA)
+
+    assert content == "30:hello"
+    assert tpl.get_status_code() == "200"
+    assert balancer.endpoints[0].binary_schema is True
+    assert server.records[0][1] == ipc.NeutralIpcRecord.CONTENT_BIN
+    assert server.schemas == [json.loads(json.dumps(SCHEMA))]
+
+
+def test_refused_binary_falls_back_to_json_once(monkeypatch, ipc_server):
+    """A server without binary support gets JSON, and the balancer remembers it."""
+    balancer = _balancer(ipc_server.address)
+    monkeypatch.setattr(ipc_config, "SCHEMA_FORMAT", "binary")
+
+    assert _render(monkeypatch, balancer, SCHEMA)[0] == "30:hello"
+    assert _render(monkeypatch, balancer, SCHEMA)[0] == "30:hello"
+
+    assert balancer.endpoints[0].binary_schema is False
+    formats = [record[1] for record in ipc_server.records]
+    assert formats == [ipc.NeutralIpcRecord.CONTENT_BIN] + [ipc.NeutralIpcRecord.CONTENT_JSON] * 2
+    assert ipc_server.schemas[-1] == json.loads(json.dumps(SCHEMA))
+
+
+def test_binary_support_is_negotiated_per_endpoint(monkeypatch, ipc_server_factory):
+    """In a mixed fleet only the refusing server gets JSON."""
+    accepting = ipc_server_factory(accept_binary=True)
+    refusing = ipc_server_factory()
+    balancer = NeutralIpcBalancer([
+        NeutralIpcPool(server.address, timeout=5, max_size=4, max_idle=30)
+        for server in (accepting, refusing)
+    ])
+    monkeypatch.setattr(ipc_config, "SCHEMA_FORMAT", "binary")
+
+    for _ in range(4):
+        assert _render(monkeypatch, balancer, SCHEMA)[0] == "30:hello"
+
+    assert [endpoint.binary_schema for endpoint in balancer.endpoints] == [True, False]
+    assert not balancer.binary_refused()
+    assert {record[1] for record in accepting.records} == {ipc.NeutralIpcRecord.CONTENT_BIN}
+    assert [record[1] for record in refusing.records] == [
+        ipc.NeutralIpcRecord.CONTENT_BIN,
+        ipc.NeutralIpcRecord.CONTENT_JSON,
+        ipc.NeutralIpcRecord.CONTENT_JSON,
+    ]
+
+
+def test_template_error_keeps_binary_and_renders_once(monkeypatch, ipc_server_factory):
+    """A KO answered in binary is a template error, not a refusal of the format."""
+    server = ipc_server_factory(accept_binary=True)
+    balancer = _balancer(server.address)
+    monkeypatch.setattr(ipc_config, "SCHEMA_FORMAT", "binary")
+    monkeypatch.setattr(ipc, "get_balancer", lambda: balancer)
+
+    tpl = ipc.NeutralIpcTemplate("fail", SCHEMA, ipc.NeutralIpcRecord.CONTENT_TEXT)
+    tpl.render()
+    assert tpl.has_error() and tpl.get_status_code() == "500"
+    assert balancer.endpoints[0].binary_schema is True
+    assert len(server.records) == 1
+
+    assert _render(monkeypatch, balancer, SCHEMA)[0] == "30:hello"
+    assert [record[1] for record in server.records] == [ipc.NeutralIpcRecord.CONTENT_BIN] * 2
+
+
+@pytest.mark.parametrize("schema_format", ["json", "binary"])
+def test_schema_is_serialized_at_construction(monkeypatch, ipc_server_factory, schema_format):
+    """Changing the caller's object after construction does not change what is sent."""
+    server = ipc_server_factory(accept_binary=True)
+    balancer = _balancer(server.address)
+    monkeypatch.setattr(ipc_config, "SCHEMA_FORMAT", schema_format)
+    monkeypatch.setattr(ipc, "get_balancer", lambda: balancer)
+    schema = json.loads(json.dumps(SCHEMA))
+
+    tpl = ipc.NeutralIpcTemplate("hello", schema, ipc.NeutralIpcRecord.CONTENT_TEXT)
+    schema["data"]["count"] = 99
+    tpl.render()
+
+    assert server.schemas[0]["data"]["count"] == 3
+
+
+def test_text_schema_and_json_setting_stay_json(monkeypatch, ipc_server_factory):
+    """JSON text schemas, and the default setting, never use the binary format."""
+    server = ipc_server_factory(accept_binary=True)
+    balancer = _balancer(server.address)
+
+    _render(monkeypatch, balancer, SCHEMA)
+    monkeypatch.setattr(ipc_config, "SCHEMA_FORMAT", "binary")
+    _, tpl = _render(monkeypatch, balancer, json.dumps(SCHEMA))
+    tpl.merge_schema({"data": {"count": 4}})
+    tpl.render()
+
+    assert all(record[1] == ipc.NeutralIpcRecord.CONTENT_JSON for record in server.records[:2])
+    assert server.records[2][1] == ipc.NeutralIpcRecord.CONTENT_BIN
+    assert server.schemas[-1]["data"]["count"] == 4
+    assert balancer.endpoints[0].binary_schema is True
+
+
+def test_app_template_passes_the_schema_object_for_binary(flask_app, monkeypatch):
+    """Template hands the schema object to the IPC client instead of JSON text."""
+    schema = SimpleNamespace(properties={"data": {"title": "ñandú"}})
+    monkeypatch.setattr(template_module, "ipc_config", SimpleNamespace(SCHEMA_FORMAT="json"))
+
+    with flask_app.test_request_context():
+        tpl = template_module.Template(schema)
+        assert json.loads(tpl._render_schema()) == schema.properties  # pylint: disable=protected-access
+
+        monkeypatch.setattr(template_module.ipc_config, "SCHEMA_FORMAT", "binary")
+        assert tpl._render_schema() is schema.properties  # pylint: disable=protected-access
@@ -0,0 +1,93 @@
+"""Tests for the persistent Neutral IPC connection pool."""
+
+from __future__ import annotations
+
+import select
+
+import pytest
+
+from neutral_ipc_template import neutral_ipc_template as ipc
+from neutral_ipc_template.neutral_ipc_balancer import NeutralIpcBalancer
+from neutral_ipc_template.neutral_ipc_pool import NeutralIpcPool
+
+
+def _use_pool(monkeypatch, address, max_size=4, max_idle=30):
+    pool = NeutralIpcPool(address, timeout=5, max_size=max_size, max_idle=max_idle)
+    balancer = NeutralIpcBalancer([pool])
+    monkeypatch.setattr(ipc, "get_balancer", lambda: balancer)
+    return pool
+
+
+def _render(source="hello"):
+    tpl = ipc.NeutralIpcTemplate(source, {"data": {}}, ipc.NeutralIpcRecord.CONTENT_TEXT)
+    return tpl.render(), tpl
+
+
+def test_renders_reuse_one_connection(monkeypatch, ipc_server):
+    """Consecutive renders share a single TCP connection."""
+    _use_pool(monkeypatch, ipc_server.address)
+
+    for source in ("a", "b", "c"):
+        content, tpl = _render(source)
+        assert content == f"30:{source}"
+        assert tpl.get_status_code() == "200"
+
+    assert ipc_server.accepted == 1
+    assert len(ipc_server.records) == 3
+
+
+def test_server_closed_connection_is_replaced(monkeypatch, ipc_server_factory):
+    """A pooled connection closed by the server is detected and replaced."""
+    server = ipc_server_factory(close_after_response=True)
+    _use_pool(monkeypatch, server.address)
+    assert _render("a")[0] == "30:a"
+    assert _render("b")[0] == "30:b"
+    assert server.accepted == 2
+
+
+def test_health_probe_works_without_poll(monkeypatch, ipc_server):
+    """Without select.poll (Windows) connections are still reused; a failing probe drops them."""
+    monkeypatch.delattr(select, "poll", raising=False)
+    _use_pool(monkeypatch, ipc_server.address)
+    _render("a")
+    _render("b")
+    assert ipc_server.accepted == 1
+
+    def _broken(*_args):
+        raise AttributeError("no probe")
+
+    monkeypatch.setattr(select, "select", _broken)
+    assert _render("c")[0] == "30:c"
+    assert ipc_server.accepted == 2
+
+
+def test_idle_connections_expire_and_pooling_can_be_disabled(monkeypatch, ipc_server):
+    """max_idle=0 and max_size=0 both open a connection per render."""
+    pool = _use_pool(monkeypatch, ipc_server.address, max_idle=0)
+    _render()
+    _render()
+    assert ipc_server.accepted == 2
+
+    pool.close()
+    pool.max_idle, pool.max_size = 30, 0
+    _render()
+    _render()
+    assert ipc_server.accepted == 4
+    assert not pool._idle  # pylint: disable=protected-access
+
+
+def test_unix_domain_socket(monkeypatch, tmp_path, ipc_server_factory):
+    """The pool can talk to a server on a Unix domain socket."""
+    server = ipc_server_factory(str(tmp_path / "ipc.sock"))
+    _use_pool(monkeypatch, str(tmp_path / "ipc.sock"))
+    assert _render("uds")[0] == "30:uds"
+    assert _render("uds")[0] == "30:uds"
+    assert server.accepted == 1
+
+
+def test_connection_errors_are_raised(monkeypatch, ipc_server):
+    """Without a server the error reaches the caller instead of looping."""
+    ipc_server.close()
+    _use_pool(monkeypatch, ipc_server.address)
+    with pytest.raises(OSError):
+        _render()
@@ -0,0 +1,94 @@
+"""Tests for Neutral IPC record framing."""
+
+from __future__ import annotations
+
+import socket
+import struct
+import threading
+
+from neutral_ipc_template import neutral_ipc_config as ipc_config
+from neutral_ipc_template.neutral_ipc_template import (
+    NeutralIpcClient,
+    NeutralIpcRecord,
+    recv_exact,
+    send_parts,
+)
+
+
+class _SlowConn:
+    """sendmsg that accepts at most a few bytes per call."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.data = bytearray()
+
+    def sendmsg(self, buffers):
+        """Take up to limit bytes across buffers."""
+        taken = 0
+        for buffer in buffers:
+            chunk = bytes(buffer[: self.limit - taken])
+            self.data += chunk
+            taken += len(chunk)
+            if taken == self.limit:
+                break
+        return taken
+
+
+def test_parts_match_the_record_layout():
+    """Header lengths are byte lengths and text is encoded once as UTF-8."""
+    header, body1, body2 = NeutralIpcRecord.encode_parts(10, 10, '{"a": "ñ"}', 20, b"/tpl")
+
+    assert struct.unpack("!BBBIBI", header) == (0, 10, 10, len(body1), 20, 4)
+    assert body1 == '{"a": "ñ"}'.encode("utf-8")
+    assert NeutralIpcRecord.encode_record(10, 10, '{"a": "ñ"}', 20, "/tpl") == header + body1 + body2
+
+
+def test_partial_sendmsg_sends_everything_in_order():
+    """Partial scatter/gather writes continue where they stopped."""
+    parts = [b"header", b"", b"x" * 50, "é".encode("utf-8") * 10]
+    conn = _SlowConn(limit=7)
+
+    send_parts(conn, parts)
+
+    assert bytes(conn.data) == b"".join(parts)
+
+
+def test_recv_exact_reads_into_one_buffer():
+    """recv_exact collects a large payload and stops short at end of stream."""
+    left, right = socket.socketpair()
+    payload = bytes(range(256)) * 4096
+    writer = threading.Thread(target=lambda: (left.sendall(payload), left.close()))
+    writer.start()
+    try:
+        assert recv_exact(right, len(payload), 8192) == payload
+        assert recv_exact(right, 10) == b""
+    finally:
+        writer.join()
+        right.close()
+
+
+def test_content_is_read_with_the_configured_buffer_size(monkeypatch):
+    """The client reads in chunks of the buffer_size loaded from the config file."""
+    left, right = socket.socketpair()
+    monkeypatch.setattr(ipc_config, "BUFFER_SIZE", 16)
+    wanted = []
+    recv_into = right.recv_into
+
+    class _Conn:  # pylint: disable=too-few-public-methods
+        """Records the size asked for on each read."""
+
+        @staticmethod
+        def recv_into(view, size):
+            wanted.append(size)
+            return recv_into(view, size)
+
+    left.sendall(b"x" * 40)
+    try:
+        client = NeutralIpcClient(10, 10, "", 30, "")
+        content = client._read_content(_Conn(), 40, 30)  # pylint: disable=protected-access
+    finally:
+        left.close()
+        right.close()
+
+    assert content == "x" * 40
+    assert max(wanted) == 16
@@ -0,0 +1,109 @@
+"""Tests for the anonymous full-page cache."""
+
+from __future__ import annotations
+
+import re
+import sys
+
+import pytest
+
+from app import create_app
+from app.config import Config
+from core.dispatcher import Dispatcher
+from core.page_cache import CachedPage, PageCache
+
+
+class PageCacheConfig(Config):
+    """In-memory databases with the page cache enabled."""
+
+    TESTING = True
+    SECRET_KEY = "test_secret_key"
+    DB_PWA = "sqlite:///:memory:"
+    DB_SAFE = "sqlite:///:memory:"
+    DB_FILES = "sqlite:///:memory:"
+    MAIL_METHOD = "dummy"
+    PAGE_CACHE_MAX_BYTES = 1024 * 1024
+
+
+@pytest.fixture(name="cached_app")
+def fixture_cached_app():
+    """App without debug, so the page cache is active."""
+    app = create_app(PageCacheConfig, debug=False)
+    yield app
+    for module in list(sys.modules.keys()):
+        if module.startswith("component."):
+            del sys.modules[module]
+
+
+def _page(body, expires=100):
+    return CachedPage(200, body, [], {}, expires)
+
+
+def test_lru_respects_byte_budget_and_ttl():
+    """Old entries are evicted by size and expired ones are not served."""
+    cache = PageCache(max_bytes=10)
+    cache.put("a", _page("aaaa"))
+    cache.put("b", _page("bbbb"))
+    assert cache.get("a", now=0) is not None
+    cache.put("c", _page("cccc"))
+
+    assert cache.get("b", now=0) is None
+    assert cache.get("a", now=0) is not None
+    assert cache.bytes == 8
+    assert cache.get("c", now=100) is None
+    assert len(cache) == 1
+
+    cache.put("big", _page("x" * 11))
+    assert cache.get("big", now=0) is None
+
+
+def _nonce(response):
+    return re.search(r"'nonce-([^']+)'", response.headers["Content-Security-Policy"]).group(1)
+
+
+def test_hit_skips_dispatcher_and_refreshes_tokens(cached_app, monkeypatch):
+    """A hit does not build a Dispatcher and gets a fresh nonce and utoken."""
+    client = cached_app.test_client()
+    route = cached_app.blueprints["bp_cmp_7000_info"].url_prefix + "/help"
+    calls = []
+    original = Dispatcher.common
+    monkeypatch.setattr(Dispatcher, "common", lambda self: calls.append(1) or original(self))
+
+    # The first visit has no utoken cookie yet, which is a separate entry.
+    client.get(route)
+    first = client.get(route)
+    second = client.get(route)
+
+    assert first.status_code == second.status_code == 200
+    assert len(calls) == 2
+    assert len(cached_app.page_cache) == 2
+
+    first_nonce, second_nonce = _nonce(first), _nonce(second)
+    assert first_nonce != second_nonce
+    assert second_nonce in second.get_data(as_text=True)
+    assert first_nonce not in second.get_data(as_text=True)
+    assert "page-cache:" not in second.get_data(as_text=True)
+    # Same utoken, so the only difference with a fresh render is the nonce.
+    assert second.get_data(as_text=True) == first.get_data(as_text=True).replace(
+        first_nonce, second_nonce
+    )
+    cookies = " ".join(second.headers.getlist("Set-Cookie"))
+    assert Config.UTOKEN_KEY in cookies
+    assert Config.TAB_CHANGES_KEY in cookies
+
+
+def test_sessions_and_other_arguments_are_not_cached(cached_app):
+    """Requests with a session cookie or extra query arguments always render."""
+    client = cached_app.test_client()
+    route = cached_app.blueprints["bp_cmp_7000_info"].url_prefix + "/help"
+
+    client.set_cookie(Config.SESSION_KEY, "some-session")
+    client.get(route)
+    client.delete_cookie(Config.SESSION_KEY)
+    client.get(route + "?q=1")
+    assert len(cached_app.page_cache) == 0
+
+    languages = cached_app.components.base_schema["data"]["current"]["site"]["languages"]
+    client.get(f"{route}?{Config.LANG_KEY}={languages[0]}")
+    client.get(f"{route}?{Config.LANG_KEY}={languages[1]}")
+    assert len(cached_app.page_cache) == 2
@@ -0,0 +1,88 @@
+"""Tests for the preloaded SQL query catalog."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+from core.query_catalog import QueryCatalog
+
+
+def _write_model(model_dir, name, content, mtime=None):
+    path = model_dir / f"{name}.json"
+    path.write_text(json.dumps(content), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_resolves_dialect_aliases_and_operation_type(tmp_path):
+    """Dialect references are followed and the operation type is precomputed."""
+    _write_model(tmp_path, "demo", {
+        "get": {
+            "@portable": "SELECT 1",
+            "@mariadb": "@mysql",
+            "@mysql": "  select 2",
+        },
+        "setup": {"@portable": ["CREATE TABLE t (id INT)", "INSERT INTO t VALUES (1)"]},
+    })
+    catalog = QueryCatalog(str(tmp_path))
+
+    portable = catalog.get("demo", "get", "sqlite")
+    mariadb = catalog.get("demo", "get", "mariadb")
+    setup = catalog.get("demo", "setup", "sqlite")
+
+    assert portable.statements[0].sql == "SELECT 1"
+    assert mariadb.statements[0].sql == "  select 2"
+    assert mariadb.statements[0].operation == "SELECT"
+    assert setup.transaction is True
+    assert [s.operation for s in setup.statements] == [None, "INSERT"]
+    assert catalog.get("demo", "missing", "sqlite") is None
+    assert catalog.get("demo", "get", "sqlite") is portable
+
+
+def test_invalid_definition_raises_type_error(tmp_path):
+    """Definitions that are neither strings nor lists are reported."""
+    _write_model(tmp_path, "demo", {"bad": {"@portable": {"nested": True}}})
+    catalog = QueryCatalog(str(tmp_path))
+
+    with pytest.raises(TypeError):
+        catalog.get("demo", "bad", "sqlite")
+
+
+def test_hot_reload_follows_mtime(tmp_path):
+    """Changed files are only picked up when hot reload is enabled."""
+    _write_model(tmp_path, "demo", {"get": {"@portable": "SELECT 1"}}, mtime=1_000_000)
+    cold = QueryCatalog(str(tmp_path), hot_reload=False)
+    hot = QueryCatalog(str(tmp_path), hot_reload=True)
+    assert cold.get("demo", "get", "sqlite").statements[0].sql == "SELECT 1"
+    assert hot.get("demo", "get", "sqlite").statements[0].sql == "SELECT 1"
+
+    _write_model(tmp_path, "demo", {"get": {"@portable": "SELECT 2"}}, mtime=2_000_000)
+
+    assert cold.get("demo", "get", "sqlite").statements[0].sql == "SELECT 1"
+    assert hot.get("demo", "get", "sqlite").statements[0].sql == "SELECT 2"
+
+
+def test_missing_file_raises_file_not_found(tmp_path):
+    """Missing model files surface as FileNotFoundError for Model.exec to map."""
+    catalog = QueryCatalog(str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        catalog.get("nope", "get", "sqlite")
+
+
+def test_in_parameter_expands_a_list(tmp_path):
+    """`IN :name` takes a list and renders one placeholder per item."""
+    _write_model(tmp_path, "demo", {
+        "pick": {"@portable": "SELECT value FROM (SELECT 1 AS value UNION SELECT 2 UNION SELECT 3) WHERE value IN :values ORDER BY value"},
+    })
+    statement = QueryCatalog(str(tmp_path)).get("demo", "pick", "sqlite").statements[0]
+
+    with create_engine("sqlite://").connect() as conn:
+        rows = conn.execute(statement.clause, {"values": [1, 3]}).all()
+
+    assert [row[0] for row in rows] == [1, 3]
@@ -0,0 +1,106 @@
+"""Tests for the data retention sweeper."""
+
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from app.config import Config
+from core.engine import get_engine
+from core.model import Model
+from core.retention import POLICIES, RetentionSweeper, format_report
+
+NOW = 1_000_000
+
+
+def _databases(tmp_path):
+    pwa = f"sqlite:///{tmp_path / 'pwa.db'}"
+    safe = f"sqlite:///{tmp_path / 'safe.db'}"
+    pwa_model = Model(pwa, "sqlite")
+    pwa_model.exec("app", "setup-base")
+    pwa_model.exec("user", "setup-base")
+    Model(safe, "sqlite").exec("session", "setup-base")
+    return {"pwa": (pwa, "sqlite"), "safe": (safe, "sqlite")}
+
+
+def _insert(db_url, sql, rows):
+    with get_engine(db_url).begin() as conn:
+        conn.execute(text(sql), rows)
+
+
+def _count(db_url, table):
+    with get_engine(db_url).connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def test_sweep_purges_only_rows_past_retention(tmp_path):
+    """Expired/closed sessions, expired PINs and orphan uids go; live rows stay."""
+    databases = _databases(tmp_path)
+    pwa, safe = databases["pwa"][0], databases["safe"][0]
+    opened, closed = Config.SESSION_OPEN["true"], Config.SESSION_OPEN["false"]
+
+    _insert(safe, (
+        "INSERT INTO session (sessionId, open, userId, ua, properties, modified, created, expire)"
+        " VALUES (:sid, :open, 'u', 'ua', '{}', :modified, 0, :expire)"
+    ), [
+        {"sid": f"expired{i}", "open": opened, "modified": 0, "expire": NOW - 1} for i in range(7)
+    ] + [
+        {"sid": "live", "open": opened, "modified": NOW, "expire": NOW + 100},
+        {"sid": "closed-old", "open": closed, "modified": NOW - 90000, "expire": NOW + 100},
+        {"sid": "closed-new", "open": closed, "modified": NOW - 10, "expire": NOW + 100},
+    ])
+    _insert(pwa, (
+        "INSERT INTO user (userId, login, password, birthdate, lasttime, created, modified)"
+        " VALUES ('111', 'login', 'x', 'x', 0, 0, 0)"
+    ), {})
+    _insert(pwa, (
+        "INSERT INTO pin (target, userId, pin, token, created, expires)"
+        " VALUES (:target, '111', '1', :token, 0, :expires)"
+    ), [
+        {"target": "old", "token": "t1", "expires": NOW - 1},
+        {"target": "new", "token": "t2", "expires": NOW + 1},
+    ])
+    _insert(pwa, "INSERT INTO uid (uid, target, created) VALUES (:uid, :target, :created)", [
+        {"uid": "111", "target": "user", "created": 0},
+        {"uid": "222", "target": "user", "created": 0},
+        {"uid": "333", "target": "user", "created": NOW},
+        {"uid": "444", "target": "other", "created": 0},
+    ])
+
+    sweeper = RetentionSweeper(databases, batch_size=3, max_batches=10)
+    reports = {report["policy"]: report for report in sweeper.sweep(NOW)}
+
+    assert reports["session-expired"]["deleted"] == 7
+    assert reports["session-expired"]["batches"] == 3
+    assert reports["session-closed"]["deleted"] == 1
+    assert reports["pin-expired"]["deleted"] == 1
+    assert reports["uid-orphan"]["deleted"] == 1
+    assert all(report["error"] is None for report in reports.values())
+    assert _count(safe, "session") == 2
+    assert _count(pwa, "pin") == 1
+    assert _count(pwa, "uid") == 3
+    assert "session-expired: 7 rows removed in 3 batches" in format_report(list(reports.values()))
+
+
+def test_max_batches_bounds_a_sweep(tmp_path):
+    """A sweep stops after max_batches and leaves the rest for the next run."""
+    databases = _databases(tmp_path)
+    safe = databases["safe"][0]
+    _insert(safe, (
+        "INSERT INTO session_change (sessionId, changed) VALUES (:sid, :changed)"
+    ), [{"sid": str(i), "changed": i} for i in range(10)])
+
+    policies = tuple(policy for policy in POLICIES if policy.name == "session-change")
+    report = RetentionSweeper(databases, batch_size=2, max_batches=2, policies=policies).sweep(NOW)[0]
+
+    assert report["deleted"] == 4
+    assert _count(safe, "session_change") == 6
+
+
+def test_failed_policy_reports_error(tmp_path):
+    """A database error stops that policy and is reported."""
+    safe = f"sqlite:///{tmp_path / 'empty.db'}"
+    policies = tuple(policy for policy in POLICIES if policy.database == "safe")
+    reports = RetentionSweeper({"safe": (safe, "sqlite")}, policies=policies).sweep(NOW)
+
+    assert reports and all(report["error"] for report in reports)
+    assert all(report["deleted"] == 0 for report in reports)
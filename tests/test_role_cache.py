@@ -0,0 +1,71 @@
+"""Tests for the versioned role cache."""
+
+from __future__ import annotations
+
+from sqlalchemy import event, text
+
+from core.engine import get_engine
+from core.model import Model
+from core.role_cache import RoleCache
+from core.user import User
+
+
+def _user(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'pwa.db'}"
+    Model(db_url, "sqlite").exec("user", "setup-base")
+    with get_engine(db_url).begin() as conn:
+        conn.execute(text(
+            "INSERT INTO user (userId, login, password, birthdate, lasttime, created, modified)"
+            " VALUES ('42', 'login', 'x', 'x', 0, 0, 0)"
+        ))
+    user = User(db_url, "sqlite")
+    user.role_cache = RoleCache(max_entries=10)
+    return user
+
+
+def _count_role_joins(engine, calls):
+    def _record(_conn, _cursor, statement, *_args):
+        if "INNER JOIN user_role" in statement:
+            calls.append(statement)
+    event.listen(engine, "before_cursor_execute", _record)
+    return _record
+
+
+def test_roles_are_reused_until_the_version_changes(tmp_path):
+    """The JOIN runs once per version; assign/remove bump it."""
+    user = _user(tmp_path)
+    calls = []
+    listener = _count_role_joins(user.model.engine, calls)
+    try:
+        assert user.get_roles("42") == []
+        assert user.get_roles("42") == []
+        assert len(calls) == 1
+
+        assert user.assign_role("42", "editor")
+        assert user.get_roles("42") == ["editor"]
+        assert user.get_roles("42") == ["editor"]
+        assert len(calls) == 2
+
+        # A change made by another worker is seen through the version.
+        other = User(user.model.engine.url.render_as_string(), "sqlite")
+        other.role_cache = RoleCache(max_entries=10)
+        assert other.assign_role("42", "admin")
+        assert user.get_roles("42") == ["admin", "editor"]
+
+        assert user.remove_role("42", "admin")
+        assert user.get_roles("42") == ["editor"]
+    finally:
+        event.remove(user.model.engine, "before_cursor_execute", listener)
+
+
+def test_delete_user_invalidates_cached_roles(tmp_path):
+    """Deleting a user bumps the version so the roles are read again."""
+    user = _user(tmp_path)
+    assert user.assign_role("42", "admin")
+    assert user.get_roles("42") == ["admin"]
+    version = user._get_role_version("42")  # pylint: disable=protected-access
+
+    assert user.delete_user("42")
+
+    assert user._get_role_version("42") == version + 1  # pylint: disable=protected-access
+    assert user.role_cache.get("42", version + 1) is None
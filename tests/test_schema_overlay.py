@@ -0,0 +1,99 @@
+"""Tests for the copy-on-write request schema."""
+
+from __future__ import annotations
+
+import copy
+import json
+
+import pytest
+
+from core.schema import Schema
+from core.schema_overlay import FrozenDict, OverlayDict, SchemaEncoder, freeze
+from utils.utils import merge_dict
+
+
+BASE = {
+    "config": {"cache_prefix": "neutral"},
+    "data": {"CONTEXT": {"GET": {}}, "menu": ["home", {"name": "docs"}], "n": 1},
+    "inherit": {"data": {"theme": "light"}},
+}
+
+
+def test_request_writes_do_not_reach_the_base():
+    """Nested writes, merges and list edits stay in the request copy."""
+    base = freeze(BASE)
+    first = OverlayDict(base)
+
+    first["data"]["CONTEXT"]["GET"]["q"] = "x"
+    first["data"]["menu"].append("extra")
+    first["config"]["cache_prefix"] += "-ipc"
+    merge_dict(first, {"inherit": {"data": {"theme": "dark"}}})
+
+    assert base == BASE
+    second = OverlayDict(base)
+    assert second["data"]["CONTEXT"]["GET"] == {}
+    assert second["inherit"]["data"]["theme"] == "light"
+    assert first["inherit"]["data"]["theme"] == "dark"
+
+
+def test_serializes_like_a_deep_copy():
+    """json.dumps sees the same document as the previous deepcopy did."""
+    overlay = OverlayDict(freeze(BASE))
+    plain = copy.deepcopy(BASE)
+    for schema in (overlay, plain):
+        schema["data"]["CONTEXT"]["GET"]["q"] = "x"
+        schema["data"]["n"] = 2
+
+    assert json.dumps(overlay) == json.dumps(plain)
+    assert copy.deepcopy(overlay) == plain
+    assert isinstance(overlay["data"], dict)
+
+
+def test_base_is_read_only():
+    """Branches reached without [] are still frozen and refuse writes."""
+    overlay = OverlayDict(freeze(BASE))
+    shared = dict.__getitem__(overlay, "inherit")
+    assert isinstance(shared, FrozenDict)
+    with pytest.raises(TypeError):
+        shared["data"] = {}
+    with pytest.raises(TypeError):
+        next(iter(overlay.values())).update({"x": 1})
+
+
+def test_request_schema_is_an_overlay(flask_app):
+    """Two requests share the base but not their modifications."""
+    with flask_app.test_request_context("/?a=1") as ctx:
+        first = Schema(ctx.request)
+    with flask_app.test_request_context("/") as ctx:
+        second = Schema(ctx.request)
+
+    assert isinstance(first.properties, OverlayDict)
+    assert first.data["CONTEXT"]["GET"] == {"a": "1"}
+    assert second.data["CONTEXT"]["GET"] == {}
+    assert "a" not in flask_app.components.base_schema["data"]["CONTEXT"]["GET"]
+
+
+def test_encoder_matches_json_dumps():
+    """Spliced fragments give the same bytes as a plain json.dumps."""
+    encoder = SchemaEncoder()
+    base = freeze({**BASE, "empty": {}, "text": {"ü": "ñ ", "n": 1.5, "x": None}})
+    for _ in range(2):
+        overlay = OverlayDict(base)
+        overlay["data"]["CONTEXT"]["GET"]["q"] = "x"
+        overlay["data"]["menu"].append({"name": "é"})
+        assert overlay["inherit"]["data"]["theme"] == "light"
+        assert overlay["empty"] == {}
+        overlay["data"]["extra"] = {1: "int key", "nested": [1, {"a": True}]}
+        assert encoder.dumps(overlay) == json.dumps(overlay)
+
+    assert encoder.fragment(base["config"]) == json.dumps(BASE["config"])
+
+
+def test_request_schema_encodes_like_json_dumps(flask_app):
+    """A real request schema serializes byte-identically."""
+    with flask_app.test_request_context("/?lang=es&theme=x", headers={"Cookie": "a=b"}) as ctx:
+        schema = Schema(ctx.request)
+        schema.data["dispatch_result"] = True
+        encoded = flask_app.components.schema_json.dumps(schema.properties)
+
+    assert encoded == json.dumps(schema.properties)
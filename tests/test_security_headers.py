@@ -0,0 +1,64 @@
+"""Tests for the precomputed security headers."""
+
+from __future__ import annotations
+
+from flask import Flask, Response, g
+
+from app import SecurityHeaders
+from app.config import Config
+
+
+def _headers(nonce=None, **config):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(config)
+    hook = SecurityHeaders(app.config)
+    with app.test_request_context():
+        if nonce:
+            g.csp_nonce = nonce
+        return hook(Response()).headers
+
+
+def test_csp_with_and_without_nonce():
+    """Only the nonce changes between responses; sources come from the config."""
+    config = {
+        "CSP_ALLOWED_SCRIPT": ["https://cdn.example", ""],
+        "CSP_ALLOWED_STYLE": [""],
+        "CSP_ALLOWED_IMG": ["https://img.example", "blob:"],
+        "CSP_ALLOWED_SCRIPT_UNSAFE_INLINE": False,
+        "CSP_ALLOWED_SCRIPT_UNSAFE_EVAL": False,
+        "CSP_ALLOWED_STYLE_UNSAFE_INLINE": False,
+    }
+    csp = _headers("n1", **config)["Content-Security-Policy"]
+    assert csp.startswith(
+        "default-src 'self'; script-src 'self' 'nonce-n1' https://cdn.example; "
+        "style-src 'self' 'nonce-n1' ; img-src 'self' data: https://img.example blob:; "
+    )
+    assert csp.endswith("frame-ancestors 'none'; base-uri 'self'; form-action 'self';")
+    assert _headers("n2", **config)["Content-Security-Policy"] == csp.replace("n1", "n2")
+    assert "nonce" not in _headers(**config)["Content-Security-Policy"]
+
+
+def test_unsafe_options_disable_the_nonce():
+    """With unsafe-inline or unsafe-eval the nonce is left out."""
+    csp = _headers(
+        "n1",
+        CSP_ALLOWED_SCRIPT=[""],
+        CSP_ALLOWED_SCRIPT_UNSAFE_EVAL=True,
+        CSP_ALLOWED_STYLE_UNSAFE_INLINE=True,
+    )["Content-Security-Policy"]
+
+    assert "nonce" not in csp
+    assert "script-src 'self' 'unsafe-eval' ;" in csp
+    assert "style-src 'self' 'unsafe-inline' " in csp
+
+
+def test_static_headers_and_permissions_policy():
+    """Fixed headers and the optional Permissions-Policy come from the config."""
+    headers = _headers(REFERRER_POLICY="no-referrer", PERMISSIONS_POLICY="camera=()")
+
+    assert headers["X-Frame-Options"] == "DENY"
+    assert headers["X-Content-Type-Options"] == "nosniff"
+    assert headers["Referrer-Policy"] == "no-referrer"
+    assert headers["Permissions-Policy"] == "camera=()"
+    assert "Permissions-Policy" not in _headers(PERMISSIONS_POLICY="")
@@ -0,0 +1,76 @@
+"""Tests for the session read cache."""
+
+from __future__ import annotations
+
+import time
+
+from core.model import Model
+from core.session import Session
+from core.session_cache import SessionCache
+
+
+def _row(session_id="sid", expire=None):
+    return (session_id, "42", "ua", "{}", 1, expire or int(time.time()) + 3600)
+
+
+def test_cache_honours_ttl_expire_and_lru():
+    """Entries expire by TTL or session expiry and the oldest is evicted first."""
+    cache = SessionCache(max_entries=2, ttl=60, poll_seconds=1)
+    now = int(time.time())
+
+    cache.put("a", _row("a"))
+    cache.put("b", _row("b"))
+    assert cache.get("a", now) is not None
+    cache.put("c", _row("c"))
+
+    assert cache.get("b", now) is None
+    assert cache.get("a", now) is not None
+    assert cache.get("c", now + 7200) is None
+
+
+def test_disabled_cache_stores_nothing():
+    """A zero TTL disables the cache."""
+    cache = SessionCache(max_entries=10, ttl=0, poll_seconds=1)
+    cache.put("a", _row("a"))
+    assert cache.get("a", int(time.time())) is None
+
+
+def _bootstrapped_session(tmp_path, session_id=None):
+    db_url = f"sqlite:///{tmp_path / 'safe.db'}"
+    Model(db_url, "sqlite").exec("session", "setup-base")
+    session = Session(session_id, db_url=db_url, db_type="sqlite")
+    session.cache = SessionCache(max_entries=10, ttl=60, poll_seconds=0)
+    return session
+
+
+def test_close_invalidates_cached_session(tmp_path):
+    """A closed session is not served from the cache."""
+    creator = _bootstrapped_session(tmp_path)
+    cookie = creator.create("42", "ua", {"user_data": {"userId": "42"}})
+    session_id = next(iter(cookie.values()))["value"]
+
+    session = _bootstrapped_session(tmp_path, session_id)
+    assert session.get()[0] == session_id
+    assert session.cache.get(session_id, session.now) is not None
+
+    session.close()
+
+    assert session.cache.get(session_id, session.now) is None
+    assert session.get()[0] is None
+
+
+def test_change_log_invalidates_other_workers(tmp_path):
+    """Changes logged by one worker are dropped by another worker's poll."""
+    creator = _bootstrapped_session(tmp_path)
+    cookie = creator.create("42", "ua", {})
+    session_id = next(iter(cookie.values()))["value"]
+
+    worker_a = _bootstrapped_session(tmp_path, session_id)
+    worker_b = _bootstrapped_session(tmp_path, session_id)
+    worker_b.get()
+    assert worker_b.cache.get(session_id, worker_b.now) is not None
+
+    worker_a.close()
+    worker_b.cache.sync(worker_b.model)
+
+    assert worker_b.cache.get(session_id, worker_b.now) is None
@@ -0,0 +1,107 @@
+"""Tests for write-behind session touches."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.config import Config
+from core.model import Model
+from core.session import Session
+from core.session_cache import SessionCache
+from core import session_touch
+from core.session_touch import SessionTouchBuffer
+
+
+def _setup(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'safe.db'}"
+    Model(db_url, "sqlite").exec("session", "setup-base")
+    return db_url
+
+
+def _stored(db_url, session_id):
+    result = Model(db_url, "sqlite").exec("session", "get", {
+        "sessionId": session_id,
+        "open": Config.SESSION_OPEN["true"],
+        "now": 0,
+    })
+    return tuple(result["rows"][0])
+
+
+def test_touches_are_coalesced_and_flushed_in_one_batch(tmp_path):
+    """Repeated touches of one session become a single row with the newest values."""
+    db_url = _setup(tmp_path)
+    creator = Session(None, db_url=db_url, db_type="sqlite")
+    cookie = creator.create("42", "ua", {})
+    session_id = next(iter(cookie.values()))["value"]
+
+    buffer = SessionTouchBuffer(db_url, "sqlite", flush_seconds=3600, batch_size=100)
+    buffer.touch(session_id, 100, 200)
+    buffer.touch(session_id, 300, 400)
+    buffer.touch(session_id, 50, 60)
+    buffer.touch("unknown", 300, 400)
+
+    assert buffer.pending() == 2
+    assert buffer.flush() == 2
+    assert buffer.pending() == 0
+    assert _stored(db_url, session_id)[4:6] == (300, 400)
+    buffer.stop()
+
+
+def test_stale_session_is_touched_without_writing_in_request(tmp_path):
+    """get() queues the touch, refreshes the cached row and returns the full cookie."""
+    db_url = _setup(tmp_path)
+    creator = Session(None, db_url=db_url, db_type="sqlite")
+    cookie = creator.create("42", "ua", {})
+    session_id = next(iter(cookie.values()))["value"]
+
+    session = Session(session_id, db_url=db_url, db_type="sqlite")
+    session.cache = SessionCache(max_entries=10, ttl=60, poll_seconds=3600)
+    session.touches = SessionTouchBuffer(db_url, "sqlite", flush_seconds=3600, batch_size=100)
+    session.now += 3600
+
+    sid, cookie = session.get()
+
+    assert sid == session_id
+    assert cookie[Config.SESSION_KEY]["max_age"] == Config.SESSION_IDLE_EXPIRES_SECONDS
+    assert session.touches.pending() == 1
+    assert session.cache.get(session_id, session.now)[4] == session.now
+    assert _stored(db_url, session_id)[4] < session.now
+
+    session.touches.stop()
+    assert _stored(db_url, session_id)[4] == session.now
+
+
+def test_batch_size_wakes_the_flusher(tmp_path):
+    """Reaching the batch size flushes before the timer."""
+    db_url = _setup(tmp_path)
+    buffer = SessionTouchBuffer(db_url, "sqlite", flush_seconds=3600, batch_size=2)
+    buffer.touch("a", 1, 2)
+    buffer.touch("b", 1, 2)
+
+    deadline = time.monotonic() + 5
+    while buffer.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert buffer.pending() == 0
+    buffer.stop()
+
+
+def test_batch_is_kept_when_the_write_raises(tmp_path, monkeypatch):
+    """An exception before the write finishes puts the batch back for the next pass."""
+    db_url = _setup(tmp_path)
+    buffer = SessionTouchBuffer(db_url, "sqlite", flush_seconds=3600, batch_size=100)
+    buffer.touch("sid", 100, 200)
+
+    def _broken(*_args):
+        raise RuntimeError("engine failed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(session_touch, "Model", _broken)
+        with pytest.raises(RuntimeError):
+            buffer.flush()
+
+    assert buffer.pending() == 1
+    assert buffer.flush() == 1
+    buffer.stop()
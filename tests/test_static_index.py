@@ -0,0 +1,152 @@
+"""Tests for the in-memory static asset index."""
+
+from __future__ import annotations
+
+import gzip
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+from app import create_app
+from app.config import Config
+from core.compression import ResponseCompressor
+from core.static_index import StaticIndex, serve_static
+
+CSS = ("body { margin: 0; }\n" * 100).encode()
+
+
+class StaticIndexConfig(Config):
+    """In-memory databases, app without debug so the index is built."""
+
+    TESTING = True
+    SECRET_KEY = "test_secret_key"
+    DB_PWA = "sqlite:///:memory:"
+    DB_SAFE = "sqlite:///:memory:"
+    DB_FILES = "sqlite:///:memory:"
+    MAIL_METHOD = "dummy"
+
+
+@pytest.fixture(name="indexed_app")
+def fixture_indexed_app():
+    """App with the static index enabled."""
+    app = create_app(StaticIndexConfig, debug=False)
+    yield app
+    for module in list(sys.modules.keys()):
+        if module.startswith("component."):
+            del sys.modules[module]
+
+
+@pytest.fixture(name="assets")
+def fixture_assets(tmp_path):
+    """Directory with a compressible file, an image and a large file."""
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "site.css").write_bytes(CSS)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG" + b"\x00" * 600)
+    (tmp_path / "big.txt").write_bytes(b"x" * 4096)
+    return str(tmp_path)
+
+
+def _serve(index, directory, route, headers=None):
+    app = Flask(__name__)
+    app.static_index = index
+    with app.test_request_context(headers=headers or {}):
+        return serve_static(directory, route)
+
+
+def test_index_holds_bodies_and_compressed_variants(assets):
+    """Compressible files get a gzip body; images and large files do not."""
+    index = StaticIndex(max_bytes=1048576, max_file_bytes=2048)
+    index.add_directory(assets)
+
+    css = index.get(assets, "css/site.css")
+    assert css.body == CSS and css.mimetype == "text/css"
+    assert gzip.decompress(css.variants["gzip"]) == CSS
+    assert not index.get(assets, "logo.png").variants
+    assert index.get(assets, "big.txt").body is None
+    assert index.get(assets, "missing.css") is None
+    assert index.get(assets + "/css/..", "css/site.css") is css
+
+
+def test_etag_and_304_from_memory(assets):
+    """The ETag depends on the encoding and a matching If-None-Match gives 304."""
+    index = StaticIndex(max_bytes=1048576)
+    index.add_directory(assets)
+    os.remove(os.path.join(assets, "css", "site.css"))
+
+    plain = _serve(index, assets, "css/site.css")
+    assert plain.status_code == 200 and plain.get_data() == CSS
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["Vary"] == "Accept-Encoding"
+    assert plain.headers["Cache-Control"] == Config.STATIC_CACHE_CONTROL
+
+    gz = _serve(index, assets, "css/site.css", {"Accept-Encoding": "gzip, deflate"})
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gz.get_data()) == CSS
+    assert gz.headers["ETag"] == plain.headers["ETag"][:-1] + '-gz"'
+
+    cached = _serve(index, assets, "css/site.css", {
+        "Accept-Encoding": "gzip", "If-None-Match": gz.headers["ETag"],
+    })
+    assert cached.status_code == 304 and cached.get_data() == b""
+    assert cached.headers["ETag"] == gz.headers["ETag"]
+
+    stale = _serve(index, assets, "css/site.css", {"If-None-Match": gz.headers["ETag"]})
+    assert stale.status_code == 200
+
+
+def test_assets_compressed_by_the_app_revalidate(assets):
+    """An asset without variants, gzipped by the compressor, still gets a 304."""
+    css_dir = os.path.join(assets, "css")
+    index = StaticIndex(max_bytes=len(CSS) + 10)
+    index.add_directory(css_dir)
+    asset = index.get(css_dir, "site.css")
+    assert asset.body == CSS and not asset.variants
+
+    app = Flask(__name__)
+    app.static_index = index
+    app.after_request(ResponseCompressor(level=6, min_bytes=0).compress)
+    app.add_url_rule("/<path:route>", "asset", lambda route: serve_static(css_dir, route))
+    client = app.test_client()
+
+    gz = client.get("/site.css", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gz.headers["ETag"] == f'"{asset.etag}-gz"'
+
+    cached = client.get("/site.css", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": gz.headers["ETag"],
+    })
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == gz.headers["ETag"]
+
+
+def test_files_outside_the_index_are_served_from_disk(assets):
+    """Disabled index, large files and files added later still work."""
+    index = StaticIndex(max_bytes=1048576, max_file_bytes=2048)
+    index.add_directory(assets)
+    Path(assets, "new.js").write_text("", encoding="utf-8")
+    assert _serve(StaticIndex(max_bytes=0), assets, "css/site.css").status_code == 200
+
+    big = _serve(index, assets, "big.txt")
+    big.direct_passthrough = False
+    assert big.get_data() == b"x" * 4096
+    assert big.headers["ETag"] == f'"{index.get(assets, "big.txt").etag}"'
+    assert _serve(index, assets, "new.js").status_code == 200
+    assert _serve(index, assets, "nothing.js") is None
+
+
+def test_public_and_component_assets_are_indexed(indexed_app):
+    """Static routes answer from the index and revalidate with 304."""
+    assert len(indexed_app.static_index) > 0
+    client = indexed_app.test_client()
+
+    response = client.get("/favicon.ico")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert client.get("/favicon.ico", headers={"If-None-Match": etag}).status_code == 304
+
+    response = client.get("/ftoken/ftoken.min.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
@@ -0,0 +1,94 @@
+"""Tests for chunked streaming responses from core.template.Template."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.config import Config
+from core import template as template_module
+
+PAGE = (
+    "\n\n  <!DOCTYPE html>\n<html>\n    <head>\n        <title>t</title>\n    </head>\n"
+    "    <body>\n" + "        <p>paragraph</p>\n" * 200 + "    </body>\n</html>\n"
+)
+
+
+class _FakeNeutralTemplate:
+    """Renderer stand-in with a fixed page and status."""
+
+    status = "200"
+    param = ""
+
+    def __init__(self, tpl, schema):
+        self.tpl = tpl
+        self.schema = schema
+
+    def render(self):
+        """Return the fixed page."""
+        return PAGE
+
+    def get_status_code(self):
+        """Status chosen by the test."""
+        return self.status
+
+    def get_status_text(self):
+        """Status text."""
+        return "Status"
+
+    def get_status_param(self):
+        """Redirect target or error parameter."""
+        return self.param
+
+    def has_error(self):
+        """No parse errors."""
+        return False
+
+
+@pytest.fixture(name="streaming")
+def fixture_streaming(monkeypatch):
+    """Streaming mode with the fake renderer."""
+    monkeypatch.setattr(Config, "TEMPLATE_STREAM", True)
+    monkeypatch.setattr(Config, "TEMPLATE_STREAM_CHUNK_SIZE", 1024)
+    monkeypatch.setattr(Config, "TEMPLATE_HTML_MINIFY", False)
+    monkeypatch.setattr(template_module, "NeutralTemplate", _FakeNeutralTemplate)
+    monkeypatch.setattr(_FakeNeutralTemplate, "status", "200")
+    return _FakeNeutralTemplate
+
+
+def test_page_is_streamed_head_first(client, streaming):  # pylint: disable=unused-argument
+    """The head is the first chunk and the rest follows in chunk-size pieces."""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert "Content-Length" not in response.headers
+    chunks = [chunk.decode() for chunk in response.response]
+    assert chunks[0].startswith("<!DOCTYPE html>")
+    assert chunks[0].endswith("</head>")
+    assert all(len(chunk) <= 1024 for chunk in chunks[1:])
+    assert "".join(chunks) == PAGE.lstrip("\n\r\t ")
+
+
+def test_streamed_minify_matches_whole_page(client, streaming, monkeypatch):  # pylint: disable=unused-argument
+    """Chunk-by-chunk minification gives the same document."""
+    monkeypatch.setattr(Config, "TEMPLATE_HTML_MINIFY", True)
+
+    body = client.get("/").get_data(as_text=True)
+
+    assert body == template_module.minify_html(PAGE.lstrip("\n\r\t "))
+    assert "\n<p>paragraph</p>\n" in body
+
+
+def test_redirects_and_errors_are_not_streamed(client, streaming, monkeypatch):
+    """Status codes returned by the renderer still decide the response."""
+    monkeypatch.setattr(streaming, "status", "302")
+    monkeypatch.setattr(streaming, "param", "/sign/in")
+    response = client.get("/")
+    assert response.status_code == 302
+    assert response.headers["Location"] == "/sign/in"
+    assert "Content-Length" in response.headers
+
+    monkeypatch.setattr(streaming, "status", "404")
+    response = client.get("/")
+    assert response.status_code == 404
+    assert "Content-Length" in response.headers
+    assert response.get_data(as_text=True) == PAGE.lstrip("\n\r\t ")
@@ -0,0 +1,195 @@
+"""Tests for the request-scoped database unit of work."""
+
+from __future__ import annotations
+
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from core import template as template_module
+from core.model import Model
+from core.unit_of_work import UnitOfWork, get_unit_of_work
+
+
+def _session_model(tmp_path, unit_of_work=None):
+    return Model(f"sqlite:///{tmp_path / 'safe.db'}", "sqlite", unit_of_work)
+
+
+def _session_params(session_id="sid"):
+    return {"sessionId": session_id, "open": 1, "now": 100}
+
+
+def _session_row(session_id="sid"):
+    return {
+        "sessionId": session_id, "open": 1, "userId": "42", "ua": "ua",
+        "properties": "{}", "modified": 1, "created": 1, "expire": 1000,
+    }
+
+
+def _count_sessions(tmp_path):
+    """Count rows from a separate sqlite3 connection."""
+    conn = sqlite3.connect(tmp_path / "safe.db")
+    try:
+        return conn.execute("SELECT COUNT(*) FROM session").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_identical_reads_hit_database_once(tmp_path):
+    """Repeated identical SELECTs are served from the unit of work."""
+    _session_model(tmp_path).exec("session", "setup-base")
+    unit_of_work = UnitOfWork()
+    model = _session_model(tmp_path, unit_of_work)
+
+    statements = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(model.engine, "before_cursor_execute", _record)
+    try:
+        first = model.exec("session", "get", _session_params())
+        second = model.exec("session", "get", _session_params())
+    finally:
+        event.remove(model.engine, "before_cursor_execute", _record)
+    unit_of_work.commit()
+
+    assert first["success"] and second["success"]
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 1
+
+
+def test_writes_are_committed_once_at_the_end(tmp_path):
+    """Writes stay in the request transaction until commit and invalidate reads."""
+    _session_model(tmp_path).exec("session", "setup-base")
+    unit_of_work = UnitOfWork()
+    model = _session_model(tmp_path, unit_of_work)
+
+    assert model.exec("session", "get", _session_params())["rows"] == []
+    model.exec("session", "create", {
+        "sessionId": "sid", "open": 1, "userId": "42", "ua": "ua",
+        "properties": "{}", "modified": 1, "created": 1, "expire": 1000,
+    })
+    assert len(model.exec("session", "get", _session_params())["rows"]) == 1
+
+    outside = _session_model(tmp_path)
+    unit_of_work.commit()
+    assert len(outside.exec("session", "get", _session_params())["rows"]) == 1
+
+
+def test_failed_write_rolls_back_only_itself(tmp_path):
+    """A failing write is isolated in its savepoint."""
+    _session_model(tmp_path).exec("session", "setup-base")
+    unit_of_work = UnitOfWork()
+    model = _session_model(tmp_path, unit_of_work)
+    row = {
+        "sessionId": "sid", "open": 1, "userId": "42", "ua": "ua",
+        "properties": "{}", "modified": 1, "created": 1, "expire": 1000,
+    }
+
+    model.exec("session", "create", row)
+    model.exec("session", "create", row)
+    assert model.has_error
+    unit_of_work.commit()
+
+    assert len(_session_model(tmp_path).exec("session", "get", _session_params())["rows"]) == 1
+
+
+def test_connection_is_held_only_after_a_write(tmp_path):
+    """Reads return their connection to the pool; the first write keeps one."""
+    _session_model(tmp_path).exec("session", "setup-base")
+    unit_of_work = UnitOfWork()
+    model = _session_model(tmp_path, unit_of_work)
+    pool = model.engine.pool
+
+    assert model.exec("session", "get", _session_params())["rows"] == []
+    assert pool.checkedout() == 0
+
+    assert model.exec("session", "create", _session_row())["success"]
+    assert pool.checkedout() == 1
+    assert len(model.exec("session", "get", _session_params())["rows"]) == 1
+    assert pool.checkedout() == 1
+
+    unit_of_work.commit()
+    assert pool.checkedout() == 0
+
+
+def test_failed_read_keeps_earlier_writes(tmp_path):
+    """A failing SELECT rolls back its own savepoint, not the request transaction."""
+    _session_model(tmp_path).exec("session", "setup-base")
+    unit_of_work = UnitOfWork()
+    model = _session_model(tmp_path, unit_of_work)
+
+    assert model.exec("session", "create", _session_row())["success"]
+    model.exec("user", "check-exists", {"login": "missing-table"})
+    assert model.has_error
+    unit_of_work.commit()
+
+    assert _count_sessions(tmp_path) == 1
+
+
+@pytest.mark.parametrize("propagate", [True, False])
+def test_failed_request_leaves_no_partial_write(flask_app, tmp_path, propagate):
+    """A write made before the view fails is never visible and is rolled back."""
+    _session_model(tmp_path).exec("session", "setup-base")
+    flask_app.config["PROPAGATE_EXCEPTIONS"] = propagate
+    seen = []
+
+    def fail_after_write():
+        model = _session_model(tmp_path, get_unit_of_work())
+        assert model.exec("session", "create", _session_row())["success"]
+        seen.append(_count_sessions(tmp_path))
+        raise RuntimeError("view failed after writing")
+
+    flask_app.add_url_rule("/uow-fail", "uow_fail", fail_after_write)
+    client = flask_app.test_client()
+
+    if propagate:
+        with pytest.raises(RuntimeError):
+            client.get("/uow-fail")
+    else:
+        assert client.get("/uow-fail").status_code == 500
+
+    assert seen == [0]
+    assert _count_sessions(tmp_path) == 0
+
+
+def test_template_commits_before_rendering(flask_app, tmp_path, monkeypatch):
+    """The request writes are committed, and the lock released, before the render."""
+    _session_model(tmp_path).exec("session", "setup-base")
+    seen = []
+
+    class _Rendered:
+        """NeutralTemplate stand-in that writes from another connection."""
+
+        def __init__(self, *_args):
+            pass
+
+        @staticmethod
+        def render():
+            conn = sqlite3.connect(tmp_path / "safe.db", timeout=0)
+            try:
+                with conn:
+                    conn.execute("DELETE FROM session WHERE sessionId = 'other'")
+            finally:
+                conn.close()
+            seen.append(_count_sessions(tmp_path))
+            return "<p>page</p>"
+
+        get_status_code = staticmethod(lambda: "200")
+        get_status_text = staticmethod(lambda: "OK")
+        get_status_param = staticmethod(lambda: "")
+        has_error = staticmethod(lambda: False)
+
+    monkeypatch.setattr(template_module, "NeutralTemplate", _Rendered)
+    monkeypatch.setattr(template_module.Template, "_render_schema", lambda self: "{}")
+    schema = SimpleNamespace(properties={"data": {"TEMPLATE_LAYOUT": "layout"}})
+
+    with flask_app.test_request_context():
+        model = _session_model(tmp_path, get_unit_of_work())
+        assert model.exec("session", "create", _session_row())["success"]
+        response = template_module.Template(schema).render()
+
+    assert response.status_code == 200
+    assert seen == [1]
@@ -0,0 +1,114 @@
+"""Tests for the batched admin user listing."""
+
+from __future__ import annotations
+
+from sqlalchemy import event, text
+
+from app.config import Config
+from core.engine import get_engine
+from core.model import Model
+from core.query_catalog import QueryCatalog
+from core.user import User
+
+
+def test_admin_list_users_uses_a_fixed_number_of_queries(tmp_path):
+    """Roles and disabled reasons for the page are fetched in batch, not per user."""
+    db_url = f"sqlite:///{tmp_path / 'pwa.db'}"
+    Model(db_url, "sqlite").exec("user", "setup-base")
+    with get_engine(db_url).begin() as conn:
+        for user_id in range(1, 21):
+            conn.execute(text(
+                "INSERT INTO user (userId, login, password, birthdate, lasttime, created, modified)"
+                " VALUES (:userId, :login, 'x', 'x', 0, :created, 0)"
+            ), {"userId": str(user_id), "login": f"login{user_id}", "created": user_id})
+    user = User(db_url, "sqlite")
+    assert user.assign_role("3", "admin")
+    assert user.assign_role("3", "editor")
+    assert user.set_user_disabled("5", Config.DISABLED["moderated"], "spammy")
+
+    statements = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        if statement != "BEGIN":
+            statements.append(statement)
+
+    event.listen(user.model.engine, "before_cursor_execute", _record)
+    try:
+        users = user.admin_list_users(limit=100)
+    finally:
+        event.remove(user.model.engine, "before_cursor_execute", _record)
+
+    assert len(users) == 20
+    assert len(statements) == 3
+    by_id = {row["userId"]: row for row in users}
+    assert by_id["3"]["roles"] == ["admin", "editor"]
+    assert by_id["4"]["roles"] == []
+    assert [item["name"] for item in by_id["5"]["disabled"]] == ["moderated"]
+    assert by_id["5"]["disabled"][0]["description"] == "spammy"
+    assert by_id["6"]["disabled"] == []
+
+
+def _users_db(tmp_path, count):
+    db_url = f"sqlite:///{tmp_path / 'pwa.db'}"
+    Model(db_url, "sqlite").exec("user", "setup-base")
+    with get_engine(db_url).begin() as conn:
+        for user_id in range(1, count + 1):
+            conn.execute(text(
+                "INSERT INTO user (userId, login, password, birthdate, lasttime, created, modified)"
+                " VALUES (:userId, :login, 'x', 'x', 0, :created, 0)"
+            ), {"userId": f"{user_id:03d}", "login": f"login{user_id}", "created": user_id // 2})
+    return User(db_url, "sqlite")
+
+
+def test_keyset_pages_walk_forward_and_back(tmp_path):
+    """Cursors visit every user once, in order, and lead back to the same pages."""
+    user = _users_db(tmp_path, 25)
+    expected = sorted(
+        (f"{user_id:03d}" for user_id in range(1, 26)),
+        key=lambda uid: (int(uid) // 2, uid),
+        reverse=True,
+    )
+
+    pages = [user.admin_list_users_page(limit=10)]
+    assert pages[0]["prev_cursor"] == ""
+    while pages[-1]["next_cursor"]:
+        pages.append(user.admin_list_users_page(limit=10, cursor=pages[-1]["next_cursor"]))
+
+    assert [len(page["users"]) for page in pages] == [10, 10, 5]
+    assert [row["userId"] for page in pages for row in page["users"]] == expected
+
+    back = user.admin_list_users_page(limit=10, cursor=pages[2]["prev_cursor"])
+    assert [row["userId"] for row in back["users"]] == [row["userId"] for row in pages[1]["users"]]
+    first = user.admin_list_users_page(limit=10, cursor=back["prev_cursor"])
+    assert [row["userId"] for row in first["users"]] == expected[:10]
+    assert first["prev_cursor"] == ""
+
+
+def test_cursor_for_another_ordering_starts_over(tmp_path):
+    """A cursor is only honoured by the listing that produced it."""
+    user = _users_db(tmp_path, 5)
+    cursor = user.admin_list_users_page(limit=2)["next_cursor"]
+
+    assert user.admin_list_users_page(order_by="modified", limit=2, cursor=cursor)["prev_cursor"] == ""
+    assert user.admin_list_users_page(limit=2, cursor="not-a-cursor")["prev_cursor"] == ""
+
+
+def test_cursor_pages_search_the_index(tmp_path):
+    """Next and previous pages of created/modified listings are an index range search."""
+    user = _users_db(tmp_path, 5)
+    catalog = QueryCatalog()
+    params = {
+        "search": "", "role_code": "", "disabled_reason": "",
+        "cursor_key": 2, "cursor_id": "003", "limit": 11,
+    }
+
+    for order in ("created", "modified"):
+        for direction in ("after", "before"):
+            key = f"admin-list-by-{order}-{direction}"
+            statement = catalog.get("user", key, "sqlite").statements[0]
+            with user.model.engine.connect() as conn:
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement.sql}", params)
+                details = [row[3] for row in plan]
+            user_step = next(step for step in details if step.split()[1] == "user")
+            assert user_step.startswith(f"SEARCH user USING INDEX idx_user_{order}_userId"), key
+            assert not any(step.startswith("SCAN") for step in details), key